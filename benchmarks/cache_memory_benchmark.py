@@ -0,0 +1,108 @@
+"""
+Memory held per cache entry for plain versus compact payloads.
+
+Each entry is decoded from JSON on its own, as an upstream response would be,
+so repeated strings and wrappers are separate objects until compacted. The
+compact cost includes the expand() needed to serve each hit.
+
+Usage:
+    python benchmarks/cache_memory_benchmark.py [--entries N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.compact import compact, expand
+
+TEAMS = [("BOS", "Boston", "Bruins"), ("TOR", "Toronto", "Maple Leafs"), ("MTL", "Montréal", "Canadiens"),
+         ("NYR", "New York", "Rangers"), ("EDM", "Edmonton", "Oilers"), ("COL", "Colorado", "Avalanche")]
+
+
+def _game(entry: int, i: int) -> dict:
+    home, away = TEAMS[i % len(TEAMS)], TEAMS[(i + entry + 1) % len(TEAMS)]
+    return {
+        "id": 2023020001 + entry * 100 + i, "season": 20232024, "gameType": 2, "gameDate": f"2024-01-{i % 28 + 1:02d}",
+        "venue": {"default": f"{home[1]} Arena"}, "neutralSite": False, "startTimeUTC": "2024-01-16T00:00:00Z",
+        "easternUTCOffset": "-05:00", "venueUTCOffset": "-05:00", "venueTimezone": "US/Eastern",
+        "gameState": "OFF", "gameScheduleState": "OK",
+        "tvBroadcasts": [{"id": 28, "market": "H", "countryCode": "US", "network": "NESN", "sequenceNumber": 1}],
+        "awayTeam": {"id": 10, "placeName": {"default": away[1]}, "abbrev": away[0], "score": i % 5,
+                     "logo": f"https://assets.nhle.com/logos/nhl/svg/{away[0]}_light.svg"},
+        "homeTeam": {"id": 6, "placeName": {"default": home[1]}, "abbrev": home[0], "score": (i + 2) % 6,
+                     "logo": f"https://assets.nhle.com/logos/nhl/svg/{home[0]}_light.svg"},
+        "periodDescriptor": {"number": 3, "periodType": "REG", "maxRegulationPeriods": 3},
+    }
+
+
+def _game_log_row(entry: int, i: int) -> dict:
+    opponent = TEAMS[i % len(TEAMS)]
+    return {
+        "gameId": 2023020001 + i, "teamAbbrev": "EDM", "homeRoadFlag": "H" if i % 2 else "R",
+        "gameDate": f"2024-01-{i % 28 + 1:02d}", "goals": i % 3, "assists": i % 4, "commonName": {"default": "Oilers"},
+        "opponentCommonName": {"default": opponent[2]}, "points": i % 5, "plusMinus": i % 3 - 1,
+        "powerPlayGoals": 0, "powerPlayPoints": i % 2, "gameWinningGoals": 0, "otGoals": 0, "shots": i % 7,
+        "shifts": 20 + i % 5, "shorthandedGoals": 0, "shorthandedPoints": 0, "opponentAbbrev": opponent[0],
+        "pim": 0, "toi": f"{20 + i % 4}:{i % 60:02d}",
+    }
+
+
+def _skater_row(entry: int, i: int) -> dict:
+    return {
+        "playerId": 8470000 + entry * 100 + i, "skaterFullName": f"Player {entry}-{i}", "lastName": f"Name{i}",
+        "positionCode": "CLRD"[i % 4], "shootsCatches": "LR"[i % 2], "teamAbbrevs": TEAMS[i % len(TEAMS)][0],
+        "seasonId": 20232024, "gamesPlayed": 82, "goals": i % 50, "assists": i % 60, "points": i % 90,
+        "plusMinus": i % 21 - 10, "penaltyMinutes": i % 40, "pointsPerGame": (i % 90) / 82, "evGoals": i % 30,
+        "evPoints": i % 60, "ppGoals": i % 15, "ppPoints": i % 30, "shGoals": 0, "shPoints": 0, "otGoals": i % 3,
+        "gameWinningGoals": i % 8, "shots": 100 + i, "shootingPct": 0.1, "timeOnIcePerGame": 1000.0 + i,
+        "faceoffWinPct": 0.5,
+    }
+
+
+# Payload -> (result key, row builder, rows per entry)
+SHAPES = {
+    "schedule games (week)": ("games", _game, 100),
+    "player game log (season)": ("game_log", _game_log_row, 82),
+    "skater stats summary (page)": ("skater_stats", _skater_row, 100),
+}
+
+
+def _payload(key: str, row, rows: int, entry: int) -> dict:
+    # Decoded per entry, like an upstream response
+    return json.loads(json.dumps({key: [row(entry, i) for i in range(rows)]}))
+
+
+def _retained(build, entries: int) -> int:
+    """Bytes still allocated after building and holding the given number of entries."""
+    tracemalloc.start()
+    held = [build(entry) for entry in range(entries)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", "-n", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'payload':30} {'plain/entry':>12} {'compact/entry':>14} {'saved %':>8} {'expand/hit':>11}")
+    for name, (key, row, rows) in SHAPES.items():
+        plain = _retained(lambda entry: _payload(key, row, rows, entry), args.entries)
+        compacted = _retained(lambda entry: compact(_payload(key, row, rows, entry)), args.entries)
+        stored = compact(_payload(key, row, rows, 0))
+        start = time.perf_counter()
+        for _ in range(100):
+            expand(stored)
+        expand_ms = (time.perf_counter() - start) * 10
+        print(f"{name:30} {plain / args.entries / 1024:10.1f}KB {compacted / args.entries / 1024:12.1f}KB "
+              f"{1 - compacted / plain:8.1%} {expand_ms:9.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+CPU cost of serving tools in the default mode versus pass-through mode.
+
+The upstream API is replaced by canned responses so only the local work is
+measured: decode, envelope, FastMCP result conversion and JSON-RPC encoding.
+
+Usage:
+    python benchmarks/passthrough_benchmark.py [--iterations N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+from fastmcp.tools import Tool
+from mcp.types import CallToolResult
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import client, passthrough
+from src.schedule import get_nhl_calendar_schedule, get_nhl_team_season_schedule
+from src.stats import get_nhl_player_career_stats
+from src.teams import get_nhl_team_roster
+
+
+def _game(game_id: int) -> dict:
+    return {
+        "id": game_id, "season": 20232024, "gameType": 2, "gameDate": "2024-01-15",
+        "venue": {"default": "TD Garden"}, "neutralSite": False,
+        "startTimeUTC": "2024-01-16T00:00:00Z", "easternUTCOffset": "-05:00", "venueUTCOffset": "-05:00",
+        "venueTimezone": "US/Eastern", "gameState": "OFF", "gameScheduleState": "OK",
+        "tvBroadcasts": [{"id": 28, "market": "H", "countryCode": "US", "network": "NESN", "sequenceNumber": 1}],
+        "awayTeam": {"id": 10, "placeName": {"default": "Toronto"}, "abbrev": "TOR", "score": 2,
+                     "logo": "https://assets.nhle.com/logos/nhl/svg/TOR_light.svg"},
+        "homeTeam": {"id": 6, "placeName": {"default": "Boston"}, "abbrev": "BOS", "score": 4,
+                     "logo": "https://assets.nhle.com/logos/nhl/svg/BOS_light.svg"},
+        "periodDescriptor": {"number": 3, "periodType": "REG", "maxRegulationPeriods": 3},
+        "gameCenterLink": f"/gamecenter/tor-vs-bos/2024/01/15/{game_id}",
+    }
+
+
+def _player(player_id: int) -> dict:
+    return {
+        "id": player_id, "headshot": f"https://assets.nhle.com/mugs/nhl/20232024/BOS/{player_id}.png",
+        "firstName": {"default": "David"}, "lastName": {"default": "Pastrnak"}, "sweaterNumber": 88,
+        "positionCode": "R", "shootsCatches": "R", "heightInInches": 72, "weightInPounds": 194,
+        "birthDate": "1996-05-25", "birthCity": {"default": "Havirov"}, "birthCountry": "CZE",
+    }
+
+
+# Tool name -> (default-mode function, pass-through function, arguments, upstream body)
+CASES = {
+    "get_nhl_team_season_schedule": (
+        get_nhl_team_season_schedule, passthrough.get_nhl_team_season_schedule_raw,
+        {"team_abbr": "BOS", "season": "20232024"},
+        {"previousSeason": 20222023, "currentSeason": 20232024, "clubTimezone": "America/New_York",
+         "games": [_game(2023020001 + i) for i in range(90)]},
+    ),
+    "get_nhl_team_roster": (
+        get_nhl_team_roster, passthrough.get_nhl_team_roster_raw,
+        {"team_abbr": "BOS", "season": "20232024"},
+        {"forwards": [_player(8477000 + i) for i in range(16)], "defensemen": [_player(8478000 + i) for i in range(9)],
+         "goalies": [_player(8479000 + i) for i in range(3)]},
+    ),
+    "get_nhl_player_career_stats": (
+        get_nhl_player_career_stats, passthrough.get_nhl_player_career_stats_raw,
+        {"player_id": "8478402"},
+        {"playerId": 8478402, "isActive": True, "currentTeamAbbrev": "EDM", "firstName": {"default": "Connor"},
+         "lastName": {"default": "McDavid"}, "position": "C",
+         "seasonTotals": [{"season": 20152016 + i * 10001, "gameTypeId": game_type, "leagueAbbrev": "NHL",
+                           "teamName": {"default": "Edmonton Oilers"}, "gamesPlayed": 82, "goals": 40,
+                           "assists": 80, "points": 120, "plusMinus": 20, "pim": 30, "shots": 280}
+                          for i in range(10) for game_type in (2, 3)]},
+    ),
+    "get_nhl_calendar_schedule": (
+        get_nhl_calendar_schedule, passthrough.get_nhl_calendar_schedule_raw,
+        {"date": "2024-01-15"},
+        {"endDate": "2024-01-21", "nextStartDate": "2024-01-22", "previousStartDate": "2024-01-08",
+         "startDate": "2024-01-15", "teams": [{"id": i, "abbrev": f"T{i:02}", "name": {"default": f"Team {i}"},
+                                               "logo": f"https://assets.nhle.com/logos/nhl/svg/T{i:02}_light.svg"}
+                                              for i in range(32)]},
+    ),
+}
+
+
+class _CannedHttpClient:
+    def __init__(self, body: dict):
+        self._content = json.dumps(body).encode()
+
+    def get(self, endpoint, resource: str, query_params: dict = None) -> httpx.Response:
+        return httpx.Response(200, content=self._content)
+
+
+def _install(http_client) -> None:
+    client._http_client = http_client
+    for api in (client.teams, client.standings, client.schedule, client.stats, client.players):
+        api.client = http_client
+
+
+def _cpu_per_call(tool: Tool, arguments: dict, iterations: int) -> float:
+    async def run():
+        for _ in range(iterations):
+            result = await tool.run(arguments)
+            mcp_result = result.to_mcp_result()
+            if isinstance(mcp_result, tuple):
+                content, structured = mcp_result
+                mcp_result = CallToolResult(content=content, structuredContent=structured)
+            else:
+                mcp_result = CallToolResult(content=mcp_result)
+            mcp_result.model_dump_json(by_alias=True, exclude_none=True)
+
+    start = time.process_time()
+    asyncio.run(run())
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", "-n", type=int, default=200)
+    args = parser.parse_args()
+
+    json_library = "orjson" if passthrough.orjson is not None else "json (orjson not installed)"
+    print(f"Pass-through JSON library: {json_library}")
+    print(f"{'tool':32} {'payload':>9} {'default':>11} {'passthrough':>12} {'saved':>11} {'saved %':>8}")
+    for name, (default_fn, raw_fn, arguments, body) in CASES.items():
+        _install(_CannedHttpClient(body))
+        default_tool = Tool.from_function(default_fn, name=name)
+        raw_tool = Tool.from_function(passthrough.passthrough_tool(default_fn, raw_fn), name=name,
+                                      output_schema=None)
+
+        default_cpu = _cpu_per_call(default_tool, arguments, args.iterations)
+        raw_cpu = _cpu_per_call(raw_tool, arguments, args.iterations)
+        saved = default_cpu - raw_cpu
+        size_kb = len(json.dumps(body)) / 1024
+        print(f"{name:32} {size_kb:7.1f}KB {default_cpu * 1e3:9.3f}ms {raw_cpu * 1e3:10.3f}ms "
+              f"{saved * 1e3:9.3f}ms {saved / default_cpu:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
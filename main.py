@@ -4,11 +4,17 @@ import warnings
 
 import uvicorn
 from fastmcp import FastMCP
-from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse
+from starlette.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware import Middleware
 
-from src import setup_nhl_tools
+from src import setup_nhl_resources, setup_nhl_tools
+from src.cache_server import run_cache_server
+from src.compression import CompressionMiddleware
+from src.export import FORMATS, TABLES, export_seasons, parse_seasons
+from src.health import liveness, readiness
+from src.profiling import PROFILING_ENABLED, get_profile, recent_profiles
+from src.warmup import warmer
 
 # Suppress websockets deprecation warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="websockets")
@@ -18,6 +24,8 @@ mcp = FastMCP("NHL API MCP Server")
 
 # Register tool stubs (no tools yet)
 setup_nhl_tools(mcp)
+# Static datasets are also published as versioned resources clients can cache
+setup_nhl_resources(mcp)
 
 @mcp.custom_route("/", methods=["GET"])
 async def root(request):
@@ -25,7 +33,20 @@ async def root(request):
 
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request):
-    return JSONResponse({"status": "ok"})
+    # Not ready until the upstream connection pool has been warmed
+    if not warmer.ready:
+        return JSONResponse({"status": "warming", "warmup": warmer.status()}, status_code=503)
+    return JSONResponse({"status": "ok", "warmup": warmer.status()})
+
+@mcp.custom_route("/livez", methods=["GET"])
+async def livez(request):
+    return JSONResponse(liveness())
+
+@mcp.custom_route("/readyz", methods=["GET"])
+async def readyz(request):
+    # 503 sheds traffic to other replicas while this one is cold or saturated
+    result = readiness()
+    return JSONResponse(result, status_code=200 if result["ready"] else 503)
 
 @mcp.custom_route("/info", methods=["GET"])
 async def mcp_info(request):
@@ -56,6 +77,19 @@ async def list_tools(request):
         )
     return JSONResponse({"tools": tools})
 
+if PROFILING_ENABLED:
+    @mcp.custom_route("/debug/profiles", methods=["GET"])
+    async def list_profiles(request):
+        return JSONResponse({"profiles": recent_profiles()})
+
+    @mcp.custom_route("/debug/profiles/{profile_id}", methods=["GET"])
+    async def profile_stacks(request):
+        # Collapsed stacks, ready for flamegraph.pl or speedscope
+        profile = get_profile(request.path_params["profile_id"])
+        if profile is None:
+            return JSONResponse({"error": "Profile not found"}, status_code=404)
+        return PlainTextResponse(profile.folded())
+
 @mcp.custom_route("/docs", methods=["GET"])
 async def docs(request):
     tools_list = await mcp.get_tools()
@@ -79,6 +113,8 @@ async def docs(request):
 
         <h2>Available Endpoints</h2>
         <div class="endpoint"><span class="method">GET</span> <span class="path">/health</span><p>Health check</p></div>
+        <div class="endpoint"><span class="method">GET</span> <span class="path">/livez</span><p>Liveness check</p></div>
+        <div class="endpoint"><span class="method">GET</span> <span class="path">/readyz</span><p>Readiness check (warm-up, saturation), with upstream errors and cache reported</p></div>
         <div class="endpoint"><span class="method">GET</span> <span class="path">/info</span><p>Server info</p></div>
         <div class="endpoint"><span class="method">GET</span> <span class="path">/tools</span><p>List MCP tools</p></div>
         <div class="endpoint"><span class="method">POST</span> <span class="path">/mcp</span><p>MCP protocol endpoint</p></div>
@@ -102,9 +138,25 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="NHL API MCP Server")
     parser.add_argument("--http", action="store_true", help="Run server with HTTP transport (default: stdio)")
     parser.add_argument("--port", "-p", type=int, default=8000, help="Port to run the server on (env PORT overrides)")
+    subparsers = parser.add_subparsers(dest="command")
+    export_parser = subparsers.add_parser("export", help="Export whole-season datasets to files and exit")
+    export_parser.add_argument("seasons", help="Seasons, comma separated (20222023,20232024) or a range (20182019-20232024)")
+    export_parser.add_argument("--format", "-f", choices=sorted(FORMATS), default="ndjson", help="Output format (default: ndjson)")
+    export_parser.add_argument("--out", "-o", default="exports", help="Output directory (default: exports)")
+    export_parser.add_argument("--tables", "-t", default=",".join(TABLES), help="Comma separated tables to export (default: all)")
+    cache_parser = subparsers.add_parser("cache-server", help="Run a local stand-in for the shared Redis cache")
+    cache_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    cache_parser.add_argument("--port", "-p", type=int, default=6379, help="Port to listen on (default: 6379)")
     args = parser.parse_args()
 
-    if args.http:
+    if args.command == "export":
+        result = export_seasons(parse_seasons(args.seasons), args.out, args.format, args.tables.split(","))
+        for file in result["files"]:
+            print(f"{file['path']}: {file['rows']} rows, {file['bytes']} bytes")
+    elif args.command == "cache-server":
+        run_cache_server(args.host, args.port)
+    elif args.http:
+        warmer.start()
         port = int(os.environ.get("PORT", args.port))
         cors_middleware = Middleware(
             CORSMiddleware,
@@ -115,8 +167,14 @@ if __name__ == "__main__":
             expose_headers=["mcp-session-id"],
             max_age=86400,
         )
-        app = mcp.http_app(middleware=[cors_middleware])
+        compression_middleware = Middleware(
+            CompressionMiddleware,
+            minimum_size=int(os.environ.get("NHL_MCP_COMPRESSION_MIN_SIZE", 1024)),
+            chunk_size=int(os.environ.get("NHL_MCP_STREAM_CHUNK_SIZE", 64 * 1024)),
+        )
+        app = mcp.http_app(middleware=[cors_middleware, compression_middleware])
 
         uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
     else:
+        warmer.start()
         mcp.run(transport="stdio")
@@ -4,30 +4,44 @@ from .players import *
 from .schedule import *
 from .standings import *
 from .stats import *
+from .export import get_nhl_season_export
+from .team_matrix import get_nhl_team_form
+from .prospects import get_nhl_prospects
+from .roster_tracker import get_nhl_roster_changes
+from .directories import get_nhl_player_game_logs
+from .query import get_nhl_query
+from .ttl_policy import get_nhl_cache_ttl_policy
+from .sessions import get_nhl_session_usage
 from .mcp_tools import setup_nhl_tools
+from .resources import setup_nhl_resources
 
 # Re-export the client and setup function for convenience
 __all__ = [
     'client',
     'setup_nhl_tools',
+    'setup_nhl_resources',
     # Teams
     'get_nhl_teams',
     'get_nhl_team_roster', 
     'get_nhl_franchises',
     'get_nhl_team_ids',
+    'get_nhl_roster_changes',
     # Players
     'get_nhl_prospects_by_team',
     'get_nhl_players_by_team',
+    'get_nhl_prospects',
     # Schedule
     'get_nhl_daily_schedule',
     'get_nhl_weekly_schedule',
     'get_nhl_team_monthly_schedule',
     'get_nhl_team_weekly_schedule',
     'get_nhl_team_season_schedule',
+    'get_nhl_league_season_schedule',
     'get_nhl_calendar_schedule',
     'get_nhl_playoff_carousel',
     'get_nhl_playoff_series_schedule',
     'get_nhl_playoff_bracket',
+    'get_nhl_playoff_picture',
     # Standings
     'get_nhl_standings',
     'get_nhl_season_manifest',
@@ -35,7 +49,17 @@ __all__ = [
     'get_nhl_gametypes_per_season_by_team',
     'get_nhl_player_career_stats',
     'get_nhl_player_game_log',
+    'get_nhl_player_game_logs',
     'get_nhl_team_summary_stats',
     'get_nhl_skater_stats_summary',
     'get_nhl_goalie_stats_summary',
+    'get_nhl_team_form',
+    # Composite queries
+    'get_nhl_query',
+    # Export
+    'get_nhl_season_export',
+    # Caching
+    'get_nhl_cache_ttl_policy',
+    # Sessions
+    'get_nhl_session_usage',
 ]
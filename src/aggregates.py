@@ -0,0 +1,206 @@
+import numpy as np
+
+from .cache import cached
+from .client import client
+from .errors import error_result, raise_for_error
+from .parallel import fetch_concurrently
+from .ttl_policy import season_stats_ttl
+
+# Rows requested per page when reading a whole season's summary
+PAGE_SIZE = 100
+# Seasons that were never played
+CANCELLED_SEASONS = {"20042005"}
+
+# How each stats REST summary report is aggregated over seasons:
+#   key: the column rows are grouped on
+#   sums: counting columns, summed
+#   ratios: rate columns recomputed from summed columns as numerator / denominator * scale
+#   weighted: rate columns averaged, weighted by a summed column
+#   sort: the upstream default sort, as (column, descending), before the key ascending
+REPORTS = {
+    "skater": {
+        "key": "playerId",
+        "sums": ("gamesPlayed", "goals", "assists", "points", "plusMinus", "penaltyMinutes", "evGoals",
+                 "evPoints", "ppGoals", "ppPoints", "shGoals", "shPoints", "otGoals", "gameWinningGoals", "shots"),
+        "ratios": {"pointsPerGame": ("points", "gamesPlayed", 1.0), "shootingPct": ("goals", "shots", 1.0)},
+        "weighted": {"timeOnIcePerGame": "gamesPlayed", "faceoffWinPct": "gamesPlayed"},
+        "sort": (("points", True), ("gamesPlayed", False)),
+    },
+    "goalie": {
+        "key": "playerId",
+        "sums": ("gamesPlayed", "gamesStarted", "wins", "losses", "otLosses", "ties", "shutouts", "goalsAgainst",
+                 "saves", "shotsAgainst", "timeOnIce", "goals", "assists", "points", "penaltyMinutes"),
+        "ratios": {"savePct": ("saves", "shotsAgainst", 1.0),
+                   "goalsAgainstAverage": ("goalsAgainst", "timeOnIce", 3600.0)},
+        "weighted": {},
+        "sort": (("wins", True), ("gamesPlayed", False)),
+    },
+    "team": {
+        "key": "teamId",
+        "sums": ("gamesPlayed", "wins", "losses", "otLosses", "ties", "points", "goalsFor", "goalsAgainst",
+                 "regulationAndOtWins", "winsInRegulation", "winsInShootout"),
+        "ratios": {"pointPct": ("points", "gamesPlayed", 0.5),
+                   "goalsForPerGame": ("goalsFor", "gamesPlayed", 1.0),
+                   "goalsAgainstPerGame": ("goalsAgainst", "gamesPlayed", 1.0)},
+        "weighted": {"faceoffWinPct": "gamesPlayed", "penaltyKillPct": "gamesPlayed",
+                     "penaltyKillNetPct": "gamesPlayed", "powerPlayPct": "gamesPlayed",
+                     "powerPlayNetPct": "gamesPlayed", "shotsForPerGame": "gamesPlayed",
+                     "shotsAgainstPerGame": "gamesPlayed"},
+        "sort": (("points", True), ("wins", True)),
+    },
+}
+
+def season_range(start_season: str, end_season: str = None) -> list:
+    """The seasons from start_season to end_season inclusive, in YYYYYYYY format."""
+    end_season = end_season or start_season
+    for season in (start_season, end_season):
+        if len(str(season)) != 8 or not str(season).isdigit():
+            raise ValueError(f"Invalid season {season}; use YYYYYYYY format (e.g., 20232024)")
+    first, last = int(str(start_season)[:4]), int(str(end_season)[:4])
+    if last < first:
+        raise ValueError(f"end_season {end_season} is before start_season {start_season}")
+    seasons = [f"{year}{year + 1}" for year in range(first, last + 1)]
+    return [season for season in seasons if season not in CANCELLED_SEASONS]
+
+class SeasonTable:
+    """
+    One season of a summary report as columns.
+
+    values holds, per row, the summed columns, then for each weighted column
+    its value times its weight; NaN marks a missing value.
+    """
+
+    __slots__ = ("report", "ids", "values", "rows")
+
+    def __init__(self, report: str, rows: list):
+        spec = REPORTS[report]
+        self.report = report
+        self.rows = rows
+        self.ids = np.array([row[spec["key"]] for row in rows], dtype=np.int64)
+        columns = [[_number(row.get(column)) for column in spec["sums"]] +
+                   [_number(row.get(column)) * _number(row.get(weight))
+                    for column, weight in spec["weighted"].items()]
+                   for row in rows]
+        self.values = np.array(columns, dtype=np.float64).reshape(len(rows), _width(spec))
+
+def _number(value) -> float:
+    return np.nan if value is None else float(value)
+
+def _width(spec: dict) -> int:
+    return len(spec["sums"]) + len(spec["weighted"])
+
+def _fetch_page(report: str, season: str, game_type_id: int, franchise_id: str, start: int) -> list:
+    if report == "skater":
+        return client.stats.skater_stats_summary(start_season=season, end_season=season, franchise_id=franchise_id,
+                                                 game_type_id=game_type_id, aggregate=False,
+                                                 start=start, limit=PAGE_SIZE)
+    if report == "goalie":
+        return client.stats.goalie_stats_summary(start_season=season, end_season=season, stats_type="summary",
+                                                 game_type_id=game_type_id, franchise_id=franchise_id,
+                                                 aggregate=False, start=start, limit=PAGE_SIZE)
+    return client.stats.team_summary(start_season=season, end_season=season, game_type_id=game_type_id,
+                                     is_game=False, is_aggregate=False, start=start, limit=PAGE_SIZE)
+
+@cached("season_stats", ttl=season_stats_ttl, shared=False)
+def season_table(report: str, season: str, game_type_id: int = 2, franchise_id: str = None) -> dict:
+    """
+    Every row of one season of a summary report, read page by page and cached.
+
+    Args:
+        report: "skater", "goalie" (summary stats) or "team".
+        season: Season in YYYYYYYY format.
+        game_type_id: 2 for the regular season, 3 for playoffs, 1 for preseason.
+        franchise_id: Optional franchise to restrict skater and goalie rows to.
+
+    Returns:
+        dict: {"table": SeasonTable} or error message.
+    """
+    try:
+        rows, start = [], 0
+        while True:
+            page = _fetch_page(report, season, game_type_id, franchise_id, start)
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return {"table": SeasonTable(report, rows)}
+            start += PAGE_SIZE
+    except Exception as e:
+        return error_result(e)
+
+def aggregate_seasons(report: str, start_season: str, end_season: str = None, game_type_id: int = 2,
+                      franchise_id: str = None, start: int = 0, limit: int = 25) -> list:
+    """
+    A page of a summary report aggregated over a range of seasons, computed locally.
+
+    Each season is read once and cached, so a range overlapping ranges asked
+    for before costs only the seasons not seen yet. Rows are grouped by
+    player or team and their counting columns summed with numpy; rate
+    columns are recomputed from the sums, or averaged weighted by games
+    played where the inputs are not in the report. Descriptive columns come
+    from the latest season, and teamAbbrevs lists every team in the range.
+
+    Args:
+        report: "skater", "goalie" (summary stats) or "team".
+        start_season: First season in YYYYYYYY format.
+        end_season: Last season in YYYYYYYY format. Defaults to start_season.
+        game_type_id: 2 for the regular season, 3 for playoffs, 1 for preseason.
+        franchise_id: Optional franchise to restrict skater and goalie rows to.
+        start: Index of the first row to return, in the upstream default order.
+        limit: Maximum number of rows to return.
+
+    Returns:
+        list: Aggregated rows, in the shape of the upstream aggregate report.
+    """
+    spec = REPORTS[report]
+    seasons = season_range(start_season, end_season)
+    results = fetch_concurrently(lambda season: season_table(report, season, game_type_id, franchise_id), seasons)
+    tables = [table for table in (raise_for_error(result)["table"] for result in results) if len(table.ids)]
+    if not tables:
+        return []
+
+    ids = np.concatenate([table.ids for table in tables])
+    values = np.concatenate([table.values for table in tables])
+    keys, groups = np.unique(ids, return_inverse=True)
+    present = ~np.isnan(values)
+    totals = np.zeros((len(keys), values.shape[1]))
+    counts = np.zeros((len(keys), values.shape[1]), dtype=np.int64)
+    np.add.at(totals, groups, np.where(present, values, 0.0))
+    np.add.at(counts, groups, present)
+    sums = dict(zip(spec["sums"], totals.T))
+
+    columns = {column: np.where(counts[:, i] > 0, totals[:, i], np.nan) for i, column in enumerate(spec["sums"])}
+    for column, (numerator, denominator, scale) in spec["ratios"].items():
+        columns[column] = _divide(sums[numerator] * scale, sums[denominator])
+    for i, (column, weight) in enumerate(spec["weighted"].items(), start=len(spec["sums"])):
+        columns[column] = np.where(counts[:, i] > 0, _divide(totals[:, i], sums[weight]), np.nan)
+
+    # np.lexsort sorts on the last key first; missing values sort last
+    sort_keys = [keys] + [-columns[column] if descending else columns[column]
+                          for column, descending in reversed(spec["sort"])]
+    order = np.lexsort([np.nan_to_num(key, nan=np.inf) for key in sort_keys])[start:start + limit]
+
+    latest, teams = {}, {}
+    selected = set(keys[order].tolist())
+    for table in tables:
+        for row in table.rows:
+            key = row[spec["key"]]
+            if key in selected:
+                latest[key] = row
+                for team in (row.get("teamAbbrevs") or "").split(","):
+                    if team and team not in teams.setdefault(key, []):
+                        teams[key].append(team)
+
+    rows = []
+    for index in order.tolist():
+        key = int(keys[index])
+        row = {column: value for column, value in latest[key].items() if column != "seasonId"}
+        for column, column_values in columns.items():
+            value = column_values[index]
+            row[column] = None if np.isnan(value) else (int(value) if column in sums else float(value))
+        if "teamAbbrevs" in row:
+            row["teamAbbrevs"] = ",".join(teams.get(key, []))
+        rows.append(row)
+    return rows
+
+def _divide(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1.0), np.nan)
@@ -0,0 +1,101 @@
+import functools
+import inspect
+import re
+from datetime import date, datetime
+
+from .errors import error_result
+from .nhl_time import today
+
+_SEASON_PATTERN = re.compile(r"^(\d{4})(?:-?(\d{2}|\d{4}))$")
+
+def canonical_date(value) -> str:
+    """A date as YYYY-MM-DD; None, "" and "now" are the NHL's effective date."""
+    if value is None or str(value).strip().lower() in ("", "now"):
+        return today().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date format: {value}. Please use YYYY-MM-DD.") from None
+
+def optional_date(value):
+    """canonical_date, except that None (no date given) stays None."""
+    return None if value is None else canonical_date(value)
+
+def canonical_month(value) -> str:
+    """A month as YYYY-MM; None, "" and "now" are the month of the NHL's effective date."""
+    if value is None or str(value).strip().lower() in ("", "now"):
+        return today().strftime("%Y-%m")
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise ValueError(f"Invalid month format: {value}. Please use YYYY-MM.") from None
+
+def canonical_team(value):
+    """A team abbreviation in upper case, or None."""
+    return None if value is None else str(value).strip().upper()
+
+def canonical_season(value):
+    """
+    A season id as YYYYYYYY, or None.
+
+    Also accepts an int and the YYYY-YYYY and YYYY-YY forms. The second year
+    must follow the first.
+    """
+    if value is None:
+        return None
+    match = _SEASON_PATTERN.match(str(value).strip())
+    if match:
+        first, second = int(match.group(1)), match.group(2)
+        if len(second) == 2:
+            # Two digit second years only name the year after the first, across centuries too
+            second = first + 1 if (first + 1) % 100 == int(second) else None
+        else:
+            second = int(second)
+        if second == first + 1:
+            return f"{first}{second}"
+    raise ValueError(f"Invalid Season Id {value}; use YYYYYYYY format (e.g., 20232024)")
+
+def current_season() -> str:
+    """The season of the NHL's effective date as YYYYYYYY; a new one starts in July."""
+    day = today()
+    first = day.year if day.month >= 7 else day.year - 1
+    return f"{first}{first + 1}"
+
+def canonical_year(value) -> str:
+    """A four digit year as a string."""
+    text = str(value).strip()
+    if len(text) != 4 or not text.isdigit():
+        raise ValueError(f"Invalid year {value}; use YYYY format (e.g., 2024)")
+    return text
+
+def canonical_arguments(**canonicalizers):
+    """
+    Rewrite a src/ tool function's arguments into canonical form before it runs.
+
+    Calls that mean the same thing ("now" and today's date, "bos" and "BOS",
+    20232024 and "2023-24") then reach the function, and any cache or
+    coalescing layer below this decorator, as the same call. An argument that
+    cannot be canonicalized returns an invalid_argument error result.
+
+    Args:
+        canonicalizers: Parameter name -> function returning its canonical value.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                for name, canonical in canonicalizers.items():
+                    bound.arguments[name] = canonical(bound.arguments[name])
+            except ValueError as e:
+                return error_result(e)
+            return fn(*bound.args, **bound.kwargs)
+
+        return wrapper
+
+    return decorator
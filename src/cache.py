@@ -0,0 +1,177 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from . import remote_cache
+from .compact import compact, expand
+
+# Entries per namespace before the least recently used ones are evicted.
+MAX_ENTRIES = 2048
+
+class TTLCache:
+    """
+    A thread-safe in-memory cache whose entries expire after a per-entry TTL.
+
+    Args:
+        max_entries: Entries kept before the least recently used are evicted.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def get(self, key) -> tuple:
+        """
+        Look up a key.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Hashable cache key.
+            value: Value to store.
+            ttl: Seconds until the entry expires. None keeps it until evicted;
+                 zero or less does not store it at all.
+        """
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        """Whether key has an unexpired entry, without counting a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[0] is None or entry[0] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_cache(namespace: str, max_entries: int = MAX_ENTRIES) -> TTLCache:
+    """Get (creating on first use, with room for max_entries) the cache for a namespace."""
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = TTLCache(max_entries)
+        return _caches[namespace]
+
+def cached(namespace: str, ttl=None, shared: bool = True, compact_values: bool = False):
+    """
+    Cache a src/ tool function's successful results.
+
+    Calls are keyed on their bound arguments, so positional and keyword forms
+    of the same call share an entry. Results containing "error" are never cached.
+    When a shared cache is configured, local misses are looked up there and
+    fresh results written there, so replicas share their upstream fetches.
+
+    Args:
+        namespace: Cache namespace, one per function.
+        ttl: Seconds to keep results, None to keep them until evicted, or a
+             callable taking (arguments, result) and returning either.
+        shared: Whether results may go to the shared cache. Results that are not
+                plain JSON data (e.g., numpy tables) are kept local regardless.
+        compact_values: Keep results in compact form (see src/compact.py) and expand
+                        them on each hit; for large, repetitive JSON payloads.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def key_of(args, kwargs) -> tuple:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(bound.arguments.items())
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = key_of(args, kwargs)
+            cache = get_cache(namespace)
+
+            hit, value = cache.get(key)
+            if hit:
+                return expand(value) if compact_values else value
+            if shared:
+                hit, value, remaining = remote_cache.shared_cache.get(namespace, key)
+                if hit:
+                    cache.set(key, compact(value) if compact_values else value, remaining)
+                    return value
+            result = fn(*args, **kwargs)
+            if "error" not in result:
+                seconds = ttl(dict(key), result) if callable(ttl) else ttl
+                cache.set(key, compact(result) if compact_values else result, seconds)
+                if shared:
+                    remote_cache.shared_cache.set(namespace, key, result, seconds)
+            return result
+
+        def prefetch(calls) -> int:
+            """
+            Load the shared cache's entries for several calls into the local cache in one round trip.
+
+            Args:
+                calls: Positional argument tuples, one per call, e.g. [(season,), ...].
+
+            Returns:
+                int: Entries found in the shared cache.
+            """
+            cache = get_cache(namespace)
+            keys = [key for key in dict.fromkeys(key_of(args, {}) for args in calls) if key not in cache]
+            if not shared or not keys:
+                return 0
+            found = remote_cache.shared_cache.get_many(namespace, keys)
+            for key, (value, remaining) in found.items():
+                cache.set(key, compact(value) if compact_values else value, remaining)
+            return len(found)
+
+        wrapper.cache_namespace = namespace
+        wrapper.prefetch = prefetch
+        return wrapper
+
+    return decorator
+
+def clear_caches() -> None:
+    """Drop every cached entry in every namespace."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+def cache_stats() -> dict:
+    """Entry, hit and miss counts per namespace."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {
+        namespace: {"entries": len(cache), "hits": cache.hits, "misses": cache.misses}
+        for namespace, cache in sorted(caches.items())
+    }
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+# Keys kept per database before the least recently used ones are evicted
+MAX_KEYS = 100_000
+
+class CacheServer:
+    """
+    A small in-memory stand-in for Redis, for local runs and tests.
+
+    It speaks enough of the Redis protocol (RESP) for the shared cache: PING,
+    ECHO, AUTH, SELECT, GET, SET with EX/PX, MGET, DEL, EXISTS, PTTL, TTL,
+    DBSIZE, FLUSHDB, FLUSHALL and QUIT. Commands sent pipelined are answered
+    in order. Nothing is persisted; use a real Redis server in production.
+
+    Args:
+        max_keys: Keys kept per database before the least recently used are evicted.
+    """
+
+    def __init__(self, max_keys: int = MAX_KEYS):
+        self.max_keys = max_keys
+        self._databases = {}
+
+    def _database(self, index: int) -> OrderedDict:
+        return self._databases.setdefault(index, OrderedDict())
+
+    def _live(self, database: OrderedDict, key: bytes):
+        entry = database.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del database[key]
+            return None
+        database.move_to_end(key)
+        return entry
+
+    def execute(self, session: dict, command: list):
+        """The reply to one command: bytes, str (status), int, list, None or an Exception (error)."""
+        name = command[0].decode().upper() if command else ""
+        args = command[1:]
+        database = self._database(session["db"])
+        if name == "PING":
+            return args[0] if args else "PONG"
+        if name == "ECHO" and len(args) == 1:
+            return args[0]
+        if name == "AUTH":
+            return "OK"
+        if name == "SELECT" and len(args) == 1:
+            session["db"] = int(args[0])
+            return "OK"
+        if name == "GET" and len(args) == 1:
+            entry = self._live(database, args[0])
+            return entry[1] if entry else None
+        if name == "MGET" and args:
+            return [entry[1] if entry else None for entry in (self._live(database, key) for key in args)]
+        if name == "SET" and len(args) in (2, 4):
+            expires_at = None
+            if len(args) == 4:
+                unit = args[2].decode().upper()
+                if unit not in ("EX", "PX"):
+                    return ValueError("ERR syntax error")
+                expires_at = time.monotonic() + int(args[3]) / (1 if unit == "EX" else 1000)
+            database[args[0]] = (expires_at, args[1])
+            database.move_to_end(args[0])
+            while len(database) > self.max_keys:
+                database.popitem(last=False)
+            return "OK"
+        if name in ("DEL", "EXISTS") and args:
+            found = [key for key in args if self._live(database, key)]
+            if name == "DEL":
+                for key in found:
+                    del database[key]
+            return len(found)
+        if name in ("PTTL", "TTL") and len(args) == 1:
+            entry = self._live(database, args[0])
+            if entry is None:
+                return -2
+            if entry[0] is None:
+                return -1
+            remaining = entry[0] - time.monotonic()
+            return int(remaining * 1000) if name == "PTTL" else int(remaining)
+        if name == "DBSIZE":
+            return len(database)
+        if name == "FLUSHDB":
+            database.clear()
+            return "OK"
+        if name == "FLUSHALL":
+            self._databases.clear()
+            return "OK"
+        return ValueError(f"ERR unknown command or wrong number of arguments for '{name}'")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = {"db": 0}
+        try:
+            while True:
+                command = await _read_command(reader)
+                if command is None:
+                    break
+                if command and command[0].upper() == b"QUIT":
+                    writer.write(_encode("OK"))
+                    break
+                writer.write(_encode(self.execute(session, command)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 6379) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+async def _read_command(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command, as typed into telnet or nc
+        return line.strip().split()
+    command = []
+    for _ in range(int(line[1:-2])):
+        header = await reader.readline()
+        length = int(header[1:-2])
+        command.append((await reader.readexactly(length + 2))[:-2])
+    return command
+
+def _encode(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode(item) for item in reply)
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+def run_cache_server(host: str = "127.0.0.1", port: int = 6379) -> None:
+    """Serve a CacheServer until interrupted."""
+    async def main():
+        server = await CacheServer().serve(host, port)
+        print(f"Cache server listening on redis://{host}:{port}/0")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+def start_cache_server(host: str = "127.0.0.1", port: int = 0) -> tuple:
+    """
+    Start a CacheServer on a background thread, e.g. for tests.
+
+    Returns:
+        tuple: (url of the server, function that stops it).
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="cache-server", daemon=True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(CacheServer().serve(host, port), loop).result()
+    bound_port = server.sockets[0].getsockname()[1]
+
+    def stop():
+        loop.call_soon_threadsafe(server.close)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"redis://{host}:{bound_port}/0", stop
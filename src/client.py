@@ -1,3 +1,203 @@
+import functools
+import os
+import random
+import threading
+import time
+
+import httpx
 from nhlpy import NHLClient
+from nhlpy.http_client import Endpoint, HttpClient
+
+from . import deadline, profiling, tracing
+from .errors import DeadlineExceeded
+from .hedging import endpoint_key, hedger
+from .sessions import record_upstream_call
+from .upstream_health import upstream_health
+
+def _parse_timeouts(spec: str) -> dict:
+    """Parse "en/skater=20,schedule=5" into {resource prefix: seconds}."""
+    timeouts = {}
+    for item in spec.split(","):
+        prefix, _, seconds = item.partition("=")
+        if prefix.strip() and seconds.strip():
+            timeouts[prefix.strip()] = float(seconds)
+    return timeouts
+
+# Seconds to wait for one upstream response, by resource prefix (longest match wins)
+DEFAULT_TIMEOUT = float(os.environ.get("NHL_MCP_UPSTREAM_TIMEOUT", 10))
+ENDPOINT_TIMEOUTS = {
+    # Stats REST summaries are computed on request and can be slow
+    "en/skater": 20.0,
+    "en/goalie": 20.0,
+    "en/team": 20.0,
+    "club-schedule-season/": 15.0,
+    "schedule/": 8.0,
+    "standings/": 8.0,
+    **_parse_timeouts(os.environ.get("NHL_MCP_UPSTREAM_TIMEOUTS", "")),
+}
+
+# Retries of a failed GET (all upstream calls are idempotent GETs)
+MAX_RETRIES = int(os.environ.get("NHL_MCP_MAX_RETRIES", 2))
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 4.0
+MAX_RETRY_AFTER = 10.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Endpoint families upstream health is tracked by
+ENDPOINT_FAMILIES = {Endpoint.API_WEB_V1: "web", Endpoint.API_STATS: "stats", Endpoint.API_CORE: "core"}
+
+# Sub-APIs whose requests may be hedged (see src/hedging.py)
+HEDGED_APIS = ("schedule", "standings", "stats")
+
+# Upstream connections kept open for reuse, across all NHL hosts
+POOL_SIZE = int(os.environ.get("NHL_MCP_POOL_SIZE", 16))
+# Seconds an idle pooled connection is kept before it is closed
+KEEPALIVE_EXPIRY = float(os.environ.get("NHL_MCP_KEEPALIVE_EXPIRY", 120))
+
+def endpoint_timeout(resource: str) -> float:
+    """The timeout for a resource: the longest matching prefix in ENDPOINT_TIMEOUTS, else the default."""
+    matches = [prefix for prefix in ENDPOINT_TIMEOUTS if resource.startswith(prefix)]
+    return ENDPOINT_TIMEOUTS[max(matches, key=len)] if matches else DEFAULT_TIMEOUT
+
+def backoff_delay(attempt: int, retry_after: str = None) -> float:
+    """
+    Seconds to wait before retry number attempt (1-based).
+
+    Uses full jitter: a uniform draw up to the capped exponential backoff, so
+    clients retrying together spread out. A Retry-After header in seconds
+    takes precedence, up to MAX_RETRY_AFTER.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+class ResilientHttpClient(HttpClient):
+    """
+    nhlpy's HttpClient with per-endpoint timeouts, retries and request deadlines.
+
+    Timeouts, connection errors, 429 and 5xx responses are retried up to
+    MAX_RETRIES times with jittered exponential backoff. Each attempt's timeout
+    is cut to what is left of the current request deadline, and no retry is
+    started that could not finish before it. Every upstream response is charged
+    to the calling session, and traced when the calling tool call is sampled.
+    Attempts made with hedge=True may be hedged by src.hedging.hedger.
+
+    Requests share one pooled httpx.Client, so connections, and the DNS
+    lookups and TLS handshakes behind them, are reused across calls and threads.
+    """
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _pool(self) -> httpx.Client:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        verify=self._config.ssl_verify,
+                        follow_redirects=self._config.follow_redirects,
+                        limits=httpx.Limits(max_connections=None, max_keepalive_connections=POOL_SIZE,
+                                            keepalive_expiry=KEEPALIVE_EXPIRY),
+                    )
+        return self._client
+
+    def warm(self, url: str) -> None:
+        """Make a cheap request to url so a pooled connection to its host is open and ready."""
+        self._pool().head(url, timeout=DEFAULT_TIMEOUT)
+
+    def close(self) -> None:
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def get(self, endpoint, resource: str, query_params: dict = None, hedge: bool = False) -> httpx.Response:
+        url = f"{endpoint.value}{resource}"
+        family = ENDPOINT_FAMILIES.get(endpoint, "other")
+        with tracing.upstream_span(url) as span:
+            response = self._get(url, resource, query_params, span, family, hedge)
+        return response
+
+    def _get(self, url: str, resource: str, query_params: dict, span, family: str,
+             hedge: bool = False) -> httpx.Response:
+        profile = profiling.current()
+        attempt = 0
+        while True:
+            timeout = self._attempt_timeout(resource)
+            extensions = {"trace": profile.trace()} if profile else None
+            if span:
+                span.set("http.request.resend_count", attempt)
+            try:
+                send = functools.partial(self._pool().get, url=url, params=query_params, timeout=timeout,
+                                         extensions=extensions)
+                response = hedger.call(endpoint_key(resource), send, deadline.remaining()) if hedge else send()
+            except (httpx.TimeoutException, httpx.TransportError):
+                upstream_health.record(family, False)
+                attempt += 1
+                if not self._may_retry(attempt, backoff_delay(attempt)):
+                    raise
+                continue
+            record_upstream_call(len(response.content))
+            upstream_health.record(family, response.status_code not in RETRY_STATUSES)
+            if span:
+                span.set("http.response.status_code", response.status_code)
+                span.set("http.response.body.size", len(response.content))
+
+            if response.status_code in RETRY_STATUSES:
+                attempt += 1
+                if self._may_retry(attempt, backoff_delay(attempt, response.headers.get("retry-after"))):
+                    continue
+            self._handle_response(response, resource)
+            if profile:
+                # nhlpy decodes the body after this returns
+                response.json = profile.timed("decode", response.json)
+            return response
+
+    def _attempt_timeout(self, resource: str) -> float:
+        timeout = endpoint_timeout(resource)
+        left = deadline.remaining()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded(f"Request deadline exceeded before fetching {resource}")
+            timeout = min(timeout, left)
+        return timeout
+
+    def _may_retry(self, attempt: int, delay: float) -> bool:
+        """Sleep and return True if retry number attempt can run before the deadline."""
+        if attempt > MAX_RETRIES:
+            return False
+        left = deadline.remaining()
+        if left is not None and delay >= left:
+            return False
+        self._logger.debug(f"Retrying upstream request (attempt {attempt}) in {delay:.2f}s")
+        time.sleep(delay)
+        return True
+
+class _HedgedRequests:
+    """http_client as given to a sub-API in HEDGED_APIS: its GETs are idempotent, so they may be hedged."""
+
+    def __init__(self, http_client: ResilientHttpClient):
+        self._http_client = http_client
+
+    def get(self, endpoint, resource: str, query_params: dict = None) -> httpx.Response:
+        return self._http_client.get(endpoint, resource, query_params, hedge=True)
+
+    def __getattr__(self, name):
+        return getattr(self._http_client, name)
+
+def _install_http_client(nhl_client: NHLClient, http_client: HttpClient) -> None:
+    """Point an NHLClient and all of its sub-APIs at http_client."""
+    nhl_client._http_client = http_client
+    for name, api in vars(nhl_client).items():
+        if hasattr(api, "client") and isinstance(api.client, (HttpClient, _HedgedRequests)):
+            api.client = _HedgedRequests(http_client) if name in HEDGED_APIS else http_client
 
-client = NHLClient(debug=True)
+# Upstream requests are traced by src.tracing rather than logged one by one
+client = NHLClient()
+http_client = ResilientHttpClient(client._config)
+_install_http_client(client, http_client)
@@ -0,0 +1,81 @@
+import sys
+import weakref
+
+# Strings up to this length are interned; longer ones (URLs, descriptions) are rarely repeated
+INTERN_MAX_LENGTH = 40
+# Records with at most this many scalar fields are shared between every payload holding an equal one
+SHARE_MAX_FIELDS = 4
+
+# Distinct record shapes whose key tuple is shared
+MAX_SHAPES = 10_000
+
+# Key tuples, one per distinct record shape
+_shapes = {}
+# Small scalar records ({"default": "Boston"}, {"abbrev": "BOS", ...}), shared while any payload holds them
+_shared = weakref.WeakValueDictionary()
+
+class Record:
+    """
+    A compact, read-only JSON object: one key tuple shared by every record of the same shape, plus its values.
+
+    Supports the read-only lookups (record["key"], record.get("key")) that
+    code filtering or sorting cached payloads needs, without expanding it.
+    """
+
+    __slots__ = ("keys", "values", "__weakref__")
+
+    def __init__(self, keys: tuple, values: tuple):
+        self.keys = keys
+        self.values = values
+
+    def __getitem__(self, key):
+        try:
+            return self.values[self.keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys
+
+def _scalar(value):
+    if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+def compact(value):
+    """
+    A JSON-shaped value (dicts, lists, scalars) in compact form.
+
+    Dicts become Records whose key tuples are shared by shape, lists become
+    tuples, short strings are interned, and small records made only of
+    scalars are shared between payloads. Expand it with expand().
+    """
+    if isinstance(value, dict):
+        keys = tuple(_scalar(key) for key in value)
+        keys = _shapes.get(keys) or (_shapes.setdefault(keys, keys) if len(_shapes) < MAX_SHAPES else keys)
+        values = tuple(compact(item) for item in value.values())
+        if len(values) > SHARE_MAX_FIELDS or any(isinstance(item, (Record, tuple)) for item in values):
+            return Record(keys, values)
+        # Types are part of the identity: 1, 1.0 and True are equal but must not share a record
+        identity = (keys, values, tuple(type(item) for item in values))
+        record = _shared.get(identity)
+        if record is None:
+            record = _shared[identity] = Record(keys, values)
+        return record
+    if isinstance(value, list):
+        return tuple(compact(item) for item in value)
+    return _scalar(value)
+
+def expand(value):
+    """The plain dicts and lists a compact value stands for, freshly built so callers may modify them."""
+    if isinstance(value, Record):
+        return {key: expand(item) for key, item in zip(value.keys, value.values)}
+    if isinstance(value, tuple):
+        return [expand(item) for item in value]
+    return value
@@ -0,0 +1,158 @@
+import zlib
+
+from starlette.datastructures import MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Only text-like responses are worth compressing; everything else is passed through.
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Supports "br" (when the brotli package is installed) and "gzip", honouring
+    q-values. Brotli wins ties.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value.
+
+    Returns:
+        str | None: "br", "gzip" or None for an uncompressed response.
+    """
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+class _Compressor:
+    """Incremental compressor with a flush that keeps already-sent output decodable."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+class CompressionMiddleware:
+    """
+    ASGI middleware for negotiated gzip/brotli compression and chunked streaming.
+
+    Only text-like content types are compressed. Bodies sent in one piece are
+    compressed when they reach minimum_size, and are compressed and sent on in
+    chunk_size pieces so the first bytes leave before the whole body is
+    compressed. Streamed bodies (e.g. MCP server-sent events) are compressed
+    message by message and flushed, so events are not held back.
+
+    Args:
+        app: The ASGI application to wrap.
+        minimum_size: Smallest single-piece body, in bytes, worth compressing.
+        chunk_size: Size, in bytes, of the uncompressed slices large bodies are compressed in.
+        gzip_level: zlib compression level for gzip.
+        brotli_quality: Brotli quality (0-11); low values favour latency.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, chunk_size: int = 64 * 1024,
+                 gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.chunk_size = chunk_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        responder = _Responder(self, send, negotiate_encoding(accept_encoding))
+        await self.app(scope, receive, responder.send)
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, send, encoding: str | None):
+        self.middleware = middleware
+        self.downstream = send
+        self.encoding = encoding
+        self.start_message = None
+        self.compressor = None
+        self.started = False
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body message shows how the body is sent
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.start_message is None:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            await self._start(body, more_body)
+
+        if self.compressor is not None:
+            await self._send_compressed(body, more_body)
+        else:
+            await self.downstream(message)
+
+    async def _start(self, body: bytes, more_body: bool):
+        headers = MutableHeaders(raw=list(self.start_message.get("headers", [])))
+        if headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            # Caches must key every compressible response on Accept-Encoding,
+            # including the variants that were left uncompressed
+            headers.add_vary_header("Accept-Encoding")
+            if (
+                self.encoding is not None
+                and "content-encoding" not in headers
+                and (more_body or len(body) >= self.middleware.minimum_size)
+            ):
+                self.compressor = _Compressor(self.encoding, self.middleware.gzip_level,
+                                              self.middleware.brotli_quality)
+                headers["content-encoding"] = self.encoding
+                # The length changes, so let the server fall back to chunked encoding
+                del headers["content-length"]
+        await self.downstream({**self.start_message, "headers": headers.raw})
+
+    async def _send_compressed(self, body: bytes, more_body: bool):
+        chunk_size = self.middleware.chunk_size
+        for offset in range(0, len(body), chunk_size):
+            data = self.compressor.compress(body[offset:offset + chunk_size])
+            if data:
+                await self.downstream({"type": "http.response.body", "body": data, "more_body": True})
+        if not more_body:
+            await self.downstream({"type": "http.response.body", "body": self.compressor.finish(), "more_body": False})
@@ -0,0 +1,33 @@
+import contextlib
+import contextvars
+import os
+import time
+
+# Seconds an MCP tool call may take in total, including queueing and retries
+REQUEST_BUDGET = float(os.environ.get("NHL_MCP_REQUEST_BUDGET", 30))
+
+_deadline = contextvars.ContextVar("nhl_request_deadline", default=None)
+
+@contextlib.contextmanager
+def deadline(budget: float = REQUEST_BUDGET):
+    """
+    Give the calls made inside the block a shared time budget.
+
+    The deadline is a context variable, so it follows the call onto worker
+    threads (asyncio.to_thread and fetch_concurrently copy the context). A
+    nested block can only shorten the deadline, never extend it.
+    """
+    expires_at = time.monotonic() + budget
+    current = _deadline.get()
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None outside any deadline."""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
@@ -0,0 +1,106 @@
+import hashlib
+import json
+
+from .cache import get_cache
+
+# Past results kept so a later poll can be answered with a diff against them
+MAX_VERSIONS = 256
+# Seconds a past result is kept; older version tokens get the full result again
+VERSION_TTL = 60 * 60
+
+# Keys that identify the items of a list; lists whose items all carry one are diffed item by item
+ITEM_KEYS = ("id", "gameId", "seriesLetter", "roundNumber", "teamAbbrev")
+
+def version_token(result: dict) -> str:
+    """A token for a result's content: equal results get equal tokens, across calls and processes."""
+    encoded = json.dumps(result, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+def _item_key(items: list):
+    """The key identifying every item of a list of dicts uniquely, if there is one."""
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for key in ITEM_KEYS:
+        ids = [_scalar(item.get(key)) for item in items]
+        if None not in ids and len(set(ids)) == len(ids):
+            return key
+    return None
+
+def _scalar(value):
+    # Localized names such as teamAbbrev come as {"default": "BOS"}
+    if isinstance(value, dict):
+        value = value.get("default")
+    return value if isinstance(value, (str, int)) else None
+
+def _pointer(path: str, segment) -> str:
+    return f"{path}/{str(segment).replace('~', '~0').replace('/', '~1')}"
+
+def diff(old, new, path: str = "") -> list:
+    """
+    The changes that turn old into new, as a list of {"op", "path", "value"}.
+
+    Paths are JSON pointers. Items of lists whose items share an identifying
+    key (see ITEM_KEYS) are addressed by that key's value rather than their
+    position, so a reordered standings table shows as an "order" change plus
+    the rows whose values changed, not as every row replaced.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in old.keys() - new.keys():
+            changes.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                changes.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                changes.extend(diff(old[key], value, _pointer(path, key)))
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        key = _item_key(old)
+        if key is not None and key == _item_key(new):
+            return _diff_keyed(old, new, key, path)
+        if len(old) == len(new):
+            return [change for i, (a, b) in enumerate(zip(old, new)) for change in diff(a, b, _pointer(path, i))]
+    if old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+def _diff_keyed(old: list, new: list, key: str, path: str) -> list:
+    old_items = {_scalar(item[key]): item for item in old}
+    new_items = {_scalar(item[key]): item for item in new}
+    changes = []
+    for item_id in old_items.keys() - new_items.keys():
+        changes.append({"op": "remove", "path": _pointer(path, item_id)})
+    for item_id, item in new_items.items():
+        if item_id not in old_items:
+            changes.append({"op": "add", "path": _pointer(path, item_id), "value": item})
+        else:
+            changes.extend(diff(old_items[item_id], item, _pointer(path, item_id)))
+    if list(new_items) != list(old_items):
+        changes.append({"op": "order", "path": path, "value": list(new_items)})
+    return changes
+
+def delta_result(result: dict, since_version: str = None) -> dict:
+    """
+    A tool result with its version token, or only what changed since the client's version.
+
+    Args:
+        result: The tool's full result. Errors are returned unchanged.
+        since_version: The version token from the client's previous result, if any.
+
+    Returns:
+        dict: {"version", "not_modified": True} when nothing changed; {"version",
+              "since_version", "changes"} when the client's version is still known;
+              otherwise the full result with its "version".
+    """
+    if "error" in result:
+        return result
+    version = version_token(result)
+    history = get_cache("delta_versions", max_entries=MAX_VERSIONS)
+    history.set(version, result, VERSION_TTL)
+    if since_version == version:
+        return {"version": version, "not_modified": True}
+    if since_version:
+        hit, previous = history.get(since_version)
+        if hit:
+            return {"version": version, "since_version": since_version, "changes": diff(previous, result)}
+    return {**result, "version": version}
@@ -0,0 +1,119 @@
+from .aggregates import season_range
+from .arguments import canonical_arguments, canonical_season
+from .errors import error_result, raise_for_error
+from .parallel import fetch_concurrently
+from .stats import get_nhl_gametypes_per_season_by_team, get_nhl_player_career_stats, get_nhl_player_game_log
+
+__all__ = [
+    'get_nhl_player_game_logs',
+]
+
+# Game types fetched by multi-season game log requests unless others are asked for
+DEFAULT_GAME_TYPES = (2, 3)
+# Game types career season totals list; they say nothing about the others (e.g., preseason)
+CAREER_GAME_TYPES = (2, 3)
+
+def team_directory(team_abbr: str) -> dict:
+    """
+    The seasons a team played and the game types it played in each, from its cached game type directory.
+
+    Returns:
+        dict: Season (YYYYYYYY) -> set of game type ids.
+    """
+    directory = {}
+    for entry in raise_for_error(get_nhl_gametypes_per_season_by_team(team_abbr))["gametypes"] or []:
+        directory.setdefault(str(entry["season"]), set()).update(entry.get("gameTypes") or ())
+    return directory
+
+def player_directory(player_id: str) -> dict:
+    """
+    The NHL seasons a player played and the game types played in each, from the season
+    totals of their cached career stats. Seasons in other leagues have no NHL game log.
+    Only CAREER_GAME_TYPES are listed: season totals do not cover preseason games.
+
+    Returns:
+        dict: Season (YYYYYYYY) -> set of game type ids.
+    """
+    return career_directory(raise_for_error(get_nhl_player_career_stats(str(player_id)))["player_stats"])
+
+def career_directory(stats: dict) -> dict:
+    """player_directory() for career stats already fetched."""
+    directory = {}
+    for totals in stats.get("seasonTotals") or []:
+        if totals.get("leagueAbbrev") == "NHL":
+            directory.setdefault(str(totals["season"]), set()).add(totals["gameTypeId"])
+    return directory
+
+def plan(directory: dict, seasons: list, game_types, described=None) -> tuple:
+    """
+    The (season, game type) combinations worth fetching.
+
+    Args:
+        directory: Season -> game types, from team_directory() or player_directory().
+        seasons: Seasons asked for, in order.
+        game_types: Game type ids asked for.
+        described: Game types the directory can rule out, or None for all of them.
+                   Combinations of any other game type are always fetched.
+
+    Returns:
+        tuple: (combinations present in the directory or not described by it, number of combinations skipped).
+    """
+    wanted = [(season, game_type) for season in seasons for game_type in game_types]
+    present = [(season, game_type) for season, game_type in wanted
+               if game_type in directory.get(season, ()) or (described is not None and game_type not in described)]
+    return present, len(wanted) - len(present)
+
+@canonical_arguments(start_season=canonical_season, end_season=canonical_season)
+def get_nhl_player_game_logs(player_id: str, start_season: str = None, end_season: str = None,
+                             game_types: list = None) -> dict:
+    """
+    Gets a player's game logs across several seasons, e.g. a whole career, in one call.
+
+    The player's season totals are checked first, so only the seasons and game
+    types the player actually played in the NHL are fetched (concurrently);
+    seasons spent in other leagues and playoffs not reached cost no requests.
+    Season totals do not cover preseason games, so preseason game logs are
+    fetched for every season in the range.
+
+    Args:
+        player_id (str): The unique identifier for the NHL player
+        start_season (str, optional): First season in YYYYYYYY format. Defaults to the player's first NHL season
+        end_season (str, optional): Last season in YYYYYYYY format. Defaults to the player's last NHL season
+        game_types (list, optional): Game types to include: 1 preseason, 2 regular season, 3 playoffs.
+                                     Defaults to [2, 3]
+
+    Returns:
+        dict: Game logs per season and game type, oldest first, with the number of game logs
+              fetched and skipped and any that failed to load, or error message.
+    """
+    try:
+        directory = player_directory(player_id)
+        game_types = [int(game_type) for game_type in game_types or DEFAULT_GAME_TYPES]
+        seasons = sorted(directory)
+        if not seasons and not (start_season or end_season):
+            return {"player_id": str(player_id), "game_logs": [], "total_games": 0, "fetched": 0,
+                    "skipped": 0, "missing": []}
+        first = start_season or (seasons[0] if seasons else end_season)
+        last = end_season or max(seasons[-1] if seasons else first, first)
+        seasons = season_range(first, last)
+        combinations, skipped = plan(directory, seasons, game_types, described=CAREER_GAME_TYPES)
+
+        get_nhl_player_game_log.prefetch([(str(player_id), season, game_type) for season, game_type in combinations])
+        results = fetch_concurrently(lambda combination: get_nhl_player_game_log(str(player_id), *combination),
+                                     combinations)
+        game_logs, missing = [], []
+        for (season, game_type), result in zip(combinations, results):
+            if "error" in result:
+                missing.append({"season": season, "game_type": game_type, "error": result["error"]})
+            else:
+                game_logs.append({"season": season, "game_type": game_type, "games": result["game_log"]})
+        return {
+            "player_id": str(player_id),
+            "game_logs": game_logs,
+            "total_games": sum(len(log["games"] or []) for log in game_logs),
+            "fetched": len(combinations),
+            "skipped": skipped,
+            "missing": missing,
+        }
+    except Exception as e:
+        return error_result(e)
@@ -0,0 +1,71 @@
+import httpx
+from nhlpy.http_client import (BadRequestException, NHLApiException, RateLimitExceededException,
+                               ResourceNotFoundException, ServerErrorException, UnauthorizedException)
+
+# Error codes returned to MCP clients next to the error message
+TIMEOUT = "timeout"
+NOT_FOUND = "not_found"
+UPSTREAM_5XX = "upstream_5xx"
+THROTTLED = "throttled"
+UPSTREAM_UNAVAILABLE = "upstream_unavailable"
+BAD_REQUEST = "bad_request"
+UNAUTHORIZED = "unauthorized"
+INVALID_ARGUMENT = "invalid_argument"
+INTERNAL = "internal"
+
+# Codes a client may retry later; the server has already retried these itself
+RETRYABLE_CODES = {TIMEOUT, UPSTREAM_5XX, THROTTLED, UPSTREAM_UNAVAILABLE}
+
+class DeadlineExceeded(TimeoutError):
+    """The MCP request ran out of time before the upstream call could finish."""
+
+class ToolError(Exception):
+    """An error carried from one tool function's result into another, keeping its code."""
+
+    def __init__(self, message: str, code: str = INTERNAL):
+        super().__init__(message)
+        self.code = code
+
+def error_code(e: Exception) -> str:
+    """The error code for an exception raised while serving a tool call."""
+    if isinstance(e, ToolError):
+        return e.code
+    if isinstance(e, (DeadlineExceeded, httpx.TimeoutException)):
+        return TIMEOUT
+    if isinstance(e, ResourceNotFoundException):
+        return NOT_FOUND
+    if isinstance(e, RateLimitExceededException):
+        return THROTTLED
+    if isinstance(e, ServerErrorException):
+        return UPSTREAM_5XX
+    if isinstance(e, BadRequestException):
+        return BAD_REQUEST
+    if isinstance(e, UnauthorizedException):
+        return UNAUTHORIZED
+    if isinstance(e, NHLApiException):
+        return UPSTREAM_5XX if (e.status_code or 0) >= 500 else BAD_REQUEST
+    if isinstance(e, httpx.TransportError):
+        return UPSTREAM_UNAVAILABLE
+    if isinstance(e, ValueError):
+        return INVALID_ARGUMENT
+    return INTERNAL
+
+def error_result(e: Exception, message: str = None) -> dict:
+    """
+    The tool result for a failed call.
+
+    Args:
+        e: The exception raised.
+        message: Optional message to use instead of str(e).
+
+    Returns:
+        dict: {"error": message, "error_code": code, "retryable": bool}.
+    """
+    code = error_code(e)
+    return {"error": message or str(e), "error_code": code, "retryable": code in RETRYABLE_CODES}
+
+def raise_for_error(result: dict) -> dict:
+    """Raise a ToolError with the result's code if result is an error result, else return it."""
+    if "error" in result:
+        raise ToolError(result["error"], result.get("error_code", INTERNAL))
+    return result
@@ -0,0 +1,265 @@
+import json
+import os
+import shutil
+import tempfile
+
+from .errors import error_result, raise_for_error
+from .parallel import fetch_concurrently
+from .schedule import _season_team_abbrs, get_nhl_team_season_schedule
+from .standings import get_nhl_standings
+from .stats import get_nhl_goalie_stats_summary, get_nhl_skater_stats_summary
+
+__all__ = [
+    'get_nhl_season_export',
+]
+
+# Directory the export tool writes under; the CLI takes any output directory
+EXPORT_DIR = os.environ.get("NHL_MCP_EXPORT_DIR", "exports")
+# Seconds the export tool may run, instead of the usual request budget
+EXPORT_BUDGET = float(os.environ.get("NHL_MCP_EXPORT_BUDGET", 600))
+# Rows requested per page of the stats REST summaries
+PAGE_SIZE = 100
+
+TABLES = ("schedules", "skaters", "goalies", "standings")
+FORMATS = {"ndjson": ".ndjson", "parquet": ".parquet", "arrow": ".arrow"}
+
+def _paged(fetch, key: str, season: str) -> list:
+    """Every row of a stats REST summary for one season, page by page."""
+    rows, start = [], 0
+    while True:
+        page = raise_for_error(fetch(start_season=season, end_season=season, start=start, limit=PAGE_SIZE))[key]
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+def _schedule_rows(season: str) -> list:
+    """Every game of the season once, from all team season schedules fetched in parallel."""
+    teams = _season_team_abbrs(season)
+    games = {}
+    for result in fetch_concurrently(lambda team: get_nhl_team_season_schedule(team, season), teams):
+        for game in raise_for_error(result)["schedule"].get("games", []):
+            games[game["id"]] = game
+    return sorted(games.values(), key=lambda game: (game.get("gameDate", ""), game["id"]))
+
+def _standings_rows(season: str) -> list:
+    return raise_for_error(get_nhl_standings(season=season))["standings"].get("standings", [])
+
+FETCHERS = {
+    "schedules": _schedule_rows,
+    "skaters": lambda season: _paged(get_nhl_skater_stats_summary, "skater_stats", season),
+    "goalies": lambda season: _paged(get_nhl_goalie_stats_summary, "goalie_stats", season),
+    "standings": _standings_rows,
+}
+
+def flatten(row: dict, prefix: str = "") -> dict:
+    """
+    Flatten nested objects into dotted columns, so rows fit a flat table.
+
+    {"homeTeam": {"abbrev": "BOS"}} becomes {"homeTeam.abbrev": "BOS"}.
+    Lists are kept as JSON text.
+    """
+    flat = {}
+    for key, value in row.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, separators=(",", ":"))
+        else:
+            flat[name] = value
+    return flat
+
+class NDJSONWriter:
+    """Appends rows to a file as one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w")
+
+    def write(self, rows: list) -> None:
+        for row in rows:
+            self._file.write(json.dumps(row, separators=(",", ":")))
+            self._file.write("\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+class ArrowWriter:
+    """
+    Writes batches of rows to a Parquet or Arrow IPC file, one row group or
+    record batch per write.
+
+    A file has one schema, but batches may bring new columns or change a
+    column's type (e.g. all integers in one season, decimals in the next). Each
+    batch is spooled to a temporary Arrow file with its own schema, and on close
+    every batch is cast to the schema unifying them all and written out, one
+    batch in memory at a time. Conflicting types are promoted where Arrow can
+    (int64 and double to double), and become strings otherwise; columns that
+    are only ever null become strings.
+    """
+
+    def __init__(self, path: str, fmt: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError(f"The {fmt} format needs pyarrow; install the 'export' extra or use ndjson")
+        self.path = path
+        self.fmt = fmt
+        self._types = {}
+        self._spool_dir = None
+        self._batches = []
+
+    def write(self, rows: list) -> None:
+        import pyarrow as pa
+
+        rows = [flatten(row) for row in rows]
+        if not rows:
+            return
+        table = pa.Table.from_pylist(rows)
+        for field in table.schema:
+            self._types[field.name] = _unify_types(self._types.get(field.name), field.type)
+        if self._spool_dir is None:
+            self._spool_dir = tempfile.mkdtemp(prefix=".spool-", dir=os.path.dirname(self.path) or ".")
+        batch = os.path.join(self._spool_dir, f"{len(self._batches)}.arrow")
+        with pa.ipc.new_file(batch, table.schema) as writer:
+            writer.write_table(table)
+        self._batches.append(batch)
+
+    def close(self) -> None:
+        import pyarrow as pa
+
+        if self._spool_dir is None:
+            return
+        try:
+            schema = pa.schema([(name, pa.string() if pa.types.is_null(type_) else type_)
+                                for name, type_ in self._types.items()])
+            if self.fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                writer = pq.ParquetWriter(self.path, schema)
+            else:
+                writer = pa.ipc.new_file(self.path, schema)
+            with writer:
+                for batch in self._batches:
+                    with pa.memory_map(batch) as source:
+                        table = pa.ipc.open_file(source).read_all()
+                    writer.write_table(_conform(table, schema))
+        finally:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+            self._spool_dir = None
+            self._batches = []
+
+def _unify_types(current, new):
+    """The type holding values of both current (None for a new column) and new."""
+    import pyarrow as pa
+
+    if current is None or current == new:
+        return new
+    try:
+        return pa.unify_schemas([pa.schema([("value", current)]), pa.schema([("value", new)])],
+                                promote_options="permissive").field("value").type
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return pa.string()
+
+def _conform(table, schema):
+    """table with schema's columns, in its order: cast where they differ, null where missing."""
+    import pyarrow as pa
+
+    columns = [table.column(field.name).cast(field.type) if field.name in table.column_names
+               else pa.nulls(table.num_rows, field.type) for field in schema]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+def _open_writer(path: str, fmt: str):
+    return NDJSONWriter(path) if fmt == "ndjson" else ArrowWriter(path, fmt)
+
+def export_seasons(seasons, out_dir: str, fmt: str = "ndjson", tables=TABLES) -> dict:
+    """
+    Export whole-season datasets to one file per table.
+
+    Seasons are fetched one after another, each season's tables in parallel,
+    and every season's rows are written out before the next season is fetched,
+    so memory use does not grow with the number of seasons. Each row carries
+    an exportSeason column.
+
+    Args:
+        seasons: Seasons in YYYYYYYY format.
+        out_dir: Directory to write the files to; created if missing.
+        fmt: "ndjson", "parquet" or "arrow" (Arrow IPC). Parquet and Arrow need pyarrow.
+        tables: Tables to export, from "schedules", "skaters", "goalies" and "standings".
+
+    Returns:
+        dict: The format, seasons and, per table, the file path, row count and size in bytes.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt}; use one of {', '.join(FORMATS)}")
+    unknown = [table for table in tables if table not in FETCHERS]
+    if unknown:
+        raise ValueError(f"Unknown export tables {', '.join(unknown)}; use any of {', '.join(TABLES)}")
+    seasons = [str(season) for season in seasons]
+    for season in seasons:
+        if len(season) != 8 or not season.isdigit():
+            raise ValueError(f"Invalid season {season}; use YYYYYYYY format (e.g., 20232024)")
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {table: os.path.join(out_dir, f"{table}{FORMATS[fmt]}") for table in tables}
+    writers = {}
+    counts = dict.fromkeys(tables, 0)
+    try:
+        for table in tables:
+            writers[table] = _open_writer(paths[table], fmt)
+        for season in seasons:
+            results = fetch_concurrently(lambda table: FETCHERS[table](season), tables)
+            for table, rows in zip(tables, results):
+                writers[table].write([{"exportSeason": season, **row} for row in rows])
+                counts[table] += len(rows)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {
+        "format": fmt,
+        "seasons": seasons,
+        "files": [{"table": table, "path": paths[table], "rows": counts[table],
+                   "bytes": os.path.getsize(paths[table]) if os.path.exists(paths[table]) else 0}
+                  for table in tables],
+    }
+
+def parse_seasons(seasons: str) -> list:
+    """Parse "20212022,20222023" or a range "20202021-20232024" into a list of seasons."""
+    result = []
+    for part in str(seasons).split(","):
+        part = part.strip()
+        if "-" in part:
+            first, _, last = part.partition("-")
+            result.extend(f"{year}{year + 1}" for year in range(int(first[:4]), int(last[:4]) + 1))
+        elif part:
+            result.append(part)
+    return result
+
+def get_nhl_season_export(seasons: str, format: str = "ndjson", tables: str = None) -> dict:
+    """
+    Export whole-season datasets (team schedules, skater and goalie summaries, standings) to files.
+
+    Files are written on the server under the export directory, one per table,
+    in a subdirectory named after the seasons.
+
+    Args:
+        seasons: Seasons in YYYYYYYY format, comma separated (e.g., "20222023,20232024")
+                 or as a range (e.g., "20182019-20232024").
+        format: "ndjson" (default), "parquet" or "arrow". Parquet and Arrow need pyarrow on the server.
+        tables: Optional comma separated tables to export: schedules, skaters, goalies, standings.
+                Defaults to all.
+
+    Returns:
+        dict: Per table, the file path, row count and size in bytes, or error message.
+    """
+    try:
+        season_list = parse_seasons(seasons)
+        if not season_list:
+            raise ValueError("No seasons given")
+        table_list = [table.strip() for table in tables.split(",")] if tables else list(TABLES)
+        name = season_list[0] if len(season_list) == 1 else f"{season_list[0]}-{season_list[-1]}"
+        return export_seasons(season_list, os.path.join(EXPORT_DIR, name), format, table_list)
+    except Exception as e:
+        return error_result(e)
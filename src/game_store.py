@@ -0,0 +1,228 @@
+import calendar
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+
+from .client import client
+from .compact import compact, expand
+from .nhl_time import nhl_date, utc_now
+from .parallel import fetch_concurrently
+from .ttl_policy import IDLE_TTL, STATE_TTLS, _game_state, _most_urgent
+
+# Days held at once; the least recently used day is dropped first
+MAX_DAYS = int(os.environ.get("NHL_MCP_GAME_STORE_DAYS", 400))
+
+# Weekly schedule fields that are not per day, kept for the daily and weekly tools
+ENVELOPE_SKIP = ("gameWeek", "numberOfGames")
+
+class GameStore:
+    """
+    Schedule games keyed by game id and indexed by date and team.
+
+    Window queries (a day, a week, a team's week or month) are answered from
+    the store, and only the dates it does not hold yet are fetched: league-wide
+    dates a week at a time from the weekly schedule, one team's dates a month at
+    a time from its monthly schedule. Overlapping windows share the games
+    already downloaded, and concurrent queries needing the same block wait for
+    a single fetch.
+
+    A day is fresh until the TTL of its most urgent game state (live, recently
+    final, upcoming or idle), and for good once it is before yesterday. At
+    most max_days days are held; past that the least recently used day and its
+    games are dropped, to be fetched again if asked for.
+
+    Games are held in compact form (see src/compact.py) and expanded into
+    fresh dicts when returned.
+
+    Args:
+        clock: Returns the current time as an aware datetime. Defaults to UTC now.
+        max_days: Days held at once.
+    """
+
+    def __init__(self, clock=None, max_days: int = MAX_DAYS):
+        self._clock = clock or utc_now
+        self.max_days = max_days
+        self._games = {}             # game id -> game, in compact form
+        self._by_date = {}           # YYYY-MM-DD -> set of game ids
+        self._coverage = {}          # YYYY-MM-DD -> {team abbreviation or None for league-wide: expiry or None}
+        self._envelopes = {}         # YYYY-MM-DD -> (start of the league week fetched, its other fields)
+        self._recent = OrderedDict()  # YYYY-MM-DD held, least recently used first
+        self._pending = {}           # (scope, block) -> Future of the fetch in progress
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def today(self) -> date:
+        """The NHL's current effective date (the day's slate rolls over around noon Eastern)."""
+        return nhl_date(self._clock())
+
+    def games(self, start: date, end: date, team_abbr: str = None) -> list:
+        """
+        Games from start to end inclusive, optionally only those of one team.
+
+        Args:
+            start: First date of the window.
+            end: Last date of the window.
+            team_abbr: Optional team abbreviation.
+
+        Returns:
+            list: Games sorted by date and start time, each with its gameDate.
+        """
+        team = team_abbr.upper() if team_abbr else None
+        days = [(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+        missing = self._missing(days, team)
+        if missing:
+            blocks = _months(missing) if team else _weeks(missing)
+            fetch_concurrently(lambda block: self._fetch_once(team, block), blocks)
+
+        with self._lock:
+            games = [self._games[game_id] for day in days for game_id in self._by_date.get(day, ())]
+            for day in days:
+                if day in self._recent:
+                    self._recent.move_to_end(day)
+        if team:
+            games = [game for game in games if team in _teams_of(game)]
+        games.sort(key=lambda game: (game["gameDate"], game.get("startTimeUTC", ""), game["id"]))
+        return [expand(game) for game in games]
+
+    def envelope(self, start: date) -> dict:
+        """
+        The fields around gameWeek (previous and next start dates, odds partners, season
+        dates) of the league weekly schedule for the week from start.
+
+        They are taken from the weekly schedule fetched for the block holding start;
+        its previous and next start dates are moved by the days between that block's
+        start and start, unless they jump further than a week (around the off-season).
+        Empty if start is not held league-wide.
+        """
+        with self._lock:
+            block, fields = self._envelopes.get(start.isoformat(), (None, {}))
+        fields = dict(fields)
+        if block is not None:
+            block = date.fromisoformat(block)
+            for key, step in (("previousStartDate", -7), ("nextStartDate", 7)):
+                if fields.get(key) == (block + timedelta(days=step)).isoformat():
+                    fields[key] = (start + timedelta(days=step)).isoformat()
+        return fields
+
+    def clear(self) -> None:
+        with self._lock:
+            self._games.clear()
+            self._by_date.clear()
+            self._coverage.clear()
+            self._envelopes.clear()
+            self._recent.clear()
+            self.fetches = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "games": len(self._games),
+                "days": len(self._recent),
+                "league_days": sum(1 for scopes in self._coverage.values() if None in scopes),
+                "team_days": sum(len(scopes) - (None in scopes) for scopes in self._coverage.values()),
+                "fetches": self.fetches,
+            }
+
+    def _missing(self, days: list, team: str = None) -> list:
+        now = self._clock()
+        with self._lock:
+            return [day for day in days
+                    if not self._is_fresh(day, None, now) and not (team and self._is_fresh(day, team, now))]
+
+    def _is_fresh(self, day: str, scope, now: datetime) -> bool:
+        scopes = self._coverage.get(day, {})
+        if scope not in scopes:
+            return False
+        expires_at = scopes[scope]
+        return expires_at is None or now < expires_at
+
+    def _fetch_once(self, team: str, block: str) -> None:
+        """Fetch a block, or wait for the fetch of the same block already running."""
+        key = (team, block)
+        with self._lock:
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = self._pending[key] = Future()
+        if not owner:
+            future.result()
+            return
+        try:
+            self._fetch(team, block)
+            future.set_result(None)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+
+    def _fetch(self, team: str, block: str) -> None:
+        envelope = None
+        if team is None:
+            week = client.schedule.weekly_schedule(block)
+            days = {day["date"]: day.get("games", []) for day in week.get("gameWeek", [])}
+            envelope = (block, {key: value for key, value in week.items() if key not in ENVELOPE_SKIP})
+        else:
+            year, month = (int(part) for part in block.split("-"))
+            days = {f"{block}-{day:02d}": [] for day in range(1, calendar.monthrange(year, month)[1] + 1)}
+            for game in client.schedule.team_monthly_schedule(team, block):
+                days.setdefault(game["gameDate"], []).append(game)
+        self._store(team, days, envelope)
+
+    def _store(self, team: str, days: dict, envelope: tuple = None) -> None:
+        now = self._clock()
+        with self._lock:
+            self.fetches += 1
+            for day, games in days.items():
+                ids = self._by_date.setdefault(day, set())
+                if team is None:
+                    ids.clear()
+                else:
+                    ids.difference_update(game_id for game_id in list(ids) if team in _teams_of(self._games[game_id]))
+                for game in games:
+                    self._games[game["id"]] = compact({**game, "gameDate": game.get("gameDate", day)})
+                    ids.add(game["id"])
+                self._coverage.setdefault(day, {})[team] = self._expiry(day, games, now)
+                if envelope is not None:
+                    self._envelopes[day] = envelope
+                self._recent[day] = None
+                self._recent.move_to_end(day)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used days and their games past max_days. Holds the lock."""
+        while len(self._recent) > self.max_days:
+            day, _ = self._recent.popitem(last=False)
+            for game_id in self._by_date.pop(day, ()):
+                # A rescheduled game may be held under its new day already
+                if self._games.get(game_id, {}).get("gameDate") == day:
+                    del self._games[game_id]
+            self._coverage.pop(day, None)
+            self._envelopes.pop(day, None)
+
+    def _expiry(self, day: str, games: list, now: datetime):
+        if day < (self.today() - timedelta(days=1)).isoformat():
+            return None
+        states = [_game_state(game, now) for game in games if game.get("startTimeUTC")]
+        ttl = STATE_TTLS[_most_urgent(states)] if states else IDLE_TTL
+        return now + timedelta(seconds=ttl)
+
+def _teams_of(game: dict) -> set:
+    return {game.get("homeTeam", {}).get("abbrev"), game.get("awayTeam", {}).get("abbrev")}
+
+def _weeks(days: list) -> list:
+    """Start dates of the weekly schedules covering the given sorted days."""
+    starts = []
+    for day in days:
+        if not starts or day > (date.fromisoformat(starts[-1]) + timedelta(days=6)).isoformat():
+            starts.append(day)
+    return starts
+
+def _months(days: list) -> list:
+    """YYYY-MM months of the given sorted days."""
+    return sorted({day[:7] for day in days})
+
+store = GameStore()
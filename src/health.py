@@ -0,0 +1,64 @@
+import os
+import time
+
+from .cache import cache_stats
+from .hedging import hedger
+from .sessions import scheduler
+from .ttl_policy import policy
+from .upstream_health import MIN_SAMPLES, upstream_health
+from .warmup import warmer
+
+# Queued tool calls beyond which the replica reports itself saturated
+READY_MAX_QUEUE = int(os.environ.get("NHL_MCP_READY_MAX_QUEUE", scheduler.capacity))
+# Upstream error rate, per endpoint family, beyond which the family is reported degraded
+DEGRADED_ERROR_RATE = float(os.environ.get("NHL_MCP_DEGRADED_ERROR_RATE", 0.5))
+
+_started_at = time.monotonic()
+
+def liveness() -> dict:
+    """The process is up and its event loop is answering."""
+    return {"status": "alive", "uptime_seconds": round(time.monotonic() - _started_at, 1)}
+
+def readiness() -> dict:
+    """
+    Whether this replica should receive traffic, with the checks behind it and
+    the state of its upstream and cache.
+
+    Readiness rests on local conditions only: the replica's upstream
+    connections have been warmed, and it is not saturated (tool calls queued
+    for a slot do not exceed READY_MAX_QUEUE). The NHL API is shared by every
+    replica, so its failures would take them all out of rotation at once;
+    upstream error rates (endpoint families past DEGRADED_ERROR_RATE are
+    marked degraded), hedging counts and the cache are reported alongside
+    but do not affect readiness.
+
+    Returns:
+        dict: {"ready": bool, "checks": {name: {"ok": bool, ...}}, "upstream": {...}, "cache": {...}}.
+    """
+    families = upstream_health.rates()
+    for family in families.values():
+        family["degraded"] = family["requests"] >= MIN_SAMPLES and family["error_rate"] > DEGRADED_ERROR_RATE
+    checks = {
+        "warmup": {"ok": warmer.ready},
+        "saturation": {
+            "ok": scheduler.queued <= READY_MAX_QUEUE,
+            "in_flight": scheduler.in_flight,
+            "capacity": scheduler.capacity,
+            "queued": scheduler.queued,
+            "max_queued": READY_MAX_QUEUE,
+        },
+    }
+    return {
+        "ready": all(check["ok"] for check in checks.values()),
+        "checks": checks,
+        "upstream": {
+            "degraded": any(family["degraded"] for family in families.values()),
+            "degraded_error_rate": DEGRADED_ERROR_RATE,
+            "families": families,
+            "hedging": hedger.stats(),
+        },
+        "cache": {
+            "schedule_loaded": policy.loaded,
+            "entries": sum(namespace["entries"] for namespace in cache_stats().values()),
+        },
+    }
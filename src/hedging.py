@@ -0,0 +1,169 @@
+import contextvars
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+
+# Send a second copy of slow schedule, standings and stats GETs (off unless set)
+HEDGING_ENABLED = os.environ.get("NHL_MCP_HEDGING", "0").lower() in ("1", "true", "yes")
+# Most hedges sent, as a fraction of the requests that could be hedged
+MAX_HEDGE_RATIO = float(os.environ.get("NHL_MCP_HEDGE_MAX_RATIO", 0.05))
+# Hedges that can be sent back to back; unused allowance is never banked beyond this
+HEDGE_BURST = 5
+# Percentile of an endpoint's latency after which its request is hedged
+HEDGE_PERCENTILE = 0.95
+# Floor on the hedge delay, so fast endpoints are not hedged on jitter
+MIN_HEDGE_DELAY = 0.05
+# Latencies observed for an endpoint before its requests are hedged
+MIN_SAMPLES = 20
+# Latencies kept per endpoint
+MAX_SAMPLES = 200
+# Hedges in flight at once
+MAX_WORKERS = 32
+
+# Path segments holding ids, dates or seasons, folded so requests to one endpoint share a latency history
+_VARIABLE_SEGMENT = re.compile(r"\d")
+
+def endpoint_key(resource: str) -> str:
+    """The endpoint a resource belongs to, e.g. "player/*/game-log/*/*" for player/8478402/game-log/20232024/2."""
+    path = resource.split("?", 1)[0]
+    return "/".join("*" if _VARIABLE_SEGMENT.search(segment) else segment for segment in path.split("/"))
+
+class Hedger:
+    """
+    Hedged requests: a second copy of a request still unanswered at its endpoint's observed p95.
+
+    Latencies are observed per endpoint. Once an endpoint has MIN_SAMPLES of
+    them, a request to it that has not answered within their HEDGE_PERCENTILE
+    gets a second, identical request, and whichever answers first is used.
+    The other is left to finish in the background and is discarded.
+
+    The first attempt starts at once on a thread of its own, so the hedge delay
+    never includes time spent queued; only hedges share the worker pool. (The
+    caller's thread cannot make the first attempt itself: it would then be
+    stuck in that request even after the hedge had answered.)
+
+    Hedges are limited by a token bucket: each hedgeable request adds max_ratio
+    of a token, up to HEDGE_BURST, and each hedge takes one. A slow upstream
+    sees at most that much extra load, and a long quiet spell does not save up
+    a flood of hedges. Only idempotent GETs should be hedged.
+
+    Args:
+        enabled: Whether requests are hedged at all.
+        max_ratio: Most hedges sent, as a fraction of hedgeable requests.
+    """
+
+    def __init__(self, enabled: bool = HEDGING_ENABLED, max_ratio: float = MAX_HEDGE_RATIO):
+        self.enabled = enabled
+        self.max_ratio = max_ratio
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._reset_counts()
+
+    def _reset_counts(self) -> None:
+        self._tokens = float(HEDGE_BURST)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.capped = 0
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=MAX_SAMPLES)).append(seconds)
+
+    def delay(self, key: str):
+        """Seconds to wait before hedging a request to key, or None until enough latencies are seen."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        return max(latencies[min(int(len(latencies) * HEDGE_PERCENTILE), len(latencies) - 1)], MIN_HEDGE_DELAY)
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.hedges += 1
+                return True
+            self.capped += 1
+            return False
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="hedge")
+            return self._executor
+
+    def call(self, key: str, send, budget: float = None):
+        """
+        send() once, or twice if the first has not answered by the endpoint's hedge delay.
+
+        Args:
+            key: The endpoint, from endpoint_key().
+            send: Makes the request; must be safe to run twice at once.
+            budget: Seconds the caller can wait, if limited; no hedge is sent that could not use it.
+
+        Returns:
+            The first successful answer, or raises the first attempt's error if both fail.
+        """
+        delay = self.delay(key) if self.enabled else None
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self._tokens + self.max_ratio, HEDGE_BURST)
+        if delay is None or (budget is not None and delay >= budget):
+            return self._timed(key, send)
+
+        first = Future()
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self._attempt, first, key, send), name="hedge-first",
+                         daemon=True).start()
+        done, _ = wait([first], timeout=delay)
+        if done or not self._allow_hedge():
+            return first.result()
+
+        second = self._pool().submit(self._timed, key, send)
+        for attempt in as_completed([first, second]):
+            if attempt.exception() is None:
+                if attempt is second:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return attempt.result()
+        return first.result()
+
+    def _attempt(self, future: Future, key: str, send) -> None:
+        try:
+            future.set_result(self._timed(key, send))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _timed(self, key: str, send):
+        started = time.monotonic()
+        result = send()
+        self.observe(key, time.monotonic() - started)
+        return result
+
+    def stats(self) -> dict:
+        """Hedges sent and won, and the current hedge delay per endpoint."""
+        with self._lock:
+            keys = sorted(self._latencies)
+            counts = {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins,
+                      "capped": self.capped}
+        delays = {key: self.delay(key) for key in keys}
+        return {
+            "enabled": self.enabled,
+            "max_ratio": self.max_ratio,
+            **counts,
+            "hedge_rate": round(counts["hedges"] / counts["requests"], 4) if counts["requests"] else 0.0,
+            "win_rate": round(counts["hedge_wins"] / counts["hedges"], 4) if counts["hedges"] else 0.0,
+            "delays": {key: round(delay, 3) for key, delay in delays.items() if delay is not None},
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._reset_counts()
+
+hedger = Hedger()
@@ -3,109 +3,177 @@ from .players import *
 from .schedule import *
 from .standings import *
 from .stats import *
+from .passthrough import *
+from .export import EXPORT_BUDGET, get_nhl_season_export
+from .team_matrix import get_nhl_team_form
+from .prospects import get_nhl_prospects
+from .roster_tracker import get_nhl_roster_changes
+from .directories import get_nhl_player_game_logs
+from .query import QUERY_BUDGET, get_nhl_query
+from .ttl_policy import get_nhl_cache_ttl_policy
+from .sessions import fair_share_tool, get_nhl_session_usage
+from .profiling import profiled_tool
+from .tracing import traced_tool
 
 def setup_nhl_tools(mcp):
     """Setup NHL tools for the MCP server"""
+
+    def tool(raw=None, budget=None):
+        """
+        Register a tool, scheduled fairly per session, traced and profiled when sampled, and
+        served from the raw upstream body when pass-through mode is on. budget overrides the
+        request deadline for long-running tools.
+        """
+        def decorator(fn):
+            if raw is not None and PASSTHROUGH_ENABLED:
+                return mcp.tool(output_schema=None)(
+                    fair_share_tool(traced_tool(profiled_tool(passthrough_tool(fn, raw))), budget))
+            return mcp.tool()(fair_share_tool(traced_tool(profiled_tool(fn)), budget))
+        return decorator
     
-    @mcp.tool()
+    @tool()
     def get_nhl_teams_mcp(date: str = "now") -> dict:
         return get_nhl_teams(date)
 
-    @mcp.tool()
+    @tool(raw=get_nhl_team_roster_raw)
     def get_nhl_team_roster_mcp(team_abbr: str, season: str) -> dict:
         return get_nhl_team_roster(team_abbr, season)
 
-    @mcp.tool()
+    @tool(raw=get_nhl_prospects_by_team_raw)
     def get_nhl_prospects_by_team_mcp(team_abbr: str) -> dict:
         return get_nhl_prospects_by_team(team_abbr)
 
-    @mcp.tool()
+    @tool()
+    def get_nhl_roster_changes_mcp(since: str = None, team_abbr: str = None, limit: int = 500) -> dict:
+        return get_nhl_roster_changes(since, team_abbr, limit)
+
+    @tool()
+    def get_nhl_prospects_mcp(draft_year: int = None, position: str = None, team_abbr: str = None,
+                              limit: int = 100) -> dict:
+        return get_nhl_prospects(draft_year, position, team_abbr, limit)
+
+    @tool(raw=get_nhl_players_by_team_raw)
     def get_nhl_players_by_team_mcp(team_abbr: str, season: str) -> dict:
         return get_nhl_players_by_team(team_abbr, season)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_franchises_mcp() -> dict:
         return get_nhl_franchises()
 
-    @mcp.tool()
+    @tool()
     def get_nhl_team_ids_mcp() -> dict:
         return get_nhl_team_ids()
 
-    @mcp.tool()
-    def get_nhl_standings_mcp(date: str = "now", season: str = None) -> dict:
-        return get_nhl_standings(date, season)
+    @tool()
+    def get_nhl_standings_mcp(date: str = "now", season: str = None, since_version: str = None) -> dict:
+        return get_nhl_standings(date, season, since_version)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_season_manifest_mcp() -> dict:
         return get_nhl_season_manifest()
 
-    @mcp.tool()
-    def get_nhl_daily_schedule_mcp(date: str = None) -> dict:
-        return get_nhl_daily_schedule(date)
+    @tool()
+    def get_nhl_daily_schedule_mcp(date: str = None, since_version: str = None) -> dict:
+        return get_nhl_daily_schedule(date, since_version)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_weekly_schedule_mcp(date: str = None) -> dict:
         return get_nhl_weekly_schedule(date)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_team_monthly_schedule_mcp(team_abbr: str, month: str = None) -> dict:
         return get_nhl_team_monthly_schedule(team_abbr, month)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_team_weekly_schedule_mcp(team_abbr: str, date: str = None) -> dict:
         return get_nhl_team_weekly_schedule(team_abbr, date)
 
-    @mcp.tool()
+    @tool(raw=get_nhl_team_season_schedule_raw)
     def get_nhl_team_season_schedule_mcp(team_abbr: str, season: str) -> dict:
         return get_nhl_team_season_schedule(team_abbr, season)
 
-    @mcp.tool()
+    @tool()
+    def get_nhl_league_season_schedule_mcp(season: str, start_date: str = None, end_date: str = None,
+                                           team_abbr: str = None, opponent_abbr: str = None) -> dict:
+        return get_nhl_league_season_schedule(season, start_date, end_date, team_abbr, opponent_abbr)
+
+    @tool(raw=get_nhl_calendar_schedule_raw)
     def get_nhl_calendar_schedule_mcp(date: str) -> dict:
         return get_nhl_calendar_schedule(date)
 
-    @mcp.tool()
-    def get_nhl_playoff_carousel_mcp(season: str) -> dict:
-        return get_nhl_playoff_carousel(season)
+    @tool()
+    def get_nhl_playoff_carousel_mcp(season: str, since_version: str = None) -> dict:
+        return get_nhl_playoff_carousel(season, since_version)
 
-    @mcp.tool()
+    @tool(raw=get_nhl_playoff_series_schedule_raw)
     def get_nhl_playoff_series_schedule_mcp(season: str, series: str) -> dict:
         return get_nhl_playoff_series_schedule(season, series)
 
-    @mcp.tool()
+    @tool(raw=get_nhl_playoff_bracket_raw)
     def get_nhl_playoff_bracket_mcp(year: str) -> dict:
         return get_nhl_playoff_bracket(year)
 
+    @tool()
+    def get_nhl_playoff_picture_mcp(season: str) -> dict:
+        return get_nhl_playoff_picture(season)
+
     # Stats API MCP Tools
-    @mcp.tool()
+    @tool(raw=get_nhl_gametypes_per_season_by_team_raw)
     def get_nhl_gametypes_per_season_by_team_mcp(team_abbr: str) -> dict:
         return get_nhl_gametypes_per_season_by_team(team_abbr)
 
-    @mcp.tool()
+    @tool(raw=get_nhl_player_career_stats_raw)
     def get_nhl_player_career_stats_mcp(player_id: str) -> dict:
         return get_nhl_player_career_stats(player_id)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_player_game_log_mcp(player_id: str, season_id: str, game_type: int) -> dict:
         return get_nhl_player_game_log(player_id, season_id, game_type)
 
-    @mcp.tool()
+    @tool()
+    def get_nhl_player_game_logs_mcp(player_id: str, start_season: str = None, end_season: str = None,
+                                     game_types: list[int] = None) -> dict:
+        return get_nhl_player_game_logs(player_id, start_season, end_season, game_types)
+
+    @tool()
     def get_nhl_team_summary_stats_mcp(start_season: str, end_season: str, game_type_id: int = 2,
                                        is_game: bool = False, is_aggregate: bool = False,
                                        start: int = 0, limit: int = 50) -> dict:
         return get_nhl_team_summary_stats(start_season, end_season, game_type_id, is_game, 
                                         is_aggregate, start, limit)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_skater_stats_summary_mcp(start_season: str, end_season: str, franchise_id: str = None,
                                          game_type_id: int = 2, aggregate: bool = False,
                                          start: int = 0, limit: int = 25) -> dict:
         return get_nhl_skater_stats_summary(start_season, end_season, franchise_id, game_type_id,
                                           aggregate, start, limit)
 
-    @mcp.tool()
+    @tool()
     def get_nhl_goalie_stats_summary_mcp(start_season: str, end_season: str = None,
                                          stats_type: str = "summary", game_type_id: int = 2,
                                          franchise_id: str = None, aggregate: bool = False,
                                          start: int = 0, limit: int = 25) -> dict:
         return get_nhl_goalie_stats_summary(start_season, end_season, stats_type, game_type_id,
                                           franchise_id, aggregate, start, limit)
+
+    @tool()
+    def get_nhl_team_form_mcp(team_abbr: str, season: str, last_n: int = None, opponent_abbr: str = None,
+                              game_type: int = 2) -> dict:
+        return get_nhl_team_form(team_abbr, season, last_n, opponent_abbr, game_type)
+
+    @tool()
+    def get_nhl_cache_ttl_policy_mcp(team_abbr: str = None) -> dict:
+        return get_nhl_cache_ttl_policy(team_abbr)
+
+    @tool()
+    def get_nhl_session_usage_mcp(session_id: str = None, limit: int = 20) -> dict:
+        return get_nhl_session_usage(session_id, limit)
+
+    @tool(budget=QUERY_BUDGET)
+    def get_nhl_query_mcp(spec: dict) -> dict:
+        return get_nhl_query(spec)
+
+    @tool(budget=EXPORT_BUDGET)
+    def get_nhl_season_export_mcp(seasons: str, format: str = "ndjson", tables: str = None) -> dict:
+        return get_nhl_season_export(seasons, format, tables)
@@ -0,0 +1,20 @@
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# The NHL schedules its days on Eastern time, daylight saving included
+NHL_TIMEZONE = ZoneInfo("America/New_York")
+# The NHL's "now" stays on the previous day's slate until around noon Eastern,
+# so overnight finals and the morning after still count as that game day
+DAY_ROLLOVER = timedelta(hours=12)
+
+def utc_now() -> datetime:
+    """The current time as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+def nhl_date(now: datetime) -> date:
+    """The NHL's effective date at now."""
+    return (now.astimezone(NHL_TIMEZONE) - DAY_ROLLOVER).date()
+
+def today() -> date:
+    """The NHL's current effective date (the day's slate rolls over around noon Eastern)."""
+    return nhl_date(utc_now())
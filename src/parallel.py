@@ -0,0 +1,31 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from . import profiling
+
+# The NHL client is synchronous, so fan-out happens on a small thread pool.
+# Kept modest to stay polite to the upstream API.
+MAX_WORKERS = 8
+
+def fetch_concurrently(fn, items, max_workers: int = MAX_WORKERS) -> list:
+    """
+    Call fn(item) for every item concurrently.
+
+    Each call runs in a copy of the caller's context, so context variables
+    set by the MCP layer are visible to the worker threads.
+
+    Args:
+        fn: Callable taking a single item.
+        items: Iterable of items to fetch.
+        max_workers: Maximum number of concurrent calls.
+
+    Returns:
+        list: Results in the same order as items.
+    """
+    items = list(items)
+    if not items:
+        return []
+    context = contextvars.copy_context()
+    fn = profiling.in_worker(fn)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(lambda item: context.copy().run(fn, item), items))
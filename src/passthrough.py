@@ -0,0 +1,238 @@
+import functools
+import inspect
+import json
+import os
+
+from mcp.types import TextContent
+from nhlpy.api.players import Players
+from nhlpy.api.schedule import Schedule
+from nhlpy.api.stats import Stats
+from nhlpy.api.teams import Teams
+
+from .arguments import canonical_date, canonical_season, canonical_team, canonical_year
+from .cache import get_cache
+from .client import client
+from .errors import error_result
+from .ttl_policy import directory_ttl, player_stats_ttl, playoff_series_ttl, playoff_ttl
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+__all__ = [
+    'PASSTHROUGH_ENABLED',
+    'passthrough_tool',
+    'get_nhl_team_roster_raw',
+    'get_nhl_prospects_by_team_raw',
+    'get_nhl_players_by_team_raw',
+    'get_nhl_team_season_schedule_raw',
+    'get_nhl_calendar_schedule_raw',
+    'get_nhl_playoff_series_schedule_raw',
+    'get_nhl_playoff_bracket_raw',
+    'get_nhl_gametypes_per_season_by_team_raw',
+    'get_nhl_player_career_stats_raw',
+]
+
+# Pass-through mode is opt-in: tool results become plain JSON text content
+# (no structured content), spliced from the upstream bytes.
+PASSTHROUGH_ENABLED = os.environ.get("NHL_MCP_PASSTHROUGH", "").lower() in ("1", "true", "yes")
+
+def json_loads(data):
+    """Decode JSON with orjson when available, falling back to the standard library."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> bytes:
+    """Encode compact JSON bytes with orjson when available, falling back to the standard library."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+class RawJSON:
+    """
+    An upstream JSON body kept as bytes.
+
+    Whole-body responses are spliced into the tool envelope untouched. If a
+    caller indexes into the body (e.g. nhlpy taking response["data"]), it is
+    decoded once with the fast parser.
+    """
+
+    __slots__ = ("raw", "_decoded")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._decoded = None
+
+    def decoded(self):
+        if self._decoded is None:
+            self._decoded = json_loads(self.raw)
+        return self._decoded
+
+    def __getitem__(self, key):
+        return self.decoded()[key]
+
+    def get(self, key, default=None):
+        return self.decoded().get(key, default)
+
+class _RawResponse:
+    __slots__ = ("content",)
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def json(self) -> RawJSON:
+        return RawJSON(self.content)
+
+class _RawHttpClient:
+    """Stands in for nhlpy's HttpClient so its API classes hand back RawJSON bodies."""
+
+    def __init__(self, http_client):
+        self._http_client = http_client
+
+    def get(self, endpoint, resource: str, query_params: dict = None) -> _RawResponse:
+        response = self._http_client.get(endpoint=endpoint, resource=resource, query_params=query_params)
+        return _RawResponse(response.content)
+
+def _raw_api(api_class):
+    """An nhlpy API object (Schedule, Stats, ...) that returns raw bodies."""
+    return api_class(http_client=_RawHttpClient(client._http_client))
+
+def splice(key: str, body, **fields) -> str:
+    """
+    Build the JSON text of {key: body, **fields}.
+
+    A RawJSON body that was never decoded is copied in as bytes; anything else
+    is encoded with the fast encoder.
+
+    Raises:
+        ValueError: If a raw body is not a JSON object or array.
+    """
+    if isinstance(body, RawJSON) and body._decoded is None:
+        encoded = body.raw
+        _check_json_container(encoded)
+    elif isinstance(body, RawJSON):
+        encoded = json_dumps(body._decoded)
+    else:
+        encoded = json_dumps(body)
+    parts = [b"{", json_dumps(key), b":", encoded]
+    for name, value in fields.items():
+        parts += [b",", json_dumps(name), b":", json_dumps(value)]
+    parts.append(b"}")
+    return b"".join(parts).decode()
+
+def _check_json_container(raw: bytes) -> None:
+    """Cheap sanity check that raw looks like a JSON object or array, without parsing it."""
+    stripped = raw.strip()
+    if not stripped or (stripped[:1], stripped[-1:]) not in ((b"{", b"}"), (b"[", b"]")):
+        raise ValueError(f"Upstream returned a non-JSON body: {stripped[:40]!r}")
+
+def _envelope(key: str, fetch, **fields) -> str:
+    try:
+        return splice(key, fetch(), **fields)
+    except Exception as e:
+        return json_dumps(error_result(e)).decode()
+
+def passthrough_tool(fn, raw):
+    """
+    Wrap an MCP tool so it is served by raw, returning the spliced JSON as text.
+
+    The wrapper keeps fn's name, docstring and signature for schema generation.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return TextContent(type="text", text=raw(*args, **kwargs))
+
+    return wrapper
+
+def raw_counterpart(namespace: str = None, ttl=None, **canonicalizers):
+    """
+    Give a raw function the canonical arguments and cache of its src/ tool counterpart.
+
+    Arguments are canonicalized with the counterpart's canonicalizers, so the
+    raw path takes the same argument forms ("bos", "2023-24", "now"). When the
+    counterpart is cached, under namespace, a call is answered from its cached
+    result if it holds one, and raw envelopes are cached too, under the same
+    keys and TTL in namespace + ":raw", so a repeat call on either path does
+    not go upstream. Raw functions whose counterpart is uncached stay uncached.
+
+    Args:
+        namespace: The counterpart's cache namespace, or None if it is not cached.
+        ttl: The counterpart's TTL, or a callable taking (arguments, result).
+        canonicalizers: Parameter name -> function returning its canonical value.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                for name, canonical in canonicalizers.items():
+                    bound.arguments[name] = canonical(bound.arguments[name])
+            except ValueError as e:
+                return json_dumps(error_result(e)).decode()
+            if namespace is None:
+                return fn(*bound.args, **bound.kwargs)
+
+            key = tuple(bound.arguments.items())
+            hit, result = get_cache(namespace).get(key)
+            if hit:
+                return json_dumps(result).decode()
+            raw_cache = get_cache(f"{namespace}:raw")
+            hit, text = raw_cache.get(key)
+            if hit:
+                return text
+            text = fn(*bound.args, **bound.kwargs)
+            if not text.startswith('{"error":'):
+                raw_cache.set(key, text, ttl(dict(key), json_loads(text)) if callable(ttl) else ttl)
+            return text
+
+        return wrapper
+
+    return decorator
+
+# Raw counterparts of the src/ tool functions whose envelope wraps the whole
+# upstream body. Each takes the same arguments and returns the same envelope
+# as JSON text. Endpoints where nhlpy picks a sub-key out of the body would
+# have to decode it anyway, so they stay on the default path.
+
+@raw_counterpart(team_abbr=canonical_team, season=canonical_season)
+def get_nhl_team_roster_raw(team_abbr: str, season: str) -> str:
+    return _envelope("roster", lambda: _raw_api(Teams).team_roster(team_abbr, season))
+
+@raw_counterpart(team_abbr=canonical_team)
+def get_nhl_prospects_by_team_raw(team_abbr: str) -> str:
+    return _envelope("prospects", lambda: _raw_api(Players).prospects_by_team(team_abbr))
+
+@raw_counterpart(team_abbr=canonical_team, season=canonical_season)
+def get_nhl_players_by_team_raw(team_abbr: str, season: str) -> str:
+    return _envelope("players", lambda: _raw_api(Players).players_by_team(team_abbr, season))
+
+@raw_counterpart(team_abbr=canonical_team, season=canonical_season)
+def get_nhl_team_season_schedule_raw(team_abbr: str, season: str) -> str:
+    return _envelope("schedule", lambda: _raw_api(Schedule).team_season_schedule(team_abbr, season),
+                     team=team_abbr, season=season)
+
+@raw_counterpart(date=canonical_date)
+def get_nhl_calendar_schedule_raw(date: str) -> str:
+    return _envelope("schedule", lambda: _raw_api(Schedule).calendar_schedule(date), date=date)
+
+@raw_counterpart("playoff_series", ttl=playoff_series_ttl, season=canonical_season)
+def get_nhl_playoff_series_schedule_raw(season: str, series: str) -> str:
+    return _envelope("series_schedule", lambda: _raw_api(Schedule).playoff_series_schedule(season, series),
+                     season=season, series=series)
+
+@raw_counterpart("playoff_bracket", ttl=playoff_ttl, year=canonical_year)
+def get_nhl_playoff_bracket_raw(year: str) -> str:
+    return _envelope("bracket", lambda: _raw_api(Schedule).playoff_bracket(year), year=year)
+
+@raw_counterpart("gametypes_per_season", ttl=directory_ttl, team_abbr=canonical_team)
+def get_nhl_gametypes_per_season_by_team_raw(team_abbr: str) -> str:
+    return _envelope("gametypes", lambda: _raw_api(Stats).gametypes_per_season_directory_by_team(team_abbr))
+
+@raw_counterpart("player_career_stats", ttl=player_stats_ttl)
+def get_nhl_player_career_stats_raw(player_id: str) -> str:
+    return _envelope("player_stats", lambda: _raw_api(Stats).player_career_stats(player_id))
@@ -1,5 +1,8 @@
+from .arguments import canonical_arguments, canonical_season, canonical_team
 from .client import client
+from .errors import error_result
 
+@canonical_arguments(team_abbr=canonical_team)
 def get_nhl_prospects_by_team(team_abbr: str) -> dict:
     """
     Get prospects for a specific NHL team.
@@ -14,8 +17,9 @@ def get_nhl_prospects_by_team(team_abbr: str) -> dict:
         prospects = client.players.prospects_by_team(team_abbr)
         return {"prospects": prospects}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(team_abbr=canonical_team, season=canonical_season)
 def get_nhl_players_by_team(team_abbr: str, season: str) -> dict:
     """
     Get the roster/players for the given team and season.
@@ -34,4 +38,4 @@ def get_nhl_players_by_team(team_abbr: str, season: str) -> dict:
         players = client.players.players_by_team(team_abbr, season)
         return {"players": players}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
@@ -0,0 +1,235 @@
+import contextvars
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+import pydantic_core
+
+# Fraction of tool calls profiled (0 disables sampling)
+SAMPLE_RATE = float(os.environ.get("NHL_MCP_PROFILE_RATE", 0))
+# Let a client profile one call by sending the PROFILE_HEADER header
+ON_REQUEST = os.environ.get("NHL_MCP_PROFILE_ON_REQUEST", "").lower() in ("1", "true", "yes")
+PROFILE_HEADER = "x-nhl-profile"
+# Directory the profiles are written to, if any
+PROFILE_DIR = os.environ.get("NHL_MCP_PROFILE_DIR")
+# Milliseconds between stack samples
+SAMPLE_INTERVAL_MS = float(os.environ.get("NHL_MCP_PROFILE_INTERVAL_MS", 5))
+# Profiles kept in memory for the debug endpoints
+MAX_PROFILES = 50
+
+PROFILING_ENABLED = SAMPLE_RATE > 0 or ON_REQUEST
+
+PHASES = ("queue", "connect", "ttfb", "download", "decode", "wrap", "encode")
+UPSTREAM_PHASES = ("connect", "ttfb", "download")
+
+_current = contextvars.ContextVar("nhl_profile", default=None)
+# Seconds the current tool call waited for its fair-share slot
+queue_wait = contextvars.ContextVar("nhl_queue_wait", default=0.0)
+
+_profiles = deque(maxlen=MAX_PROFILES)
+_profiles_lock = threading.Lock()
+
+class Profile:
+    """
+    The phase breakdown and sampled stacks of one tool call.
+
+    Upstream phases are summed over every upstream request the call made, so
+    with concurrent fetches they can add up to more than the call's wall time.
+    """
+
+    def __init__(self, tool: str):
+        self.id = f"{time.strftime('%Y%m%dT%H%M%S')}-{tool}-{uuid.uuid4().hex[:8]}"
+        self.tool = tool
+        self.started_at = time.time()
+        self.total = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.upstream_calls = 0
+        self.stacks = Counter()
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] += seconds
+
+    def trace(self):
+        """An httpx "trace" extension callback adding connect, TTFB and download time."""
+        started = {}
+
+        def callback(event_name: str, info: dict) -> None:
+            step, _, edge = event_name.rpartition(".")
+            if edge == "started":
+                started[step] = time.perf_counter()
+            elif edge in ("complete", "failed") and step in started:
+                phase = _UPSTREAM_STEPS.get(step.partition(".")[2])
+                if phase:
+                    self.add(phase, time.perf_counter() - started.pop(step))
+
+        with self._lock:
+            self.upstream_calls += 1
+        return callback
+
+    def timed(self, phase: str, fn):
+        """fn, adding the time of each call to phase."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+        return wrapper
+
+    def folded(self) -> str:
+        """Sampled stacks in the collapsed format read by flamegraph.pl, speedscope and inferno."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "tool": self.tool,
+            "started_at": self.started_at,
+            "total_ms": round(self.total * 1000, 3),
+            "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+            "upstream_calls": self.upstream_calls,
+            "samples": sum(self.stacks.values()),
+        }
+
+# httpcore trace steps (after the "connection."/"http11."/"http2." prefix) and their phases
+_UPSTREAM_STEPS = {
+    "connect_tcp": "connect",
+    "start_tls": "connect",
+    "receive_response_headers": "ttfb",
+    "receive_response_body": "download",
+}
+
+def current() -> Profile | None:
+    """The profile of the tool call being served, if it is profiled."""
+    return _current.get()
+
+def _fold(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class _StackSampler(threading.Thread):
+    """Samples the stacks of the profile's threads every interval until stopped."""
+
+    def __init__(self, profile: Profile, interval: float):
+        super().__init__(name=f"profile-{profile.id}", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.profile.threads):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.profile.stacks[_fold(frame)] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def _should_profile() -> bool:
+    if ON_REQUEST:
+        try:
+            from fastmcp.server.dependencies import get_http_headers
+
+            if get_http_headers(include_all=True).get(PROFILE_HEADER, "").lower() in ("1", "true", "yes"):
+                return True
+        except Exception:
+            pass
+    return SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+
+def profiled_tool(fn):
+    """
+    Wrap a synchronous MCP tool so sampled calls are profiled.
+
+    Runs where the tool body runs (a worker thread). A profiled call records
+    its queue wait, upstream connect, TTFB and download, JSON decode, the time
+    spent wrapping results, and an estimate of the result's encode time, and
+    samples the stacks of its threads. Calls that are not sampled pay one
+    random draw. The wrapper keeps fn's name, docstring and signature.
+    """
+    if not PROFILING_ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _should_profile():
+            return fn(*args, **kwargs)
+
+        profile = Profile(fn.__name__)
+        profile.add("queue", queue_wait.get())
+        token = _current.set(profile)
+        profile.threads.add(threading.get_ident())
+        sampler = _StackSampler(profile, SAMPLE_INTERVAL_MS / 1000)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            body = time.perf_counter() - start
+            profile.timed("encode", pydantic_core.to_json)(result)
+        finally:
+            sampler.stop()
+            profile.threads.discard(threading.get_ident())
+            _current.reset(token)
+        upstream = sum(profile.phases[phase] for phase in UPSTREAM_PHASES)
+        profile.add("wrap", max(body - upstream - profile.phases["decode"], 0.0))
+        profile.total = profile.phases["queue"] + time.perf_counter() - start
+        _save(profile)
+        return result
+
+    return wrapper
+
+def in_worker(fn):
+    """Wrap fn, run on another thread on behalf of a profiled call, so that thread is sampled too."""
+    profile = current()
+    if profile is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        thread_id = threading.get_ident()
+        profile.threads.add(thread_id)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.threads.discard(thread_id)
+
+    return wrapper
+
+def _save(profile: Profile) -> None:
+    with _profiles_lock:
+        _profiles.append(profile)
+    if PROFILE_DIR:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(os.path.join(PROFILE_DIR, f"{profile.id}.json"), "w") as f:
+            json.dump(profile.to_dict(), f, indent=2)
+        with open(os.path.join(PROFILE_DIR, f"{profile.id}.folded"), "w") as f:
+            f.write(profile.folded())
+
+def recent_profiles() -> list:
+    """Summaries of the profiles kept in memory, newest first."""
+    with _profiles_lock:
+        return [profile.to_dict() for profile in reversed(_profiles)]
+
+def get_profile(profile_id: str) -> Profile | None:
+    with _profiles_lock:
+        return next((profile for profile in _profiles if profile.id == profile_id), None)
+
+def clear_profiles() -> None:
+    with _profiles_lock:
+        _profiles.clear()
@@ -0,0 +1,234 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from . import deadline
+from .arguments import canonical_arguments, canonical_team
+from .client import client
+from .errors import DeadlineExceeded, error_result, raise_for_error
+from .parallel import fetch_concurrently
+from .stats import get_nhl_player_career_stats
+from .teams import get_nhl_teams
+
+__all__ = [
+    'get_nhl_prospects',
+]
+
+# Seconds before the prospect index is rebuilt (prospect pools change slowly)
+REFRESH_INTERVAL = float(os.environ.get("NHL_MCP_PROSPECT_REFRESH", 6 * 60 * 60))
+# Look up each prospect's draft details (one player request each, cached) when building the index
+FETCH_DRAFT_DETAILS = os.environ.get("NHL_MCP_PROSPECT_DRAFT_DETAILS", "1").lower() not in ("0", "false", "no")
+# Seconds before an index built with failed lookups, or after a failed rebuild, is tried again
+RETRY_INTERVAL = 5 * 60
+
+# Prospect list groups and the position codes they hold
+GROUPS = ("forwards", "defensemen", "goalies")
+POSITIONS = {
+    "c": {"C"}, "center": {"C"}, "centre": {"C"},
+    "l": {"L"}, "lw": {"L"}, "left wing": {"L"},
+    "r": {"R"}, "rw": {"R"}, "right wing": {"R"},
+    "f": {"C", "L", "R"}, "forward": {"C", "L", "R"},
+    "d": {"D"}, "defense": {"D"}, "defence": {"D"}, "defenseman": {"D"},
+    "g": {"G"}, "goalie": {"G"}, "goaltender": {"G"},
+}
+
+def _name(value) -> str:
+    return value.get("default", "") if isinstance(value, dict) else (value or "")
+
+def _prospect(team: str, player: dict, draft: dict = None) -> dict:
+    """The indexed form of one prospect record."""
+    draft = draft or player.get("draftDetails") or {}
+    return {
+        "id": player.get("id"),
+        "name": f"{_name(player.get('firstName'))} {_name(player.get('lastName'))}".strip(),
+        "team": team,
+        "position": player.get("positionCode"),
+        "shoots_catches": player.get("shootsCatches"),
+        "birth_date": player.get("birthDate"),
+        "birth_country": player.get("birthCountry"),
+        "height_in_inches": player.get("heightInInches"),
+        "weight_in_pounds": player.get("weightInPounds"),
+        "draft_year": draft.get("year"),
+        "draft_round": draft.get("round"),
+        "draft_overall_pick": draft.get("overallPick"),
+        "drafted_by": draft.get("teamAbbrev"),
+    }
+
+class ProspectIndex:
+    """
+    Every team's prospects, indexed by draft year, position and team.
+
+    The index is built by fetching all teams' prospect lists concurrently,
+    then, if enabled, every prospect's draft details concurrently. Builds run
+    on a background thread, outside the lock and any one request's deadline:
+    the first query starts one and waits for it as long as its own deadline
+    allows, and after that a stale index keeps answering while it is rebuilt.
+    It is rebuilt every refresh seconds, or after RETRY_INTERVAL if any team
+    or draft lookup failed, so a degraded index is not kept for long.
+
+    Args:
+        refresh: Seconds before the index is rebuilt.
+        draft_details: Look up draft details for prospects whose record lacks them.
+    """
+
+    def __init__(self, refresh: float = REFRESH_INTERVAL, draft_details: bool = FETCH_DRAFT_DETAILS):
+        self.refresh = refresh
+        self.draft_details = draft_details
+        self._state = None
+        self._lock = threading.Lock()
+        self._pending = None  # Future of the build in progress
+
+    def _build(self) -> dict:
+        teams = sorted(team["abbr"] for team in raise_for_error(get_nhl_teams())["teams"])
+        results = fetch_concurrently(self._team_prospects, teams)
+        missing_teams = [team for team, players in zip(teams, results) if players is None]
+        pairs = [(team, player) for team, players in zip(teams, results) for player in players or []]
+
+        drafts = [None] * len(pairs)
+        missing_drafts = []
+        if self.draft_details:
+            undrafted = [i for i, (_, player) in enumerate(pairs) if not player.get("draftDetails")]
+            get_nhl_player_career_stats.prefetch([(str(pairs[i][1].get("id")),) for i in undrafted])
+            details = fetch_concurrently(lambda i: self._draft_details(pairs[i][1].get("id")), undrafted)
+            for i, draft in zip(undrafted, details):
+                if draft is None:
+                    missing_drafts.append(pairs[i][1].get("id"))
+                drafts[i] = draft
+
+        prospects = [_prospect(team, player, draft) for (team, player), draft in zip(pairs, drafts)]
+        by_year, by_position, by_team = {}, {}, {}
+        for i, prospect in enumerate(prospects):
+            by_year.setdefault(prospect["draft_year"], set()).add(i)
+            by_position.setdefault(prospect["position"], set()).add(i)
+            by_team.setdefault(prospect["team"], set()).add(i)
+        return {
+            "prospects": prospects,
+            "by_year": by_year,
+            "by_position": by_position,
+            "by_team": by_team,
+            "missing_teams": missing_teams,
+            "missing_draft_details": missing_drafts,
+            "built_at": time.time(),
+            "_expires_at": time.monotonic() + (min(self.refresh, RETRY_INTERVAL) if missing_teams or missing_drafts
+                                               else self.refresh),
+        }
+
+    def _team_prospects(self, team: str):
+        try:
+            data = client.players.prospects_by_team(team) or {}
+        except Exception:
+            return None
+        return [player for group in GROUPS for player in data.get(group) or []]
+
+    def _draft_details(self, player_id):
+        """A prospect's draft details ({} if undrafted), or None if they could not be looked up."""
+        if player_id is None:
+            return {}
+        result = get_nhl_player_career_stats(str(player_id))
+        return None if "error" in result else result["player_stats"].get("draftDetails") or {}
+
+    def state(self) -> dict:
+        """
+        The current index, built on first use and rebuilt in the background once stale.
+
+        Raises:
+            DeadlineExceeded: The first build did not finish within the request deadline.
+        """
+        with self._lock:
+            state, pending = self._state, self._pending
+            if state is None and pending is None:
+                pending = self._start_build()
+            elif state is not None and pending is None and time.monotonic() >= state["_expires_at"]:
+                self._start_build()
+        if state is not None:
+            return state
+        remaining = deadline.remaining()
+        try:
+            return pending.result(timeout=None if remaining is None else max(remaining, 0))
+        except FutureTimeout:
+            raise DeadlineExceeded("The prospect index is still being built; try again shortly") from None
+
+    def _start_build(self) -> Future:
+        """Build the index on a background thread. Called with the lock held."""
+        future = self._pending = Future()
+        threading.Thread(target=self._rebuild, args=(future,), name="prospect-index", daemon=True).start()
+        return future
+
+    def _rebuild(self, future: Future) -> None:
+        try:
+            state = self._build()
+        except Exception as e:
+            with self._lock:
+                if self._pending is future:
+                    self._pending = None
+                    if self._state is not None:
+                        # Keep serving the old index and try again on a later query
+                        self._state["_expires_at"] = time.monotonic() + min(self.refresh, RETRY_INTERVAL)
+            future.set_exception(e)
+            return
+        with self._lock:
+            if self._pending is future:
+                self._state = state
+                self._pending = None
+        future.set_result(state)
+
+    def query(self, draft_year: int = None, position: str = None, team_abbr: str = None) -> list:
+        """Prospects matching every given filter, by team then name."""
+        state = self.state()
+        matches = None
+        if draft_year is not None:
+            matches = set(state["by_year"].get(int(draft_year), ()))
+        if position:
+            codes = POSITIONS.get(position.strip().lower())
+            if codes is None:
+                raise ValueError(f"Unknown position {position}; use C, L, R, F, D or G")
+            rows = set().union(*(state["by_position"].get(code, ()) for code in codes))
+            matches = rows if matches is None else matches & rows
+        if team_abbr:
+            rows = state["by_team"].get(team_abbr.upper(), set())
+            matches = rows if matches is None else matches & rows
+        prospects = state["prospects"]
+        selected = range(len(prospects)) if matches is None else matches
+        return sorted((prospects[i] for i in selected), key=lambda p: (p["team"], p["name"]))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = None
+            self._pending = None
+
+index = ProspectIndex()
+
+@canonical_arguments(team_abbr=canonical_team)
+def get_nhl_prospects(draft_year: int = None, position: str = None, team_abbr: str = None,
+                      limit: int = 100) -> dict:
+    """
+    Search every NHL team's prospect pool in one call.
+
+    Answers come from an in-memory index of all teams' prospects, rebuilt
+    every few hours, so league-wide questions (e.g., all 2023 draftees at
+    center) need no per-team calls.
+
+    Args:
+        draft_year: Optional draft year (e.g., 2023)
+        position: Optional position: C, L, R, D, G, or F for any forward (names like "center" work too)
+        team_abbr: Optional team abbreviation whose prospect pool to search (e.g., CHI)
+        limit: Maximum number of prospects to return. Defaults to 100
+
+    Returns:
+        dict: Matching prospects with their team, position and draft details, the total
+              number of matches, when the index was built and the teams and draft details
+              it could not load, or error message.
+    """
+    try:
+        matches = index.query(draft_year, position, team_abbr)
+        state = index.state()
+        return {
+            "prospects": matches[:limit],
+            "total": len(matches),
+            "index_built_at": state["built_at"],
+            "missing_teams": state["missing_teams"],
+            "missing_draft_details": len(state["missing_draft_details"]),
+        }
+    except Exception as e:
+        return error_result(e)
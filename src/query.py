@@ -0,0 +1,268 @@
+import os
+
+from .arguments import canonical_season, canonical_team, current_season
+from .directories import CAREER_GAME_TYPES, career_directory
+from .errors import error_result, raise_for_error
+from .parallel import fetch_concurrently
+from .prospects import POSITIONS
+from .standings import get_nhl_standings
+from .stats import get_nhl_player_career_stats, get_nhl_player_game_log
+from .teams import get_nhl_team_roster
+
+__all__ = [
+    'get_nhl_query',
+]
+
+# Upstream-backed calls one step of a query may make; larger queries must be narrowed
+MAX_FETCHES = int(os.environ.get("NHL_MCP_QUERY_MAX_FETCHES", 1000))
+# Seconds a query may take in total
+QUERY_BUDGET = float(os.environ.get("NHL_MCP_QUERY_BUDGET", 120))
+
+# Filters each entity accepts
+FILTERS = {
+    "teams": {"team", "conference", "division", "season"},
+    "players": {"team", "conference", "division", "season", "position", "player_id"},
+    "game_logs": {"team", "conference", "division", "season", "position", "player_id", "game_type", "opponent"},
+}
+# Fields returned when the spec selects none
+DEFAULT_FIELDS = {
+    "teams": ["abbr", "name", "conference", "division"],
+    "players": ["id", "name", "team", "position", "sweater_number"],
+    "game_logs": ["id", "name", "team", "game"],
+}
+ROSTER_GROUPS = ("forwards", "defensemen", "goalies")
+
+def _name(value) -> str:
+    return value.get("default", "") if isinstance(value, dict) else (value or "")
+
+def _as_list(value) -> list:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+def _path(row, path: str):
+    """The value at a dotted path (list items by index), or None."""
+    value = row
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.lstrip("-").isdigit() and -len(value) <= int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+def parse_spec(spec: dict) -> dict:
+    """
+    A query spec checked and in canonical form.
+
+    Raises:
+        ValueError: The spec names an unknown entity or filter, or has an invalid value.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("The query spec must be an object")
+    unknown = set(spec) - {"entity", "where", "select", "order_by", "limit"}
+    if unknown:
+        raise ValueError(f"Unknown query keys {sorted(unknown)}; use entity, where, select, order_by and limit")
+    entity = spec.get("entity")
+    if entity not in FILTERS:
+        raise ValueError(f"Unknown entity {entity}; use one of {', '.join(FILTERS)}")
+    where = dict(spec.get("where") or {})
+    unknown = set(where) - FILTERS[entity]
+    if unknown:
+        raise ValueError(f"Unknown filters {sorted(unknown)} for {entity}; use {', '.join(sorted(FILTERS[entity]))}")
+
+    for key in ("team", "opponent"):
+        if where.get(key) is not None:
+            where[key] = {canonical_team(team) for team in _as_list(where[key])}
+    for key in ("conference", "division"):
+        if where.get(key) is not None:
+            where[key] = {str(value).strip().lower() for value in _as_list(where[key])}
+    if where.get("position") is not None:
+        codes = set()
+        for position in _as_list(where["position"]):
+            if str(position).strip().lower() not in POSITIONS:
+                raise ValueError(f"Unknown position {position}; use C, L, R, F, D or G")
+            codes |= POSITIONS[str(position).strip().lower()]
+        where["position"] = codes
+    if where.get("player_id") is not None:
+        where["player_id"] = [str(player_id) for player_id in _as_list(where["player_id"])]
+    where["season"] = canonical_season(where.get("season"))
+    if entity != "teams" and where["season"] is None:
+        where["season"] = current_season()
+    where["game_type"] = int(where.get("game_type") or 2)
+
+    select = [str(field) for field in _as_list(spec.get("select") or DEFAULT_FIELDS[entity])]
+    limit = int(spec.get("limit") or 100)
+    return {"entity": entity, "where": where, "select": select, "order_by": spec.get("order_by"),
+            "limit": max(limit, 1)}
+
+class Fetcher:
+    """
+    Runs a query's calls to src/ tool functions step by step, each step's calls concurrently.
+
+    Within a query every distinct call is made once, however many rows need
+    it; the tool functions' own caches then dedupe across queries. Each step
+    is recorded for the plan returned with the result.
+    """
+
+    def __init__(self, max_fetches: int = MAX_FETCHES):
+        self.max_fetches = max_fetches
+        self.steps = []
+        self.missing = []
+        self._results = {}
+
+    def run(self, step: str, fn, calls: list) -> list:
+        """The results of fn(*args) for every args tuple in calls, in order; failed calls give None."""
+        unique = list(dict.fromkeys(calls))
+        new = [args for args in unique if (fn, args) not in self._results]
+        if len(new) > self.max_fetches:
+            raise ValueError(f"The {step} step would need {len(new)} calls (at most {self.max_fetches}); "
+                             "narrow the query with more filters")
+        if new and hasattr(fn, "prefetch"):
+            fn.prefetch(new)
+        for args, result in zip(new, fetch_concurrently(lambda args: fn(*args), new)):
+            self._results[(fn, args)] = result
+            if "error" in result:
+                self.missing.append({"step": step, "arguments": list(args), "error": result["error"]})
+        self.steps.append({"step": step, "calls": len(new), "reused": len(calls) - len(new)})
+        results = [self._results[(fn, args)] for args in calls]
+        return [None if "error" in result else result for result in results]
+
+    def one(self, step: str, fn, *args) -> dict:
+        """The result of one call the query cannot do without; its error is raised."""
+        self.run(step, fn, [args])
+        return raise_for_error(self._results[(fn, args)])
+
+def _team_rows(fetcher: Fetcher, where: dict) -> list:
+    standings = fetcher.one("standings", _standings, where.get("season"))
+    rows = [{"abbr": _name(row.get("teamAbbrev")), "name": _name(row.get("teamName")),
+             "conference": row.get("conferenceName"), "division": row.get("divisionName"), "standings": row}
+            for row in standings["standings"].get("standings", [])]
+    return [row for row in rows
+            if (where.get("team") is None or row["abbr"] in where["team"])
+            and (where.get("conference") is None or str(row["conference"]).lower() in where["conference"])
+            and (where.get("division") is None or str(row["division"]).lower() in where["division"])]
+
+def _standings(season: str = None) -> dict:
+    return get_nhl_standings(season=season) if season else get_nhl_standings()
+
+def _player_row(player: dict, team: str) -> dict:
+    return {"id": player.get("id"), "name": f"{_name(player.get('firstName'))} {_name(player.get('lastName'))}".strip(),
+            "team": team, "position": player.get("positionCode"), "sweater_number": player.get("sweaterNumber"),
+            "roster": player}
+
+def _career_row(player_id: str, career: dict) -> dict:
+    return {"id": career.get("playerId", int(player_id) if player_id.isdigit() else player_id),
+            "name": f"{_name(career.get('firstName'))} {_name(career.get('lastName'))}".strip(),
+            "team": career.get("currentTeamAbbrev"), "position": career.get("position"),
+            "sweater_number": career.get("sweaterNumber"), "career": career}
+
+def _player_rows(fetcher: Fetcher, where: dict, with_career: bool) -> list:
+    if where.get("player_id"):
+        careers = fetcher.run("career_stats", get_nhl_player_career_stats,
+                              [(player_id,) for player_id in where["player_id"]])
+        rows = [_career_row(player_id, result["player_stats"])
+                for player_id, result in zip(where["player_id"], careers) if result is not None]
+        rows = [row for row in rows if where.get("team") is None or row["team"] in where["team"]]
+    else:
+        if where.get("team") is not None and where.get("conference") is None and where.get("division") is None:
+            # The teams are named: no standings needed to find them
+            teams = sorted(where["team"])
+        else:
+            teams = [row["abbr"] for row in _team_rows(fetcher, where)]
+        rosters = fetcher.run("rosters", get_nhl_team_roster, [(team, where["season"]) for team in teams])
+        rows = [_player_row(player, team) for team, result in zip(teams, rosters) if result is not None
+                for group in ROSTER_GROUPS for player in result["roster"].get(group) or []]
+
+    if where.get("position") is not None:
+        rows = [row for row in rows if row["position"] in where["position"]]
+    if with_career and not where.get("player_id"):
+        careers = fetcher.run("career_stats", get_nhl_player_career_stats, [(str(row["id"]),) for row in rows])
+        for row, result in zip(rows, careers):
+            row["career"] = result["player_stats"] if result is not None else None
+    return rows
+
+def _game_log_rows(fetcher: Fetcher, where: dict, players: list) -> list:
+    season, game_type = where["season"], where["game_type"]
+    players = list({row["id"]: row for row in players}.values())
+    # Careers already fetched say which players played this season and game type; skip the others
+    if game_type in CAREER_GAME_TYPES:
+        players = [row for row in players
+                   if not row.get("career") or game_type in career_directory(row["career"]).get(season, ())]
+    logs = fetcher.run("game_logs", get_nhl_player_game_log,
+                       [(str(row["id"]), season, game_type) for row in players])
+    rows = [{**row, "game": game} for row, result in zip(players, logs) if result is not None
+            for game in result["game_log"] or []]
+    if where.get("opponent") is not None:
+        rows = [row for row in rows if row["game"].get("opponentAbbrev") in where["opponent"]]
+    return rows
+
+def _sort_key(value):
+    # Missing values sort last whichever the direction
+    return (value is None, value if isinstance(value, (int, float)) else str(value or ""))
+
+def run_query(spec: dict, max_fetches: int = MAX_FETCHES) -> dict:
+    """
+    Answer a parsed query spec with as few calls as the filters allow.
+
+    Returns:
+        dict: The selected rows, their total before the limit, the steps run and any failed calls.
+    """
+    entity, where, select = spec["entity"], spec["where"], spec["select"]
+    paths = select + ([spec["order_by"].lstrip("-")] if spec["order_by"] else [])
+    with_career = bool(where.get("player_id")) or any(path.split(".")[0] == "career" for path in paths)
+
+    fetcher = Fetcher(max_fetches)
+    if entity == "teams":
+        rows = _team_rows(fetcher, where)
+    else:
+        rows = _player_rows(fetcher, where, with_career)
+        if entity == "game_logs":
+            rows = _game_log_rows(fetcher, where, rows)
+
+    if spec["order_by"]:
+        path = spec["order_by"].lstrip("-")
+        descending = spec["order_by"].startswith("-")
+        present = [row for row in rows if _path(row, path) is not None]
+        absent = [row for row in rows if _path(row, path) is None]
+        rows = sorted(present, key=lambda row: _sort_key(_path(row, path)), reverse=descending) + absent
+    return {
+        "entity": entity,
+        "rows": [{field: _path(row, field) for field in select} for row in rows[:spec["limit"]]],
+        "total": len(rows),
+        "plan": fetcher.steps,
+        "fetches": sum(step["calls"] for step in fetcher.steps),
+        "missing": fetcher.missing,
+    }
+
+def get_nhl_query(spec: dict) -> dict:
+    """
+    Answer a multi-hop question (teams -> rosters -> career stats -> game logs) in one call.
+
+    The spec says what to return, and the planner fetches only what that needs:
+    named teams skip the standings lookup, career stats are fetched only when
+    a career field is selected or sorted on, and each distinct fetch is made
+    once and concurrently with the others in its step.
+
+    Args:
+        spec: A query object:
+            entity: "teams", "players" (roster players) or "game_logs" (one row per player game)
+            where: Optional filters: team, conference, division, season (YYYYYYYY, default current;
+                   teams default to the current standings), position (C, L, R, F, D, G),
+                   player_id (skips rosters), and for game_logs game_type (default 2) and opponent.
+                   List values match any of them
+            select: Optional dotted field paths to return, e.g. ["name", "team", "career.careerTotals.
+                    regularSeason.goals", "game.gameDate", "game.points"]. Rows carry id, name, team,
+                    position and sweater_number; "roster" and "career" hold the upstream records,
+                    "game" the game log row and "standings" a team's standings row
+            order_by: Optional field path to sort on, "-" first for descending
+            limit: Maximum rows to return. Defaults to 100
+
+    Returns:
+        dict: The selected fields per row, the total number of matching rows, the plan run
+              (calls per step, and calls reused instead of repeated) and any failed fetches,
+              or error message.
+    """
+    try:
+        return run_query(parse_spec(spec))
+    except Exception as e:
+        return error_result(e)
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import queue
+import socket
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Shared cache all replicas read and write, e.g. redis://cache:6379/0 (unset: each replica caches alone)
+CACHE_URL = os.environ.get("NHL_MCP_CACHE_URL")
+# Seconds to wait on the shared cache before answering from upstream instead
+CACHE_TIMEOUT = float(os.environ.get("NHL_MCP_CACHE_TIMEOUT", 0.25))
+# Seconds the shared cache is skipped after an error, so an outage costs one timeout, not one per call
+RETRY_AFTER = 30
+# Connections kept open to the shared cache
+MAX_CONNECTIONS = 8
+# Prefix of every key written, bumped when the payload format changes
+KEY_PREFIX = "nhl-mcp:v1"
+
+# Payloads are one format byte followed by compact JSON, zlib compressed above COMPRESS_MIN_SIZE bytes
+JSON_FORMAT = b"j"
+ZLIB_FORMAT = b"z"
+COMPRESS_MIN_SIZE = 1024
+
+class RESPError(Exception):
+    """An error reply from the cache server."""
+
+def encode_value(value) -> bytes:
+    """
+    A cached result as compact bytes.
+
+    Raises:
+        TypeError: value is not plain JSON data (e.g., it holds numpy arrays) and can only be cached locally.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(value)
+        except orjson.JSONEncodeError as e:
+            raise TypeError(str(e)) from None
+    else:
+        data = json.dumps(value, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode()
+    if len(data) >= COMPRESS_MIN_SIZE:
+        return ZLIB_FORMAT + zlib.compress(data, 1)
+    return JSON_FORMAT + data
+
+def decode_value(payload: bytes):
+    data = payload[1:]
+    if payload[:1] == ZLIB_FORMAT:
+        data = zlib.decompress(data)
+    elif payload[:1] != JSON_FORMAT:
+        raise ValueError(f"Unknown cache payload format {payload[:1]!r}")
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def cache_key(namespace: str, key: tuple) -> str:
+    """The shared cache key for a namespace's entry; the same on every replica."""
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+    return f"{KEY_PREFIX}:{namespace}:{digest}"
+
+def _command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+class RESPConnection:
+    """One connection to a Redis-compatible (RESP) server."""
+
+    def __init__(self, host: str, port: int, db: int = 0, password: str = None, timeout: float = CACHE_TIMEOUT):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._socket.makefile("rb")
+        setup = []
+        if password:
+            setup.append(("AUTH", password))
+        if db:
+            setup.append(("SELECT", db))
+        if setup:
+            self.pipeline(setup)
+
+    def pipeline(self, commands: list) -> list:
+        """Send every command in one write, then read their replies in order."""
+        self._socket.sendall(b"".join(_command(*command) for command in commands))
+        replies = [self._read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RESPError):
+                raise reply
+        return replies
+
+    def _read(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Cache server closed the connection")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            return RESPError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise RESPError(f"Unexpected reply {line!r}")
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+            self._socket.close()
+        except OSError:
+            pass
+
+class SharedCache:
+    """
+    A cache shared by every replica, on a Redis-compatible server.
+
+    It sits behind each replica's in-memory cache: a local miss is looked up
+    here before going upstream, and every fresh result is written here with
+    its TTL, so a result fetched by one replica serves all of them. Entries
+    keep their remaining TTL when copied into a local cache.
+
+    Any error (timeout, refused connection, error reply) makes the call
+    behave as a miss, and the shared cache is skipped for RETRY_AFTER seconds.
+
+    Args:
+        url: redis://[:password@]host[:port][/db]. None disables the shared cache.
+        timeout: Seconds to wait for the server on each call.
+    """
+
+    def __init__(self, url: str = None, timeout: float = CACHE_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        self.last_error = None
+        self._down_until = 0.0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        if url:
+            parts = urlsplit(url)
+            if parts.scheme not in ("redis", "tcp"):
+                raise ValueError(f"Unsupported cache URL {url}; use redis://host:port/db")
+            self._address = (parts.hostname or "localhost", parts.port or 6379,
+                             int(parts.path.strip("/") or 0), parts.password)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url) and time.monotonic() >= self._down_until
+
+    def _pipeline(self, commands: list):
+        """Run commands on a pooled connection; None if the server could not be used."""
+        if not self.enabled:
+            return None
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = None
+        try:
+            if connection is None:
+                host, port, db, password = self._address
+                connection = RESPConnection(host, port, db, password, self.timeout)
+            replies = connection.pipeline(commands)
+        except (OSError, RESPError, ValueError) as e:
+            if connection is not None:
+                connection.close()
+            with self._lock:
+                self.errors += 1
+                self.last_error = str(e) or type(e).__name__
+                self._down_until = time.monotonic() + RETRY_AFTER
+            return None
+        if self._idle.qsize() < MAX_CONNECTIONS:
+            self._idle.put(connection)
+        else:
+            connection.close()
+        return replies
+
+    def get_many(self, namespace: str, keys: list) -> dict:
+        """
+        Look up several entries in one round trip.
+
+        Returns:
+            dict: key -> (value, remaining ttl in seconds or None) for each key found.
+        """
+        if not keys or not self.enabled:
+            return {}
+        commands = []
+        for key in keys:
+            name = cache_key(namespace, key)
+            commands += [("GET", name), ("PTTL", name)]
+        replies = self._pipeline(commands)
+        if replies is None:
+            return {}
+        found = {}
+        for key, payload, ttl_ms in zip(keys, replies[::2], replies[1::2]):
+            if payload is None:
+                continue
+            try:
+                found[key] = (decode_value(payload), ttl_ms / 1000 if ttl_ms >= 0 else None)
+            except (ValueError, zlib.error):
+                continue
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, namespace: str, key) -> tuple:
+        """(True, value, remaining ttl) on a hit, (False, None, None) otherwise."""
+        found = self.get_many(namespace, [key])
+        if key in found:
+            return (True,) + found[key]
+        return False, None, None
+
+    def set(self, namespace: str, key, value, ttl: float = None) -> None:
+        """Store a value for every replica; values that are not plain JSON data are skipped."""
+        if not self.enabled or (ttl is not None and ttl <= 0):
+            return
+        try:
+            payload = encode_value(value)
+        except (TypeError, ValueError):
+            return
+        name = cache_key(namespace, key)
+        command = ("SET", name, payload) if ttl is None else ("SET", name, payload, "PX", max(1, int(ttl * 1000)))
+        if self._pipeline([command]) is not None:
+            with self._lock:
+                self.writes += 1
+
+    def stats(self) -> dict:
+        if not self.url:
+            return {"enabled": False}
+        host, port, db, _ = self._address
+        return {
+            "enabled": True,
+            "server": f"{host}:{port}/{db}",
+            "available": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+shared_cache = SharedCache(CACHE_URL)
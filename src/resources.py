@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import weakref
+
+from pydantic import AnyUrl
+
+from .errors import raise_for_error
+from .parallel import fetch_concurrently
+from .schedule import get_nhl_playoff_bracket
+from .standings import get_nhl_season_manifest
+from .teams import get_nhl_franchises, get_nhl_teams
+
+# Seconds a resource is served before it is re-read upstream (these datasets rarely change)
+REFRESH_INTERVAL = float(os.environ.get("NHL_MCP_RESOURCE_REFRESH", 15 * 60))
+
+# Static datasets: URI -> (resource name, loader, description)
+DATASETS = {
+    "nhl://franchises": ("franchises", get_nhl_franchises, "All past and current NHL franchises."),
+    "nhl://seasons": ("season_manifest", get_nhl_season_manifest,
+                      "Metadata for every NHL season: dates, conference/division use and scoring rules."),
+    "nhl://teams": ("teams", get_nhl_teams, "All current NHL teams with conference, division and franchise."),
+}
+BRACKET_URI = "nhl://playoffs/{year}/bracket"
+VERSIONS_URI = "nhl://versions"
+_BRACKET_PATTERN = re.compile(r"^nhl://playoffs/(\d{4})/bracket$")
+
+def load(uri: str) -> dict:
+    """Read the dataset behind a resource URI upstream (through any tool cache)."""
+    if uri in DATASETS:
+        return raise_for_error(DATASETS[uri][1]())
+    match = _BRACKET_PATTERN.match(uri)
+    if match:
+        return raise_for_error(get_nhl_playoff_bracket(match.group(1)))
+    raise ValueError(f"Unknown resource {uri}")
+
+def version_of(data) -> str:
+    """A content hash of data, stable across processes, used as the resource version."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+class ResourceStore:
+    """
+    The current content and version of each resource, shared by every session.
+
+    A resource is read upstream at most once per refresh interval, however many
+    sessions read it. Its version is a hash of its content, so it only changes
+    when the data does, and clients may keep a copy across sessions and re-read
+    it only when the version moves. Sessions subscribed to a resource are sent
+    a resources/updated notification when a refresh finds a new version.
+
+    Args:
+        refresh: Seconds before a resource is re-read upstream.
+        loader: Returns the dataset for a URI. Defaults to load.
+    """
+
+    def __init__(self, refresh: float = REFRESH_INTERVAL, loader=None):
+        self.refresh = refresh
+        self._loader = loader or load
+        self._entries = {}
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def read(self, uri: str) -> dict:
+        """The resource's content and version, re-read upstream once the refresh interval has passed."""
+        with self._lock:
+            entry = self._entries.get(uri)
+        if entry is None:
+            entry = self._refresh(uri)[0]
+        elif time.monotonic() >= entry["_expires_at"]:
+            try:
+                entry = self._refresh(uri)[0]
+            except Exception:
+                # Serve the last good version while upstream is failing
+                pass
+        return {key: value for key, value in entry.items() if not key.startswith("_")}
+
+    def _refresh(self, uri: str) -> tuple:
+        """Re-read a resource upstream; returns its entry and whether its version changed."""
+        data = self._loader(uri)
+        version = version_of(data)
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(uri)
+            changed = previous is not None and previous["version"] != version
+            entry = {
+                "uri": uri,
+                "version": version,
+                "changed_at": previous["changed_at"] if previous and not changed else now,
+                "fetched_at": now,
+                "data": data,
+                "_expires_at": time.monotonic() + self.refresh,
+            }
+            self._entries[uri] = entry
+        return entry, changed
+
+    def versions(self) -> dict:
+        """Current version of every static resource and of every other resource read so far."""
+        fetch_concurrently(self.read, list(DATASETS))
+        with self._lock:
+            return {uri: entry["version"] for uri, entry in sorted(self._entries.items())}
+
+    def subscribe(self, uri: str, session) -> None:
+        with self._lock:
+            self._subscribers.setdefault(uri, weakref.WeakSet()).add(session)
+
+    def unsubscribe(self, uri: str, session) -> None:
+        with self._lock:
+            self._subscribers.get(uri, weakref.WeakSet()).discard(session)
+
+    def subscribers(self, uri: str) -> list:
+        with self._lock:
+            return list(self._subscribers.get(uri, ()))
+
+    async def check(self) -> list:
+        """Re-read every subscribed resource and notify its subscribers if it changed; returns changed URIs."""
+        with self._lock:
+            uris = [uri for uri, sessions in self._subscribers.items() if sessions]
+        changed_uris = []
+        for uri in uris:
+            try:
+                _, changed = await asyncio.to_thread(self._refresh, uri)
+            except Exception:
+                # Keep the last good version; try again next round
+                continue
+            if not changed:
+                continue
+            changed_uris.append(uri)
+            for session in self.subscribers(uri):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception:
+                    self.unsubscribe(uri, session)
+        return changed_uris
+
+    def watch(self) -> None:
+        """Start checking subscribed resources every refresh interval on the running event loop."""
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.get_running_loop().create_task(self._watch())
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh)
+            await self.check()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._subscribers.clear()
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+store = ResourceStore()
+
+def setup_nhl_resources(mcp):
+    """
+    Publish the static NHL datasets as MCP resources, with versions and change notifications.
+
+    Reads may go upstream, so every handler runs them on a worker thread and
+    keeps the event loop free for other sessions.
+    """
+
+    def register(uri, name, description):
+        @mcp.resource(uri, name=name, description=description, mime_type="application/json")
+        async def read() -> dict:
+            return await asyncio.to_thread(store.read, uri)
+
+    for uri, (name, _, description) in DATASETS.items():
+        register(uri, name, description)
+
+    @mcp.resource(BRACKET_URI, name="playoff_bracket", mime_type="application/json",
+                  description="The playoff bracket for the playoffs held in a year (e.g., 2024).")
+    async def playoff_bracket(year: str) -> dict:
+        return await asyncio.to_thread(store.read, BRACKET_URI.format(year=year))
+
+    @mcp.resource(VERSIONS_URI, name="versions", mime_type="application/json",
+                  description="Current version of each NHL resource; re-read a resource only when its version changes.")
+    async def versions() -> dict:
+        return {"versions": await asyncio.to_thread(store.versions)}
+
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        store.subscribe(str(uri), server.request_context.session)
+        store.watch()
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        store.unsubscribe(str(uri), server.request_context.session)
+
+    # The low-level server always advertises subscribe=False; advertise the handlers above
+    get_capabilities = server.get_capabilities
+
+    def capabilities(*args, **kwargs):
+        result = get_capabilities(*args, **kwargs)
+        if result.resources is not None:
+            result.resources.subscribe = True
+        return result
+
+    server.get_capabilities = capabilities
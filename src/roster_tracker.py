@@ -0,0 +1,278 @@
+import os
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from .arguments import canonical_arguments, canonical_team
+from .client import client
+from .compact import compact, expand
+from .errors import error_result, raise_for_error
+from .parallel import fetch_concurrently
+from .teams import get_nhl_teams
+
+__all__ = [
+    'get_nhl_roster_changes',
+]
+
+# Seconds between roster refreshes
+REFRESH_INTERVAL = float(os.environ.get("NHL_MCP_ROSTER_REFRESH", 30 * 60))
+# Changes kept in the log; older ones are dropped first
+MAX_CHANGES = 5000
+
+# Roster groups in a team roster response
+GROUPS = ("forwards", "defensemen", "goalies")
+# A cursor: the id of the tracker that issued it and a sequence number
+_CURSOR = re.compile(r"^([0-9a-f]{8}):(\d+)$")
+
+def _name(value) -> str:
+    return value.get("default", "") if isinstance(value, dict) else (value or "")
+
+def _iso(at: float) -> str:
+    return datetime.fromtimestamp(at, timezone.utc).isoformat(timespec="seconds")
+
+def _entry(player: dict) -> tuple:
+    """The tracked fields of one roster player: (name, position, sweater number)."""
+    name = f"{_name(player.get('firstName'))} {_name(player.get('lastName'))}".strip()
+    return name, player.get("positionCode"), player.get("sweaterNumber")
+
+def diff_rosters(old: dict, new: dict) -> list:
+    """
+    The changes between two league snapshots (team -> {player id: entry}).
+
+    A player leaving one team and joining another in the same refresh is one
+    "moved" change (a trade, waiver claim or loan); otherwise players are
+    "added" or "removed", and a changed position or number is "updated".
+
+    Returns:
+        list: Change dicts, by team then player id.
+    """
+    added, removed = {}, {}
+    changes = []
+    for team in sorted(set(old) | set(new)):
+        before, after = old.get(team, {}), new.get(team, {})
+        for player_id in before.keys() - after.keys():
+            removed[player_id] = (team, before[player_id])
+        for player_id in after.keys() - before.keys():
+            added[player_id] = (team, after[player_id])
+        for player_id in sorted(before.keys() & after.keys()):
+            (_, old_position, old_number), (name, position, number) = before[player_id], after[player_id]
+            fields = {field: [was, now] for field, was, now in (("position", old_position, position),
+                                                                 ("sweater_number", old_number, number))
+                      if was != now}
+            if fields:
+                changes.append({"type": "updated", "player_id": player_id, "name": name, "team": team,
+                                "position": position, "fields": fields})
+
+    for player_id, (team, (name, position, _)) in added.items():
+        if player_id in removed:
+            changes.append({"type": "moved", "player_id": player_id, "name": name, "team": team,
+                            "from_team": removed.pop(player_id)[0], "position": position})
+        else:
+            changes.append({"type": "added", "player_id": player_id, "name": name, "team": team,
+                            "position": position})
+    for player_id, (team, (name, position, _)) in removed.items():
+        changes.append({"type": "removed", "player_id": player_id, "name": name, "team": team,
+                        "position": position})
+    return sorted(changes, key=lambda change: (change["team"], change["player_id"]))
+
+class RosterTracker:
+    """
+    Every team's current roster, refreshed periodically, with an append-only log of changes.
+
+    The first query fetches all rosters concurrently as the baseline and starts
+    a background thread that refetches them every refresh seconds. Each refresh
+    appends only what changed (players added, removed, moved between teams or
+    given a new position or number) to the log, numbered with a sequence the
+    caller can pass back as a cursor. Queries are answered from the log alone.
+    A team whose roster cannot be fetched keeps its previous roster, so a
+    failed fetch never shows up as its whole roster leaving, and a team whose
+    roster has never been fetched is left out until it is, its first roster
+    becoming its baseline rather than a list of players added.
+
+    The log lives in this process only, so cursors carry the id of the tracker
+    that issued them; a cursor from another process (another replica, or
+    before a restart or reset) is rejected rather than misread.
+
+    Args:
+        refresh: Seconds between refreshes; zero or less refreshes only on refresh_now().
+        max_changes: Changes kept in the log.
+    """
+
+    def __init__(self, refresh: float = REFRESH_INTERVAL, max_changes: int = MAX_CHANGES):
+        self.refresh = refresh
+        self.id = secrets.token_hex(4)
+        self._changes = deque(maxlen=max_changes)
+        self._rosters = None
+        self._seq = 0
+        self._tracking_since = None
+        self._refreshed_at = None
+        self._missing_teams = []
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+
+    def _fetch(self) -> tuple:
+        teams = sorted(team["abbr"] for team in raise_for_error(get_nhl_teams())["teams"])
+        results = fetch_concurrently(self._team_roster, teams)
+        return dict(zip(teams, results)), [team for team, roster in zip(teams, results) if roster is None]
+
+    def _team_roster(self, team: str):
+        try:
+            data = client.teams.team_roster(team, "current") or {}
+        except Exception:
+            return None
+        return {player["id"]: _entry(player) for group in GROUPS for player in data.get(group) or []}
+
+    def refresh_now(self) -> int:
+        """
+        Refetch every roster and log the changes since the last refresh.
+
+        Returns:
+            int: Changes appended to the log (none for the baseline refresh).
+        """
+        with self._refresh_lock:
+            fetched, missing = self._fetch()
+            with self._lock:
+                old = self._rosters
+            new = {team: roster if roster is not None else (old or {}).get(team)
+                   for team, roster in fetched.items()}
+            new = {team: roster for team, roster in new.items() if roster is not None}
+            # Teams fetched for the first time are only a baseline
+            tracked = set(old or ()) & set(new)
+            changes = (diff_rosters({team: old[team] for team in tracked}, {team: new[team] for team in tracked})
+                       if old is not None else [])
+            now = time.time()
+            with self._lock:
+                for change in changes:
+                    self._seq += 1
+                    self._changes.append(compact({"seq": self._seq, "detected_at": now, **change}))
+                self._rosters = new
+                self._missing_teams = missing
+                self._refreshed_at = now
+                if self._tracking_since is None:
+                    self._tracking_since = now
+            return len(changes)
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.wait(self.refresh):
+            try:
+                self.refresh_now()
+            except Exception:
+                # Keep the last rosters and try again on the next tick
+                pass
+
+    def start(self) -> None:
+        """Take the baseline if there is none yet, and start the periodic refresh."""
+        with self._lock:
+            started = self._rosters is not None
+        if not started:
+            self.refresh_now()
+        with self._lock:
+            if self.refresh > 0 and self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), name="roster-tracker",
+                                                daemon=True)
+                self._thread.start()
+
+    def changes(self, since=None, team_abbr: str = None, limit: int = None) -> dict:
+        """
+        Logged changes after a cursor or time, optionally only those involving one team.
+
+        Args:
+            since: A cursor from an earlier answer of this tracker, an ISO date
+                   or datetime (UTC if no offset is given), or None for the whole log.
+            team_abbr: Optional team abbreviation; moves into or out of it count.
+            limit: Maximum number of changes, oldest first; the cursor then points
+                   at the last one returned so the next call continues from there.
+        """
+        after_seq, after_time = _parse_since(since, self.id)
+        self.start()
+        with self._lock:
+            log = list(self._changes)
+            seq, tracking_since, refreshed_at, missing = (self._seq, self._tracking_since, self._refreshed_at,
+                                                          self._missing_teams)
+        selected = [change for change in log
+                    if change["seq"] > after_seq and change["detected_at"] >= after_time
+                    and (team_abbr is None or team_abbr in (change["team"], change.get("from_team")))]
+        has_more = limit is not None and len(selected) > limit
+        if has_more:
+            selected = selected[:limit]
+            seq = selected[-1]["seq"] if selected else after_seq
+        changes = [expand(change) for change in selected]
+        for change in changes:
+            change["detected_at"] = _iso(change["detected_at"])
+        oldest = log[0] if log else None
+        return {
+            "changes": changes,
+            "cursor": f"{self.id}:{seq}",
+            "has_more": has_more,
+            # Some changes after the cursor or time asked for were already dropped from the log
+            "truncated": (oldest is not None and oldest["seq"] > 1 and after_seq < oldest["seq"] - 1
+                          and after_time < oldest["detected_at"]),
+            "tracking_since": _iso(tracking_since),
+            "last_refreshed_at": _iso(refreshed_at),
+            "missing_teams": missing,
+        }
+
+    def reset(self) -> None:
+        with self._refresh_lock, self._lock:
+            if self._stop is not None:
+                self._stop.set()
+            self._changes.clear()
+            self._rosters = None
+            self._seq = 0
+            self._tracking_since = self._refreshed_at = None
+            self._missing_teams = []
+            self._thread = None
+            self.id = secrets.token_hex(4)
+
+def _parse_since(since, tracker_id: str) -> tuple:
+    """(sequence number, epoch seconds) a change must be after and at or after, respectively."""
+    if since is None or since == "":
+        return 0, float("-inf")
+    cursor = _CURSOR.match(str(since))
+    if cursor:
+        if cursor.group(1) != tracker_id:
+            raise ValueError(f"Cursor {since} was issued by another server process or before a restart; "
+                             "pass an ISO date/time instead")
+        return int(cursor.group(2)), float("-inf")
+    try:
+        moment = datetime.fromisoformat(str(since))
+    except ValueError:
+        raise ValueError(f"Invalid since {since}; use a cursor from an earlier answer or an ISO date/time") from None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return 0, moment.timestamp()
+
+tracker = RosterTracker()
+
+@canonical_arguments(team_abbr=canonical_team)
+def get_nhl_roster_changes(since: str = None, team_abbr: str = None, limit: int = 500) -> dict:
+    """
+    Get roster changes (call-ups, send-downs, trades, signings, number changes) across the league.
+
+    Answers come from a log the server keeps by refreshing every team's
+    roster in the background, so no rosters are fetched or returned per call.
+    The log belongs to one server process: cursors from another replica, or
+    from before a restart, are rejected, and a date/time must be used instead.
+
+    Args:
+        since: Optional cursor from an earlier answer's "cursor" to get only newer changes,
+               or an ISO date/time (e.g., 2024-03-08) to get changes detected since then
+        team_abbr: Optional team abbreviation (e.g., TOR); players moving in or out both count
+        limit: Maximum number of changes to return, oldest first. Defaults to 500; if more
+               remain, has_more is true and the cursor continues from the last one returned
+
+    Returns:
+        dict: Changes in the order detected, each with its sequence number, type (added, removed,
+              moved, updated), player, team(s) and detection time; the cursor to pass as since next
+              time; and when tracking started and the rosters were last refreshed, or error message.
+    """
+    try:
+        return tracker.changes(since, team_abbr, max(limit, 1))
+    except Exception as e:
+        return error_result(e)
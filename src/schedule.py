@@ -1,30 +1,67 @@
+import calendar
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from .arguments import (canonical_arguments, canonical_date, canonical_month, canonical_season, canonical_team,
+                        canonical_year, optional_date)
+from .cache import cached
 from .client import client
+from .deltas import delta_result
+from .directories import team_directory
+from .errors import error_result, raise_for_error
+from .game_store import store
+from .parallel import fetch_concurrently
+from .standings import get_nhl_standings
+from .ttl_policy import playoff_series_ttl, playoff_ttl
+
+__all__ = [
+    'get_nhl_daily_schedule',
+    'get_nhl_weekly_schedule',
+    'get_nhl_team_monthly_schedule',
+    'get_nhl_team_weekly_schedule',
+    'get_nhl_team_season_schedule',
+    'get_nhl_calendar_schedule',
+    'get_nhl_playoff_carousel',
+    'get_nhl_playoff_series_schedule',
+    'get_nhl_playoff_bracket',
+    'get_nhl_league_season_schedule',
+    'get_nhl_playoff_picture',
+]
+
+# Fields of the upstream daily schedule besides its date and games
+DAILY_ENVELOPE = ("nextStartDate", "previousStartDate", "oddsPartners")
 
-def get_nhl_daily_schedule(date: str = None) -> dict:
+@canonical_arguments(date=canonical_date)
+def get_nhl_daily_schedule(date: str = None, since_version: str = None) -> dict:
     """
     Get NHL schedule for a specific date.
     
     Args:
         date: Date in YYYY-MM-DD format. Defaults to today's date.
+        since_version: Optional version token from a previous result. If the schedule is
+                       unchanged only {"not_modified": true} is returned, otherwise only the changes.
     
     Returns:
-        dict: Game schedule data for the specified date or error message.
+        dict: Game schedule data for the specified date with a version token, the changes
+              since since_version, or error message.
     """
     try:
-        from datetime import datetime
-        if not date:
-            date = datetime.now().strftime("%Y-%m-%d")  # Default to today's date
-        else:
-            # Parse and reformat the date to ensure YYYY-MM-DD
-            date = datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
-        
-        schedule_data = client.schedule.daily_schedule(date)
-        return {"schedule": schedule_data}
+        day = _parse_date(date)
+        games = store.games(day, day)
+        envelope = store.envelope(day)
+        schedule = {"schedule": {
+            **{key: envelope.get(key) for key in DAILY_ENVELOPE},
+            "date": day.isoformat(),
+            "games": games,
+            "numberOfGames": len(games),
+        }}
+        return delta_result(schedule, since_version)
     except ValueError as e:
-        return {"error": f"Invalid date format: {str(e)}. Please use YYYY-MM-DD."}
+        return error_result(e, f"Invalid date format: {str(e)}. Please use YYYY-MM-DD.")
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(date=canonical_date)
 def get_nhl_weekly_schedule(date: str = None) -> dict:
     """
     Get NHL schedule for a week starting from the specified date.
@@ -37,12 +74,19 @@ def get_nhl_weekly_schedule(date: str = None) -> dict:
         dict: Weekly game schedule data or error message.
     """
     try:
-        res = date if date else "now"
-        schedule = client.schedule.weekly_schedule(res)
-        return {"schedule": schedule}
+        start = _parse_date(date)
+        games = store.games(start, start + timedelta(days=6))
+        games_by_day = {(start + timedelta(days=offset)).isoformat(): [] for offset in range(7)}
+        for game in games:
+            games_by_day[game["gameDate"]].append(game)
+        game_week = [{"date": day, "dayAbbrev": datetime.strptime(day, "%Y-%m-%d").strftime("%a").upper(),
+                      "numberOfGames": len(day_games), "games": day_games}
+                     for day, day_games in games_by_day.items()]
+        return {"schedule": {**store.envelope(start), "gameWeek": game_week, "numberOfGames": len(games)}}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(team_abbr=canonical_team, month=canonical_month)
 def get_nhl_team_monthly_schedule(team_abbr: str, month: str = None) -> dict:
     """
     Get monthly schedule for specified team or the given month.
@@ -55,11 +99,14 @@ def get_nhl_team_monthly_schedule(team_abbr: str, month: str = None) -> dict:
         dict: Monthly schedule data or error message.
     """
     try:
-        games = client.schedule.team_monthly_schedule(team_abbr, month)
+        first = datetime.strptime(month, "%Y-%m").date()
+        last = first.replace(day=calendar.monthrange(first.year, first.month)[1])
+        games = store.games(first, last, team_abbr)
         return {"games": games, "team": team_abbr, "month": month}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(team_abbr=canonical_team, date=canonical_date)
 def get_nhl_team_weekly_schedule(team_abbr: str, date: str = None) -> dict:
     """
     Get weekly schedule for specified team.
@@ -73,11 +120,15 @@ def get_nhl_team_weekly_schedule(team_abbr: str, date: str = None) -> dict:
         dict: Weekly schedule data or error message.
     """
     try:
-        games = client.schedule.team_weekly_schedule(team_abbr, date)
+        day = _parse_date(date)
+        # Club weeks run Monday to Sunday
+        start = day - timedelta(days=day.weekday())
+        games = store.games(start, start + timedelta(days=6), team_abbr)
         return {"games": games, "team": team_abbr, "date": date}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(team_abbr=canonical_team, season=canonical_season)
 def get_nhl_team_season_schedule(team_abbr: str, season: str) -> dict:
     """
     Get full season schedule for specified team.
@@ -93,8 +144,9 @@ def get_nhl_team_season_schedule(team_abbr: str, season: str) -> dict:
         schedule = client.schedule.team_season_schedule(team_abbr, season)
         return {"schedule": schedule, "team": team_abbr, "season": season}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(date=canonical_date)
 def get_nhl_calendar_schedule(date: str) -> dict:
     """
     Get schedule in calendar format for specified date.
@@ -109,24 +161,34 @@ def get_nhl_calendar_schedule(date: str) -> dict:
         schedule = client.schedule.calendar_schedule(date)
         return {"schedule": schedule, "date": date}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
-def get_nhl_playoff_carousel(season: str) -> dict:
+@canonical_arguments(season=canonical_season)
+def get_nhl_playoff_carousel(season: str, since_version: str = None) -> dict:
     """
     Get list of all series games up to current playoff round.
     
     Args:
         season: Season in YYYYYYYY format (e.g., "20232024")
+        since_version: Optional version token from a previous result. If the series are
+                       unchanged only {"not_modified": true} is returned, otherwise only the changes.
     
     Returns:
-        dict: Playoff series data for the specified season or error message.
+        dict: Playoff series data for the specified season with a version token, the changes
+              since since_version, or error message.
     """
+    return delta_result(_playoff_carousel(season), since_version)
+
+@cached("playoff_carousel", ttl=playoff_ttl)
+def _playoff_carousel(season: str) -> dict:
     try:
         playoff_data = client.schedule.playoff_carousel(season)
         return {"playoff_data": playoff_data, "season": season}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(season=canonical_season)
+@cached("playoff_series", ttl=playoff_series_ttl)
 def get_nhl_playoff_series_schedule(season: str, series: str) -> dict:
     """
     Get the schedule for a specified playoff series.
@@ -142,8 +204,10 @@ def get_nhl_playoff_series_schedule(season: str, series: str) -> dict:
         series_schedule = client.schedule.playoff_series_schedule(season, series)
         return {"series_schedule": series_schedule, "season": season, "series": series}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(year=canonical_year)
+@cached("playoff_bracket", ttl=playoff_ttl)
 def get_nhl_playoff_bracket(year: str) -> dict:
     """
     Get the playoff bracket.
@@ -158,4 +222,210 @@ def get_nhl_playoff_bracket(year: str) -> dict:
         bracket = client.schedule.playoff_bracket(year)
         return {"bracket": bracket, "year": year}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
+
+@canonical_arguments(season=canonical_season, start_date=optional_date, end_date=optional_date,
+                     team_abbr=canonical_team, opponent_abbr=canonical_team)
+def get_nhl_league_season_schedule(season: str, start_date: str = None, end_date: str = None,
+                                   team_abbr: str = None, opponent_abbr: str = None) -> dict:
+    """
+    Get the full league schedule for a season as one deduplicated game index.
+    
+    Season schedules for every team are fetched concurrently. Each game appears
+    under both of its teams, so games are deduplicated by game id and sorted by
+    date and start time. With a team filter only that team's schedule is
+    fetched, and none at all if its game type directory shows it did not play
+    the season.
+    
+    Args:
+        season: Season in YYYYYYYY format (e.g., 20232024)
+        start_date: Optional first date to include, YYYY-MM-DD
+        end_date: Optional last date to include, YYYY-MM-DD
+        team_abbr: Optional team abbreviation; only games involving this team
+        opponent_abbr: Optional second team abbreviation; with team_abbr, only
+                       games between the two teams. On its own it works like team_abbr
+    
+    Returns:
+        dict: Sorted list of games for the season and any teams that failed to load,
+              or error message.
+    """
+    try:
+        teams = _schedule_team_abbrs(season, team_abbr or opponent_abbr)
+        schedules = fetch_concurrently(lambda team: get_nhl_team_season_schedule(team, season), teams)
+        missing_teams = [team for team, result in zip(teams, schedules) if "error" in result]
+
+        games = _build_game_index(result["schedule"] for result in schedules if "error" not in result)
+        games = _games_in_date_range(games, start_date, end_date)
+        if team_abbr or opponent_abbr:
+            games = _games_for_teams(games, team_abbr, opponent_abbr)
+
+        return {"games": games, "season": season, "total_games": len(games), "missing_teams": missing_teams}
+    except Exception as e:
+        return error_result(e)
+
+@canonical_arguments(season=canonical_season)
+def get_nhl_playoff_picture(season: str) -> dict:
+    """
+    Get a whole postseason in one structure: the bracket, every series and its games.
+    
+    The bracket and carousel are fetched together, then the schedules of all
+    series whose teams are known are fetched concurrently. Decided series are
+    cached for good, so once a round is complete it is never fetched again.
+    
+    Args:
+        season: Season in YYYYYYYY format (e.g., "20232024")
+    
+    Returns:
+        dict: Rounds with their series (seeds, wins, status and games), the champion
+              and any series whose schedule failed to load, or error message.
+    """
+    try:
+        bracket, carousel = fetch_concurrently(lambda fetch: fetch(), [
+            lambda: get_nhl_playoff_bracket(season[4:8]),
+            lambda: _playoff_carousel(season),
+        ])
+        if "error" in bracket:
+            return bracket
+        round_labels, current_round = {}, None
+        if "error" not in carousel:
+            current_round = carousel["playoff_data"].get("currentRound")
+            for round_data in carousel["playoff_data"].get("rounds", []):
+                round_labels[round_data.get("roundNumber")] = round_data.get("roundLabel")
+
+        bracket_series = sorted(bracket["bracket"].get("series", []),
+                                key=lambda series: (series.get("playoffRound", 0), series.get("seriesLetter", "")))
+        set_series = [series for series in bracket_series if _series_is_set(series)]
+        # One round trip to the shared cache for every series before fetching the rest
+        get_nhl_playoff_series_schedule.prefetch(
+            [(season, series["seriesLetter"].lower()) for series in set_series])
+        schedules = fetch_concurrently(
+            lambda series: get_nhl_playoff_series_schedule(season, series["seriesLetter"].lower()), set_series)
+        schedules = {series["seriesLetter"]: result for series, result in zip(set_series, schedules)}
+        missing_series = [letter for letter, result in schedules.items() if "error" in result]
+
+        rounds = {}
+        for series in bracket_series:
+            schedule = schedules.get(series.get("seriesLetter"), {}).get("series_schedule", {})
+            number = series.get("playoffRound")
+            rounds.setdefault(number, []).append(_normalize_series(series, schedule))
+        # The Stanley Cup Final is the only series in the last round
+        final = rounds[max(rounds)] if rounds else []
+        champion = None
+        if len(final) == 1 and final[0]["winning_team_id"]:
+            champion = next((seed for seed in (final[0]["top_seed"], final[0]["bottom_seed"])
+                             if seed["id"] == final[0]["winning_team_id"]), None)
+
+        return {
+            "season": season,
+            "current_round": current_round,
+            "rounds": [{
+                "round": number,
+                "label": round_labels.get(number),
+                "complete": all(series["status"] == "complete" for series in round_series),
+                "series": round_series,
+            } for number, round_series in sorted(rounds.items())],
+            "champion": champion,
+            "missing_series": missing_series,
+        }
+    except Exception as e:
+        return error_result(e)
+
+def _series_is_set(series: dict) -> bool:
+    """Whether both teams of a bracket series are known yet."""
+    return bool((series.get("topSeedTeam") or {}).get("id") and (series.get("bottomSeedTeam") or {}).get("id"))
+
+def _normalize_seed(team: dict, rank, wins) -> dict:
+    team = team or {}
+    return {
+        "id": team.get("id"),
+        "abbrev": team.get("abbrev"),
+        "name": (team.get("name") or {}).get("default"),
+        "rank": rank,
+        "wins": wins or 0,
+    }
+
+def _normalize_game(game: dict) -> dict:
+    return {
+        "id": game.get("id"),
+        "game_number": game.get("gameNumber"),
+        "start_time_utc": game.get("startTimeUTC"),
+        "state": game.get("gameState"),
+        "away": {"abbrev": game.get("awayTeam", {}).get("abbrev"), "score": game.get("awayTeam", {}).get("score")},
+        "home": {"abbrev": game.get("homeTeam", {}).get("abbrev"), "score": game.get("homeTeam", {}).get("score")},
+    }
+
+def _normalize_series(series: dict, schedule: dict) -> dict:
+    """Merge a bracket series with its series schedule (empty if not fetched)."""
+    top = _normalize_seed(series.get("topSeedTeam"), series.get("topSeedRank"), series.get("topSeedWins"))
+    bottom = _normalize_seed(series.get("bottomSeedTeam"), series.get("bottomSeedRank"), series.get("bottomSeedWins"))
+    games = [_normalize_game(game) for game in schedule.get("games", [])]
+    if series.get("winningTeamId"):
+        status = "complete"
+    elif not _series_is_set(series):
+        status = "pending"
+    elif top["wins"] or bottom["wins"] or any(game["state"] not in ("FUT", "PRE", None) for game in games):
+        status = "in_progress"
+    else:
+        status = "scheduled"
+    return {
+        "letter": series.get("seriesLetter"),
+        "title": series.get("seriesTitle"),
+        "abbrev": series.get("seriesAbbrev"),
+        "status": status,
+        "needed_to_win": schedule.get("neededToWin"),
+        "winning_team_id": series.get("winningTeamId"),
+        "top_seed": top,
+        "bottom_seed": bottom,
+        "games": games,
+    }
+
+def _parse_date(date: str = None):
+    """A YYYY-MM-DD string as a date; None or "now" is today's NHL date."""
+    if not date or date == "now":
+        return store.today()
+    return datetime.strptime(date, "%Y-%m-%d").date()
+
+def _schedule_team_abbrs(season: str, team_abbr: str = None) -> list:
+    """Teams whose season schedules hold every game of the season, or every game of team_abbr."""
+    if not team_abbr:
+        return _season_team_abbrs(season)
+    try:
+        return [team_abbr] if season in team_directory(team_abbr) else []
+    except Exception:
+        # The directory only saves requests; without it, fetch the schedule anyway
+        return [team_abbr]
+
+def _season_team_abbrs(season: str) -> list:
+    """Team abbreviations taking part in a season, taken from its final standings."""
+    standings = raise_for_error(get_nhl_standings(season=season))
+    return [row["teamAbbrev"]["default"] for row in standings["standings"].get("standings", [])]
+
+def _game_sort_key(game: dict) -> tuple:
+    return game.get("gameDate", ""), game.get("startTimeUTC", ""), game.get("id", 0)
+
+def _build_game_index(schedules) -> list:
+    """Merge team season schedules into one list of unique games, sorted by date."""
+    games_by_id = {}
+    for schedule in schedules:
+        for game in schedule.get("games", []):
+            games_by_id.setdefault(game["id"], game)
+    return sorted(games_by_id.values(), key=_game_sort_key)
+
+def _games_in_date_range(games: list, start_date: str = None, end_date: str = None) -> list:
+    """Slice a sorted game index to the inclusive YYYY-MM-DD range."""
+    if not start_date and not end_date:
+        return games
+    dates = [game.get("gameDate", "") for game in games]
+    lo = bisect_left(dates, start_date) if start_date else 0
+    hi = bisect_right(dates, end_date) if end_date else len(games)
+    return games[lo:hi]
+
+def _games_for_teams(games: list, team_abbr: str = None, opponent_abbr: str = None) -> list:
+    """Games involving every given team: one team's games, or the games between two teams."""
+    wanted = {abbr.upper() for abbr in (team_abbr, opponent_abbr) if abbr}
+    matched = []
+    for game in games:
+        playing = {game.get("homeTeam", {}).get("abbrev"), game.get("awayTeam", {}).get("abbrev")}
+        if wanted <= playing:
+            matched.append(game)
+    return matched
@@ -0,0 +1,278 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import deadline, profiling
+from .errors import DeadlineExceeded, error_result
+
+# Tool calls running at once across all sessions
+MAX_CONCURRENT_TOOLS = int(os.environ.get("NHL_MCP_MAX_CONCURRENT_TOOLS", 8))
+# Tool calls running at once for any one session
+SESSION_CONCURRENCY = int(os.environ.get("NHL_MCP_SESSION_CONCURRENCY", 2))
+# Sessions whose usage is remembered; the least recently seen are dropped first
+MAX_TRACKED_SESSIONS = 1024
+# Session id used outside an MCP request (e.g. direct calls, tests)
+LOCAL_SESSION = "local"
+
+def _parse_weights(spec: str) -> dict:
+    """Parse "client-a=2,client-b=0.5" into {client_id: weight}."""
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() and weight.strip():
+            weights[name.strip()] = float(weight)
+    return weights
+
+# Fair-share weights per client id (default 1). A weight of 2 gets twice the share.
+CLIENT_WEIGHTS = _parse_weights(os.environ.get("NHL_MCP_CLIENT_WEIGHTS", ""))
+
+def session_key(session_id: str) -> str:
+    """
+    A short hash standing in for a session id in usage reports.
+
+    Session ids are live Mcp-Session-Id header values, so they are never
+    reported; anyone holding one could make calls as that session.
+    """
+    return hashlib.sha256(str(session_id).encode()).hexdigest()[:12]
+
+class SessionUsage:
+    """Running totals for one MCP session."""
+
+    __slots__ = ("session_id", "client_id", "calls", "errors", "upstream_calls", "upstream_bytes",
+                 "busy_seconds", "queue_seconds", "in_flight", "last_seen")
+
+    def __init__(self, session_id: str, client_id: str = None):
+        self.session_id = session_id
+        self.client_id = client_id
+        self.calls = 0
+        self.errors = 0
+        self.upstream_calls = 0
+        self.upstream_bytes = 0
+        self.busy_seconds = 0.0
+        self.queue_seconds = 0.0
+        self.in_flight = 0
+        self.last_seen = time.time()
+
+    def to_dict(self, current_session: str = None) -> dict:
+        return {
+            "session": session_key(self.session_id),
+            "current": self.session_id == current_session,
+            "client_id": self.client_id,
+            "calls": self.calls,
+            "errors": self.errors,
+            "upstream_calls": self.upstream_calls,
+            "upstream_bytes": self.upstream_bytes,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "queue_seconds": round(self.queue_seconds, 3),
+            "in_flight": self.in_flight,
+            "last_seen": self.last_seen,
+        }
+
+_usage = OrderedDict()
+_usage_lock = threading.Lock()
+_current_usage = contextvars.ContextVar("nhl_session_usage", default=None)
+
+def session_usage(session_id: str, client_id: str = None) -> SessionUsage:
+    """Get (creating on first use) the usage record for a session."""
+    with _usage_lock:
+        usage = _usage.get(session_id)
+        if usage is None:
+            usage = _usage[session_id] = SessionUsage(session_id, client_id)
+            while len(_usage) > MAX_TRACKED_SESSIONS:
+                _usage.popitem(last=False)
+        _usage.move_to_end(session_id)
+        usage.last_seen = time.time()
+        if client_id:
+            usage.client_id = client_id
+        return usage
+
+def record_upstream_call(num_bytes: int) -> None:
+    """Charge one upstream request to the session whose tool call made it."""
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    with _usage_lock:
+        usage.upstream_calls += 1
+        usage.upstream_bytes += num_bytes
+
+def reset_usage() -> None:
+    with _usage_lock:
+        _usage.clear()
+
+class FairScheduler:
+    """
+    Weighted fair queuing of tool calls across sessions.
+
+    At most capacity calls run at once, and at most per_session for any one
+    session. Every call gets a virtual finish tag of
+    max(virtual time, the session's previous tag) + 1 / weight, and waiting
+    calls are started in tag order. A session that floods the server queues
+    behind its own earlier calls, while a session with a single call is
+    started next.
+
+    Args:
+        capacity: Calls running at once across all sessions.
+        per_session: Calls running at once for one session.
+    """
+
+    def __init__(self, capacity: int = MAX_CONCURRENT_TOOLS, per_session: int = SESSION_CONCURRENCY):
+        self.capacity = capacity
+        self.per_session = per_session
+        self.in_flight = 0
+        self._session_in_flight = {}
+        self._finish_tags = {}
+        self._virtual_time = 0.0
+        self._waiters = []  # heap of (finish_tag, seq, session_id, start_tag, future)
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    @contextlib.asynccontextmanager
+    async def slot(self, session_id: str, weight: float = 1.0):
+        """Wait for this session's fair turn, then hold a slot for the duration of the block."""
+        start_tag = max(self._virtual_time, self._finish_tags.get(session_id, 0.0))
+        finish_tag = start_tag + 1.0 / weight
+        self._finish_tags[session_id] = finish_tag
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (finish_tag, next(self._seq), session_id, start_tag, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(session_id)
+            raise
+        try:
+            yield
+        finally:
+            self._release(session_id)
+
+    def _dispatch(self) -> None:
+        blocked = []
+        while self._waiters and self.in_flight < self.capacity:
+            entry = heapq.heappop(self._waiters)
+            _, _, session_id, start_tag, future = entry
+            if future.done():
+                continue
+            if self._session_in_flight.get(session_id, 0) >= self.per_session:
+                blocked.append(entry)
+                continue
+            self.in_flight += 1
+            self._session_in_flight[session_id] = self._session_in_flight.get(session_id, 0) + 1
+            self._virtual_time = max(self._virtual_time, start_tag)
+            future.set_result(None)
+        for entry in blocked:
+            heapq.heappush(self._waiters, entry)
+
+    def _release(self, session_id: str) -> None:
+        self.in_flight -= 1
+        remaining = self._session_in_flight[session_id] - 1
+        if remaining:
+            self._session_in_flight[session_id] = remaining
+        else:
+            del self._session_in_flight[session_id]
+            if not any(waiter[2] == session_id for waiter in self._waiters):
+                # An idle session starts over from the current virtual time
+                self._finish_tags.pop(session_id, None)
+        self._dispatch()
+
+scheduler = FairScheduler()
+
+def _request_identity() -> tuple:
+    """(session_id, client_id) of the MCP request being served."""
+    try:
+        from fastmcp.server.dependencies import get_context
+
+        context = get_context()
+        return context.session_id, context.client_id
+    except Exception:
+        return LOCAL_SESSION, None
+
+def fair_share_tool(fn, budget: float = None):
+    """
+    Wrap a synchronous MCP tool so it is scheduled fairly per session.
+
+    The call gets the request deadline (budget seconds, default REQUEST_BUDGET), waits for its session's turn, runs on a
+    worker thread so the event loop stays free for other sessions, and is
+    charged to the session's usage. The wrapper keeps fn's name, docstring and
+    signature.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        session_id, client_id = _request_identity()
+        usage = session_usage(session_id, client_id)
+        weight = CLIENT_WEIGHTS.get(client_id, 1.0) if client_id else 1.0
+
+        queued_at = time.perf_counter()
+        with deadline.deadline(budget or deadline.REQUEST_BUDGET):
+            async with scheduler.slot(session_id, weight):
+                started_at = time.perf_counter()
+                with _usage_lock:
+                    usage.calls += 1
+                    usage.in_flight += 1
+                    usage.queue_seconds += started_at - queued_at
+                token = _current_usage.set(usage)
+                queue_token = profiling.queue_wait.set(started_at - queued_at)
+                try:
+                    if deadline.remaining() <= 0:
+                        result = error_result(DeadlineExceeded("Request deadline exceeded while queued"))
+                    else:
+                        result = await asyncio.to_thread(fn, *args, **kwargs)
+                finally:
+                    profiling.queue_wait.reset(queue_token)
+                    _current_usage.reset(token)
+                    with _usage_lock:
+                        usage.in_flight -= 1
+                        usage.busy_seconds += time.perf_counter() - started_at
+        if isinstance(result, dict) and "error" in result:
+            with _usage_lock:
+                usage.errors += 1
+        return result
+
+    return wrapper
+
+def get_nhl_session_usage(session_id: str = None, limit: int = 20) -> dict:
+    """
+    Get per-session usage of this server, busiest sessions first.
+
+    Sessions are identified by a hash of their id, never the id itself; the
+    caller's own session is marked current.
+
+    Args:
+        session_id: Optional session id, or its hash from an earlier answer, to show only that session.
+        limit: Maximum number of sessions to return. Defaults to 20.
+
+    Returns:
+        dict: Usage per session (calls, errors, upstream calls and bytes, busy and
+              queue time) and the scheduler's current load, or error message.
+    """
+    try:
+        current = _current_usage.get()
+        current_session = current.session_id if current is not None else LOCAL_SESSION
+        with _usage_lock:
+            sessions = [usage.to_dict(current_session) for usage in _usage.values()]
+        if session_id:
+            sessions = [usage for usage in sessions if usage["session"] in (session_id, session_key(session_id))]
+        sessions.sort(key=lambda usage: usage["busy_seconds"], reverse=True)
+        return {
+            "sessions": sessions[:limit],
+            "tracked_sessions": len(_usage),
+            "scheduler": {
+                "capacity": scheduler.capacity,
+                "per_session": scheduler.per_session,
+                "in_flight": scheduler.in_flight,
+                "queued": scheduler.queued,
+            },
+        }
+    except Exception as e:
+        return error_result(e)
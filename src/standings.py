@@ -1,6 +1,17 @@
+from .arguments import canonical_arguments, canonical_date, canonical_season
+from .cache import cached
 from .client import client
+from .deltas import delta_result
+from .errors import error_result
+from .ttl_policy import standings_ttl
 
-def get_nhl_standings(date: str = "now", season: str = None) -> dict:
+__all__ = [
+    'get_nhl_standings',
+    'get_nhl_season_manifest',
+]
+
+@canonical_arguments(date=canonical_date, season=canonical_season)
+def get_nhl_standings(date: str = "now", season: str = None, since_version: str = None) -> dict:
     """
     Get NHL league standings for a specified season or date.
     
@@ -11,10 +22,18 @@ def get_nhl_standings(date: str = "now", season: str = None) -> dict:
         date: Date in YYYY-MM-DD format. Defaults to current date.
         season: Season identifier to get final standings (e.g., 20232024, 20242025).
                Takes precedence over date parameter if both are provided.
+        since_version: Optional version token from a previous result. If the standings are
+                       unchanged only {"not_modified": true} is returned, otherwise only the changes.
     
     Returns:
-        dict: League standings data or error message.
+        dict: League standings data with a version token, the changes since since_version,
+              or error message.
     """
+    # A season's final standings do not depend on the date
+    return delta_result(_league_standings(None if season else date, season), since_version)
+
+@cached("standings", ttl=standings_ttl, compact_values=True)
+def _league_standings(date: str = "now", season: str = None) -> dict:
     try:
         # If season is provided, we need to look up the last date of the season
         if season:
@@ -31,7 +50,7 @@ def get_nhl_standings(date: str = "now", season: str = None) -> dict:
         standings = client.standings.league_standings(res)
         return {"standings": standings}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
 def get_nhl_season_manifest() -> dict:
     """
@@ -61,4 +80,4 @@ def get_nhl_season_manifest() -> dict:
         seasons = client.standings.season_standing_manifest()
         return {"seasons": seasons}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
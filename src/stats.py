@@ -1,5 +1,21 @@
+from .aggregates import aggregate_seasons
+from .arguments import canonical_arguments, canonical_season, canonical_team
+from .cache import cached
 from .client import client
+from .errors import error_result
+from .ttl_policy import directory_ttl, game_log_ttl, player_stats_ttl, stats_summary_ttl
 
+__all__ = [
+    'get_nhl_gametypes_per_season_by_team',
+    'get_nhl_player_career_stats',
+    'get_nhl_player_game_log',
+    'get_nhl_team_summary_stats',
+    'get_nhl_skater_stats_summary',
+    'get_nhl_goalie_stats_summary',
+]
+
+@canonical_arguments(team_abbr=canonical_team)
+@cached("gametypes_per_season", ttl=directory_ttl)
 def get_nhl_gametypes_per_season_by_team(team_abbr: str) -> dict:
     """
     Gets all game types played by a team throughout their history.
@@ -14,8 +30,9 @@ def get_nhl_gametypes_per_season_by_team(team_abbr: str) -> dict:
         data = client.stats.gametypes_per_season_directory_by_team(team_abbr)
         return {"gametypes": data}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@cached("player_career_stats", ttl=player_stats_ttl)
 def get_nhl_player_career_stats(player_id: str) -> dict:
     """
     Gets a player's career statistics and biographical information.
@@ -30,8 +47,10 @@ def get_nhl_player_career_stats(player_id: str) -> dict:
         data = client.stats.player_career_stats(player_id)
         return {"player_stats": data}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(season_id=canonical_season)
+@cached("player_game_log", ttl=game_log_ttl, compact_values=True)
 def get_nhl_player_game_log(player_id: str, season_id: str, game_type: int) -> dict:
     """
     Gets a player's game log for a specific season and game type.
@@ -51,8 +70,10 @@ def get_nhl_player_game_log(player_id: str, season_id: str, game_type: int) -> d
         data = client.stats.player_game_log(player_id, season_id, game_type)
         return {"game_log": data}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(start_season=canonical_season, end_season=canonical_season)
+@cached("team_summary_stats", ttl=stats_summary_ttl, compact_values=True)
 def get_nhl_team_summary_stats(start_season: str, end_season: str, game_type_id: int = 2, 
                                is_game: bool = False, is_aggregate: bool = False, 
                                start: int = 0, limit: int = 50) -> dict:
@@ -67,7 +88,8 @@ def get_nhl_team_summary_stats(start_season: str, end_season: str, game_type_id:
             3: Playoffs
             1: Preseason
         is_game (bool, optional): Defaults False
-        is_aggregate (bool, optional): Defaults False. Whether to aggregate the statistics
+        is_aggregate (bool, optional): Defaults False. Whether to aggregate the statistics. Season totals
+            are aggregated locally from cached per-season results unless is_game is set.
         start (int, optional): Starting index for pagination. Defaults to 0
         limit (int, optional): Maximum number of results to return. Defaults to 50
         
@@ -75,6 +97,9 @@ def get_nhl_team_summary_stats(start_season: str, end_season: str, game_type_id:
         dict: List of dictionaries containing team summary statistics or error message.
     """
     try:
+        if is_aggregate and not is_game:
+            return {"team_summary": aggregate_seasons("team", start_season, end_season, game_type_id,
+                                                      start=start, limit=limit)}
         data = client.stats.team_summary(
             start_season=start_season,
             end_season=end_season,
@@ -86,8 +111,10 @@ def get_nhl_team_summary_stats(start_season: str, end_season: str, game_type_id:
         )
         return {"team_summary": data}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(start_season=canonical_season, end_season=canonical_season)
+@cached("skater_stats_summary", ttl=stats_summary_ttl, compact_values=True)
 def get_nhl_skater_stats_summary(start_season: str, end_season: str, franchise_id: str = None,
                                  game_type_id: int = 2, aggregate: bool = False,
                                  start: int = 0, limit: int = 25) -> dict:
@@ -102,7 +129,8 @@ def get_nhl_skater_stats_summary(start_season: str, end_season: str, franchise_i
             2: Regular season (Default)
             3: Playoffs
             1: Preseason
-        aggregate (bool, optional): When True, combines multiple seasons' data per player
+        aggregate (bool, optional): When True, combines multiple seasons' data per player, computed
+            locally from cached per-season results
         start (int, optional): Starting index for pagination
         limit (int, optional): Maximum number of results to return. Defaults to 25
         
@@ -110,6 +138,9 @@ def get_nhl_skater_stats_summary(start_season: str, end_season: str, franchise_i
         dict: List of dictionaries containing skater statistics or error message.
     """
     try:
+        if aggregate:
+            return {"skater_stats": aggregate_seasons("skater", start_season, end_season, game_type_id,
+                                                      franchise_id, start, limit)}
         data = client.stats.skater_stats_summary(
             start_season=start_season,
             end_season=end_season,
@@ -121,8 +152,10 @@ def get_nhl_skater_stats_summary(start_season: str, end_season: str, franchise_i
         )
         return {"skater_stats": data}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(start_season=canonical_season, end_season=canonical_season)
+@cached("goalie_stats_summary", ttl=stats_summary_ttl, compact_values=True)
 def get_nhl_goalie_stats_summary(start_season: str, end_season: str = None,
                                  stats_type: str = "summary", game_type_id: int = 2,
                                  franchise_id: str = None, aggregate: bool = False,
@@ -141,7 +174,8 @@ def get_nhl_goalie_stats_summary(start_season: str, end_season: str = None,
             3: Playoffs
             1: Preseason
         franchise_id (str, optional): Franchise identifier to filter results
-        aggregate (bool, optional): When True, combines multiple seasons' data per goalie
+        aggregate (bool, optional): When True, combines multiple seasons' data per goalie. Summary
+            stats are computed locally from cached per-season results
         start (int, optional): Starting index for pagination
         limit (int, optional): Maximum number of results to return. Defaults to 25
         
@@ -149,6 +183,9 @@ def get_nhl_goalie_stats_summary(start_season: str, end_season: str = None,
         dict: Dictionary containing goalie statistics or error message.
     """
     try:
+        if aggregate and stats_type == "summary":
+            return {"goalie_stats": aggregate_seasons("goalie", start_season, end_season, game_type_id,
+                                                      franchise_id, start, limit)}
         data = client.stats.goalie_stats_summary(
             start_season=start_season,
             end_season=end_season,
@@ -161,4 +198,4 @@ def get_nhl_goalie_stats_summary(start_season: str, end_season: str = None,
         )
         return {"goalie_stats": data}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
@@ -0,0 +1,202 @@
+from datetime import date
+
+import numpy as np
+
+from .arguments import canonical_arguments, canonical_season, canonical_team
+from .cache import cached
+from .errors import error_result, raise_for_error
+from .schedule import get_nhl_league_season_schedule
+from .ttl_policy import FINAL_STATES, team_matrix_ttl
+
+__all__ = [
+    'get_nhl_team_form',
+]
+
+# Outcome codes, from the team's point of view
+LOSS = 0
+WIN = 1
+OT_LOSS = 2
+# Games could end level until shootouts arrived in 2005-06
+TIE = 3
+OUTCOME_NAMES = {LOSS: "L", WIN: "W", OT_LOSS: "OTL", TIE: "T"}
+PLAYOFFS = 3
+
+def _outcome(scored: int, allowed: int, overtime: bool, game_type: int) -> int:
+    """A team's outcome code; playoff games are played to a winner, so their overtime losses are plain losses."""
+    if scored > allowed:
+        return WIN
+    if scored == allowed:
+        return TIE
+    return OT_LOSS if overtime and game_type != PLAYOFFS else LOSS
+
+class TeamGameMatrix:
+    """
+    A season's completed games as a team x game matrix of small integers.
+
+    Row i holds team teams[i]'s games in date order, left aligned; count[i]
+    says how many of the columns are real games, the rest are padding.
+    Every game appears twice, once from each team's side.
+    """
+
+    __slots__ = ("season", "teams", "index", "count", "game_id", "day", "game_type", "opponent", "home",
+                 "goals_for", "goals_against", "outcome")
+
+    def __init__(self, season: str, games: list):
+        self.season = season
+        rows = {}
+        for game in games:
+            if game.get("gameState") not in FINAL_STATES:
+                continue
+            home, away = game["homeTeam"], game["awayTeam"]
+            overtime = (game.get("gameOutcome") or {}).get("lastPeriodType") in ("OT", "SO")
+            for team, other, is_home in ((home, away, 1), (away, home, 0)):
+                rows.setdefault(team["abbrev"], []).append(
+                    (game["id"], date.fromisoformat(game["gameDate"]).toordinal(), game.get("gameType", 2),
+                     other["abbrev"], is_home, team.get("score", 0), other.get("score", 0), overtime))
+
+        self.teams = sorted(rows)
+        self.index = {abbr: i for i, abbr in enumerate(self.teams)}
+        width = max((len(games) for games in rows.values()), default=0)
+        shape = (len(self.teams), width)
+        self.count = np.zeros(len(self.teams), dtype=np.int16)
+        self.game_id = np.full(shape, -1, dtype=np.int32)
+        self.day = np.full(shape, -1, dtype=np.int32)
+        self.game_type = np.full(shape, -1, dtype=np.int8)
+        self.opponent = np.full(shape, -1, dtype=np.int8)
+        self.home = np.full(shape, -1, dtype=np.int8)
+        self.goals_for = np.full(shape, -1, dtype=np.int16)
+        self.goals_against = np.full(shape, -1, dtype=np.int16)
+        self.outcome = np.full(shape, -1, dtype=np.int8)
+        for abbr, team_games in rows.items():
+            i = self.index[abbr]
+            team_games.sort(key=lambda game: (game[1], game[0]))
+            self.count[i] = len(team_games)
+            for j, (game_id, day, game_type, opponent, is_home, scored, allowed, overtime) in enumerate(team_games):
+                self.game_id[i, j] = game_id
+                self.day[i, j] = day
+                self.game_type[i, j] = game_type
+                self.opponent[i, j] = self.index[opponent]
+                self.home[i, j] = is_home
+                self.goals_for[i, j] = scored
+                self.goals_against[i, j] = allowed
+                self.outcome[i, j] = _outcome(scored, allowed, overtime, game_type)
+
+    def columns(self, abbr: str, game_type: int = None, opponent: str = None, last_n: int = None) -> np.ndarray:
+        """Column indexes of a team's games, optionally of one game type and opponent, last_n most recent."""
+        i = self.index[abbr]
+        mask = np.arange(self.game_id.shape[1]) < self.count[i]
+        if game_type is not None:
+            mask &= self.game_type[i] == game_type
+        if opponent is not None:
+            mask &= self.opponent[i] == self.index.get(opponent, -2)
+        columns = np.flatnonzero(mask)
+        return columns[-last_n:] if last_n else columns
+
+def _record(outcome: np.ndarray, goals_for: np.ndarray, goals_against: np.ndarray) -> dict:
+    wins = int(np.count_nonzero(outcome == WIN))
+    ot_losses = int(np.count_nonzero(outcome == OT_LOSS))
+    ties = int(np.count_nonzero(outcome == TIE))
+    scored, allowed = int(goals_for.sum()), int(goals_against.sum())
+    return {
+        "games": int(outcome.size),
+        "wins": wins,
+        "losses": int(np.count_nonzero(outcome == LOSS)),
+        "ot_losses": ot_losses,
+        "ties": ties,
+        "points": 2 * wins + ot_losses + ties,
+        "goals_for": scored,
+        "goals_against": allowed,
+        "goal_diff": scored - allowed,
+    }
+
+def _streak(outcome: np.ndarray) -> dict | None:
+    """The run of identical results the team is on at the end of outcome."""
+    if not outcome.size:
+        return None
+    breaks = np.flatnonzero(outcome != outcome[-1])
+    length = outcome.size - (breaks[-1] + 1 if breaks.size else 0)
+    return {"type": OUTCOME_NAMES[int(outcome[-1])], "length": int(length)}
+
+@cached("team_matrix", ttl=team_matrix_ttl, shared=False)
+def team_game_matrix(season: str) -> dict:
+    """
+    The season's team x game result matrix, built once from the league season schedule and cached.
+
+    Returns:
+        dict: {"matrix": TeamGameMatrix, "missing_teams": [...]} or error message.
+    """
+    try:
+        schedule = raise_for_error(get_nhl_league_season_schedule(season))
+        return {"matrix": TeamGameMatrix(season, schedule["games"]), "missing_teams": schedule["missing_teams"]}
+    except Exception as e:
+        return error_result(e)
+
+@canonical_arguments(team_abbr=canonical_team, season=canonical_season, opponent_abbr=canonical_team)
+def get_nhl_team_form(team_abbr: str, season: str, last_n: int = None, opponent_abbr: str = None,
+                      game_type: int = 2) -> dict:
+    """
+    Get a team's results over a season: record, home/away splits, current streak,
+    head-to-head records and game-by-game results, in one call.
+
+    Answers come from a cached matrix of every team's completed games (goals
+    for and against, home/away, outcome), so repeated questions about any
+    team in the season cost no further upstream calls.
+
+    Args:
+        team_abbr: Three-letter team abbreviation (e.g., BOS, TOR)
+        season: Season in YYYYYYYY format (e.g., 20232024)
+        last_n: Optional number of most recent games to look at (e.g., 10 for last-10 form)
+        opponent_abbr: Optional opponent abbreviation to look only at games against that team
+        game_type: 2 for the regular season (default), 3 for playoffs, 1 for preseason
+
+    Returns:
+        dict: Record, home and away records, current streak, per-opponent records and the
+              games looked at (oldest first), all over the selected games, or error message.
+    """
+    try:
+        result = raise_for_error(team_game_matrix(season))
+        matrix = result["matrix"]
+        team = team_abbr.upper()
+        if team not in matrix.index:
+            raise ValueError(f"No completed games for {team_abbr} in season {season}")
+        opponent = opponent_abbr.upper() if opponent_abbr else None
+        i = matrix.index[team]
+        columns = matrix.columns(team, game_type, opponent, last_n)
+
+        outcome = matrix.outcome[i, columns]
+        goals_for = matrix.goals_for[i, columns]
+        goals_against = matrix.goals_against[i, columns]
+        home = matrix.home[i, columns] == 1
+        opponents = matrix.opponent[i, columns]
+
+        head_to_head = {}
+        for opponent_index in np.unique(opponents):
+            against = opponents == opponent_index
+            head_to_head[matrix.teams[opponent_index]] = _record(outcome[against], goals_for[against],
+                                                                 goals_against[against])
+
+        games = [
+            {
+                "game_id": int(matrix.game_id[i, j]),
+                "date": date.fromordinal(int(matrix.day[i, j])).isoformat(),
+                "opponent": matrix.teams[matrix.opponent[i, j]],
+                "home": bool(matrix.home[i, j]),
+                "goals_for": int(matrix.goals_for[i, j]),
+                "goals_against": int(matrix.goals_against[i, j]),
+                "result": OUTCOME_NAMES[int(matrix.outcome[i, j])],
+            }
+            for j in columns.tolist()
+        ]
+        return {
+            "team": team,
+            "season": season,
+            "record": _record(outcome, goals_for, goals_against),
+            "home": _record(outcome[home], goals_for[home], goals_against[home]),
+            "away": _record(outcome[~home], goals_for[~home], goals_against[~home]),
+            "streak": _streak(outcome),
+            "head_to_head": head_to_head,
+            "games": games,
+            "missing_teams": result["missing_teams"],
+        }
+    except Exception as e:
+        return error_result(e)
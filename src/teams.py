@@ -1,5 +1,8 @@
+from .arguments import canonical_arguments, canonical_date, canonical_season, canonical_team
 from .client import client
+from .errors import error_result
 
+@canonical_arguments(date=canonical_date)
 def get_nhl_teams(date: str = "now") -> dict:
     """
     Get all NHL teams with conference, division, and franchise information.
@@ -17,8 +20,9 @@ def get_nhl_teams(date: str = "now") -> dict:
         teams = client.teams.teams(date)
         return {"teams": teams}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(team_abbr=canonical_team, season=canonical_season)
 def get_nhl_team_roster(team_abbr: str, season: str) -> dict:
     """
     Get the roster for a specific NHL team and season.
@@ -34,7 +38,7 @@ def get_nhl_team_roster(team_abbr: str, season: str) -> dict:
         roster = client.teams.team_roster(team_abbr, season)
         return {"roster": roster}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
 def get_nhl_franchises() -> dict:
     """
@@ -47,8 +51,9 @@ def get_nhl_franchises() -> dict:
         franchises = client.teams.franchises()
         return {"franchises": franchises}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
 
+@canonical_arguments(date=canonical_date)
 def get_nhl_team_ids(date: str = "now") -> dict:
     """
     Get a mapping of NHL team names to their abbreviations for reference.
@@ -66,4 +71,4 @@ def get_nhl_team_ids(date: str = "now") -> dict:
         team_mapping = {team.get('name', 'Unknown'): team.get('abbr', 'Unknown') for team in teams}
         return {"team_abbreviations": team_mapping}
     except Exception as e:
-        return {"error": str(e)}
+        return error_result(e)
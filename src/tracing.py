@@ -0,0 +1,260 @@
+import atexit
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+import httpx
+
+from . import profiling
+from .errors import error_code
+
+logger = logging.getLogger(__name__)
+
+# Fraction of tool calls traced (0 disables tracing)
+TRACE_RATE = float(os.environ.get("NHL_MCP_TRACE_RATE", 0))
+# OTLP/HTTP JSON traces endpoint of a collector, e.g. http://localhost:4318/v1/traces
+OTLP_ENDPOINT = os.environ.get("NHL_MCP_OTLP_ENDPOINT")
+# File spans are appended to as OTLP JSON lines ("-" for stderr); the default sink
+# when no collector endpoint is set
+TRACE_FILE = os.environ.get("NHL_MCP_TRACE_FILE", "" if OTLP_ENDPOINT else "-")
+SERVICE_NAME = os.environ.get("NHL_MCP_SERVICE_NAME", "nhl-api-mcp")
+# Spans buffered for the exporter; spans are dropped, never waited on, when it is full
+MAX_QUEUED_SPANS = 2048
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 2.0
+
+TRACING_ENABLED = TRACE_RATE > 0
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current = contextvars.ContextVar("nhl_span", default=None)
+
+class Span:
+    """One timed operation of a sampled tool call, exported in OTLP form."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "status", "message")
+
+    def __init__(self, name: str, kind: int, parent=None):
+        self.trace_id = parent.trace_id if parent else random.getrandbits(128)
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = {}
+        self.status = STATUS_OK
+        self.message = None
+
+    def set(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def fail(self, message: str, error_type: str = None) -> None:
+        self.status = STATUS_ERROR
+        self.message = message
+        if error_type:
+            self.attributes["error.type"] = error_type
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        exporter.submit(self)
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": f"{self.trace_id:032x}",
+            "spanId": f"{self.span_id:016x}",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.parent_id is not None:
+            span["parentSpanId"] = f"{self.parent_id:016x}"
+        if self.message:
+            span["status"]["message"] = self.message
+        return span
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+def otlp_request(spans) -> dict:
+    """An OTLP ExportTraceServiceRequest, in its JSON encoding, for spans."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }],
+    }
+
+class SpanExporter:
+    """
+    Exports finished spans from a background thread.
+
+    Submitting a span only puts it on a bounded queue, so a tool call never
+    waits on the sink; when the queue is full the span is dropped and counted.
+    The exporter thread writes spans in batches as OTLP JSON lines to a file
+    (the format of the OpenTelemetry Collector's file receiver and exporter)
+    and/or posts them to an OTLP/HTTP collector endpoint.
+    """
+
+    def __init__(self, maxsize: int = MAX_QUEUED_SPANS):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, span: Span) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every submitted span has been exported."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stats(self) -> dict:
+        return {"exported": self.exported, "dropped": self.dropped, "failed": self.failed,
+                "queued": self._queue.qsize()}
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                self._export(batch)
+                self.exported += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.warning("Span export failed: %s", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _export(self, batch: list) -> None:
+        request = otlp_request(batch)
+        if TRACE_FILE:
+            line = json.dumps(request, separators=(",", ":")) + "\n"
+            if TRACE_FILE == "-":
+                sys.stderr.write(line)
+                sys.stderr.flush()
+            else:
+                with open(TRACE_FILE, "a") as f:
+                    f.write(line)
+        if OTLP_ENDPOINT:
+            httpx.post(OTLP_ENDPOINT, json=request, timeout=5.0).raise_for_status()
+
+exporter = SpanExporter()
+
+def current() -> Span | None:
+    """The span of the traced operation being run, if the tool call is sampled."""
+    return _current.get()
+
+def args_hash(args: tuple, kwargs: dict) -> str:
+    """A short, stable hash of a call's arguments, so calls can be grouped without logging them."""
+    encoded = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+def traced_tool(fn):
+    """
+    Wrap a synchronous MCP tool so sampled calls are traced.
+
+    A sampled call gets a server span (tool name, arguments hash, queue wait,
+    outcome), and every upstream request it makes, on any thread, gets a
+    child client span. Calls that are not sampled pay one random draw. The
+    wrapper keeps fn's name, docstring and signature.
+    """
+    if not TRACING_ENABLED:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if random.random() >= TRACE_RATE:
+            return fn(*args, **kwargs)
+
+        span = Span(fn.__name__, KIND_SERVER)
+        span.set("mcp.tool.name", fn.__name__)
+        span.set("mcp.tool.args_hash", args_hash(args, kwargs))
+        span.set("mcp.tool.queue_ms", round(profiling.queue_wait.get() * 1000, 3))
+        token = _current.set(span)
+        try:
+            result = fn(*args, **kwargs)
+            if isinstance(result, dict) and "error" in result:
+                span.fail(str(result["error"]), result.get("error_code"))
+            return result
+        except Exception as e:
+            span.fail(str(e), error_code(e))
+            raise
+        finally:
+            _current.reset(token)
+            span.end()
+
+    return wrapper
+
+@contextlib.contextmanager
+def upstream_span(url: str):
+    """
+    A client span for one upstream GET, when the tool call is sampled.
+
+    Yields the span (None when not tracing) for the caller to set the
+    response status, size and retry count on.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    span = Span("GET", KIND_CLIENT, parent)
+    span.set("http.request.method", "GET")
+    span.set("url.full", url)
+    try:
+        yield span
+    except Exception as e:
+        span.fail(str(e), error_code(e))
+        raise
+    finally:
+        span.end()
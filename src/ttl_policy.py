@@ -0,0 +1,299 @@
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+from .errors import error_result
+from .nhl_time import NHL_TIMEZONE, nhl_date
+
+# Cache lifetimes, in seconds, for data touched by each team state
+LIVE_TTL = 60
+RECENTLY_FINAL_TTL = 5 * 60
+GAME_DAY_TTL = 30 * 60
+IDLE_TTL = 6 * 60 * 60
+# Data for seasons that are over no longer changes
+FROZEN_TTL = 24 * 60 * 60
+# Used when the schedule itself cannot be read
+FALLBACK_TTL = 5 * 60
+
+# How a game's window is laid out around its start time
+PREGAME_WINDOW = timedelta(minutes=30)
+GAME_LENGTH = timedelta(hours=3)
+RECENTLY_FINAL_WINDOW = timedelta(hours=2)
+
+# How often the policy re-reads the schedule
+ACTIVE_REFRESH = 60
+IDLE_REFRESH = 15 * 60
+
+LIVE_STATES = {"LIVE", "CRIT"}
+FINAL_STATES = {"FINAL", "OFF"}
+
+# Most urgent first; a team or the league takes the most urgent state of its games
+STATES = ("live", "recently_final", "upcoming", "idle")
+STATE_TTLS = {"live": LIVE_TTL, "recently_final": RECENTLY_FINAL_TTL, "upcoming": GAME_DAY_TTL, "idle": IDLE_TTL}
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def _game_state(game: dict, now: datetime) -> str:
+    """Where a game is in its window: live, recently_final, upcoming or idle (done)."""
+    start = _parse_time(game["startTimeUTC"])
+    state = game.get("gameState", "")
+    if state in LIVE_STATES or (state not in FINAL_STATES and start - PREGAME_WINDOW <= now < start + GAME_LENGTH):
+        return "live"
+    if state in FINAL_STATES or now >= start + GAME_LENGTH:
+        return "recently_final" if now < start + GAME_LENGTH + RECENTLY_FINAL_WINDOW else "idle"
+    return "upcoming"
+
+def _most_urgent(states) -> str:
+    return min(states, key=STATES.index, default="idle")
+
+def season_is_over(season, now: datetime) -> bool:
+    """Whether a YYYYYYYY season ended before the current NHL date (seasons end by July)."""
+    try:
+        end_year = int(str(season)[4:8])
+    except ValueError:
+        return False
+    return now.astimezone(NHL_TIMEZONE).date() > datetime(end_year, 7, 1).date()
+
+class TTLPolicy:
+    """
+    Cache TTLs driven by the NHL schedule.
+
+    The policy reads yesterday's and today's daily schedules and today's
+    calendar schedule to place every team in a game window: live (or about to
+    start), recently final, playing later today, or idle. Data for a team is
+    refreshed aggressively only while the team is live or recently final, and
+    barely at all otherwise. The schedule itself is re-read every minute while
+    games are on and every fifteen minutes otherwise.
+
+    Args:
+        clock: Returns the current time as an aware datetime. Defaults to UTC now.
+    """
+
+    def __init__(self, clock=None):
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._snapshot = None
+        self._pending = None         # Future of the refresh in progress
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Forget the current snapshot so the next lookup re-reads the schedule."""
+        with self._lock:
+            self._snapshot = None
+            self._pending = None
+            self._generation += 1
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the schedule has been read successfully at least once since the last reset."""
+        snapshot = self._snapshot
+        return snapshot is not None and "error" not in snapshot
+
+    def snapshot(self) -> dict:
+        """
+        The current game windows and team states, refreshed when stale.
+
+        The schedule is read without holding the lock, by one caller at a time;
+        others are served the stale snapshot meanwhile, or wait for the first one.
+        """
+        now = self._clock()
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and now < snapshot["_refresh_at"]:
+                return snapshot
+            pending, generation = self._pending, self._generation
+            owner = pending is None
+            if owner:
+                pending = self._pending = Future()
+        if not owner:
+            return snapshot if snapshot is not None else pending.result()
+
+        try:
+            snapshot = self._build(now)
+        except BaseException as e:
+            with self._lock:
+                if self._pending is pending:
+                    self._pending = None
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            if self._generation == generation:
+                self._snapshot = snapshot
+            if self._pending is pending:
+                self._pending = None
+        pending.set_result(snapshot)
+        return snapshot
+
+    def ttl(self, team_abbrs=(), season=None) -> float:
+        """
+        Cache TTL for data about the given teams (or the whole league) and season.
+
+        Args:
+            team_abbrs: Team abbreviations the data depends on. Empty means league-wide.
+            season: Optional YYYYYYYY season the data belongs to.
+
+        Returns:
+            float: Seconds the data may be cached.
+        """
+        now = self._clock()
+        if season and season_is_over(season, now):
+            return FROZEN_TTL
+        snapshot = self.snapshot()
+        if snapshot["league_state"] == "unknown":
+            return FALLBACK_TTL
+        teams = snapshot["teams"]
+        team_abbrs = [abbr.upper() for abbr in team_abbrs if abbr]
+        state = _most_urgent(teams.get(abbr, "idle") for abbr in team_abbrs) if team_abbrs \
+            else snapshot["league_state"]
+        ttl = STATE_TTLS[state]
+        # Never hold data past the point where one of its games goes live
+        next_window = snapshot["next_window"]
+        if state != "live" and next_window is not None:
+            ttl = min(ttl, max((next_window - now).total_seconds(), LIVE_TTL))
+        return ttl
+
+    def _build(self, now: datetime) -> dict:
+        from .schedule import get_nhl_calendar_schedule, get_nhl_daily_schedule
+
+        today = now.astimezone(NHL_TIMEZONE).date()
+        try:
+            games = {}
+            for day in (today - timedelta(days=1), today):
+                result = get_nhl_daily_schedule(day.isoformat())
+                if "error" in result:
+                    raise ValueError(result["error"])
+                for game in result["schedule"].get("games", []):
+                    games[game["id"]] = game
+            calendar = get_nhl_calendar_schedule(today.isoformat())
+            if "error" in calendar:
+                raise ValueError(calendar["error"])
+            teams = {team["abbrev"]: "idle" for team in calendar["schedule"].get("teams", [])}
+
+            windows = []
+            for game in games.values():
+                state = _game_state(game, now)
+                home, away = game["homeTeam"]["abbrev"], game["awayTeam"]["abbrev"]
+                for abbr in (home, away):
+                    teams[abbr] = _most_urgent((teams.get(abbr, "idle"), state))
+                windows.append({
+                    "game_id": game["id"],
+                    "teams": [away, home],
+                    "start": game["startTimeUTC"],
+                    "state": state,
+                })
+        except Exception as e:
+            return {
+                "league_state": "unknown",
+                "teams": {},
+                "windows": [],
+                "next_window": None,
+                "error": str(e),
+                "generated_at": now,
+                "_refresh_at": now + timedelta(seconds=ACTIVE_REFRESH),
+            }
+
+        league_state = _most_urgent(teams.values())
+        upcoming = [_parse_time(w["start"]) - PREGAME_WINDOW for w in windows if w["state"] == "upcoming"]
+        next_window = min(upcoming, default=None)
+        refresh = ACTIVE_REFRESH if league_state in ("live", "recently_final") else IDLE_REFRESH
+        refresh_at = now + timedelta(seconds=refresh)
+        if next_window is not None:
+            refresh_at = min(refresh_at, max(next_window, now + timedelta(seconds=ACTIVE_REFRESH)))
+        return {
+            "league_state": league_state,
+            "teams": teams,
+            "windows": sorted(windows, key=lambda w: w["start"]),
+            "next_window": next_window,
+            "generated_at": now,
+            "_refresh_at": refresh_at,
+        }
+
+policy = TTLPolicy()
+
+# TTL callables for src.cache.cached, taking (arguments, result)
+
+def standings_ttl(arguments: dict, result: dict) -> float:
+    date = arguments.get("date")
+    if date and date != "now":
+        # Standings as of a past NHL date never change
+        if date < nhl_date(policy._clock()).isoformat():
+            return FROZEN_TTL
+    return policy.ttl(season=arguments.get("season"))
+
+def directory_ttl(arguments: dict, result: dict) -> float:
+    # A team's directory gains a game type when its preseason, season or playoffs start
+    return policy.ttl(team_abbrs=[arguments.get("team_abbr")])
+
+def player_stats_ttl(arguments: dict, result: dict) -> float:
+    team = result.get("player_stats", {}).get("currentTeamAbbrev")
+    return policy.ttl(team_abbrs=[team] if team else ())
+
+def game_log_ttl(arguments: dict, result: dict) -> float:
+    rows = result.get("game_log") or []
+    team = rows[0].get("teamAbbrev") if rows else None
+    return policy.ttl(team_abbrs=[team] if team else (), season=arguments.get("season_id"))
+
+def stats_summary_ttl(arguments: dict, result: dict) -> float:
+    return policy.ttl(season=arguments.get("end_season") or arguments.get("start_season"))
+
+def season_stats_ttl(arguments: dict, result: dict) -> float:
+    return policy.ttl(season=arguments.get("season"))
+
+def team_matrix_ttl(arguments: dict, result: dict) -> float:
+    if result.get("missing_teams"):
+        # Retry soon for the teams that failed to load
+        return FALLBACK_TTL
+    return policy.ttl(season=arguments.get("season"))
+
+def playoff_ttl(arguments: dict, result: dict) -> float:
+    season = arguments.get("season")
+    if not season and arguments.get("year"):
+        season = f"{int(arguments['year']) - 1}{arguments['year']}"
+    return policy.ttl(season=season)
+
+def playoff_series_ttl(arguments: dict, result: dict):
+    schedule = result.get("series_schedule") or {}
+    seeds = [schedule.get("topSeedTeam") or {}, schedule.get("bottomSeedTeam") or {}]
+    if max(seed.get("seriesWins", 0) for seed in seeds) >= schedule.get("neededToWin", 4):
+        # A decided series never changes again
+        return None
+    return policy.ttl(team_abbrs=[seed.get("abbrev") for seed in seeds], season=arguments.get("season"))
+
+def get_nhl_cache_ttl_policy(team_abbr: str = None) -> dict:
+    """
+    Inspect the game-day cache TTL policy.
+
+    Shows the game windows read from the schedule, each team's state and the
+    TTL currently applied to cached standings, game logs and stats.
+
+    Args:
+        team_abbr: Optional team abbreviation to show only that team's state and TTL.
+
+    Returns:
+        dict: League state, per-team states and TTLs, game windows and cache statistics,
+              or error message.
+    """
+    try:
+        from .cache import cache_stats
+        from .remote_cache import shared_cache
+
+        snapshot = policy.snapshot()
+        teams = snapshot["teams"]
+        if team_abbr:
+            teams = {team_abbr.upper(): teams.get(team_abbr.upper(), "idle")}
+        next_window = snapshot["next_window"]
+        return {
+            "league_state": snapshot["league_state"],
+            "league_ttl": policy.ttl(),
+            "teams": {abbr: {"state": state, "ttl": policy.ttl(team_abbrs=[abbr])}
+                      for abbr, state in sorted(teams.items())},
+            "windows": snapshot["windows"],
+            "next_window": next_window.isoformat() if next_window else None,
+            "generated_at": snapshot["generated_at"].isoformat(),
+            "schedule_error": snapshot.get("error"),
+            "caches": cache_stats(),
+            "shared_cache": shared_cache.stats(),
+        }
+    except Exception as e:
+        return error_result(e)
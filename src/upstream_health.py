@@ -0,0 +1,52 @@
+import os
+import threading
+import time
+from collections import deque
+
+# Seconds of upstream outcomes readiness looks back over
+WINDOW = float(os.environ.get("NHL_MCP_UPSTREAM_HEALTH_WINDOW", 60))
+# Outcomes needed in the window before an error rate counts
+MIN_SAMPLES = 5
+# Outcomes kept per endpoint family
+MAX_SAMPLES = 1000
+
+class UpstreamHealth:
+    """
+    Recent upstream request outcomes per endpoint family (web, stats, core).
+
+    Every attempt counts, retries included; a failure is a timeout, a
+    connection error, a 429 or a 5xx. Client errors such as 404 are answers,
+    not failures.
+    """
+
+    def __init__(self, window: float = WINDOW, clock=time.monotonic):
+        self.window = window
+        self._clock = clock
+        self._outcomes = {}
+        self._lock = threading.Lock()
+
+    def record(self, family: str, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.setdefault(family, deque(maxlen=MAX_SAMPLES)).append((self._clock(), ok))
+
+    def rates(self) -> dict:
+        """Requests, errors and error rate per family over the window."""
+        cutoff = self._clock() - self.window
+        result = {}
+        with self._lock:
+            for family, outcomes in sorted(self._outcomes.items()):
+                while outcomes and outcomes[0][0] < cutoff:
+                    outcomes.popleft()
+                errors = sum(1 for _, ok in outcomes if not ok)
+                result[family] = {
+                    "requests": len(outcomes),
+                    "errors": errors,
+                    "error_rate": round(errors / len(outcomes), 3) if outcomes else 0.0,
+                }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._outcomes.clear()
+
+upstream_health = UpstreamHealth()
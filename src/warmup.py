@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from nhlpy.http_client import Endpoint
+
+from .client import http_client
+from .parallel import fetch_concurrently
+from .ttl_policy import policy
+
+# Pooled connections opened per upstream host at startup (0 disables warm-up)
+WARM_CONNECTIONS = int(os.environ.get("NHL_MCP_WARM_CONNECTIONS", 2))
+# Seconds between re-warming the pool so idle connections are not dropped (0 disables)
+KEEP_WARM_INTERVAL = float(os.environ.get("NHL_MCP_KEEP_WARM_INTERVAL", 60))
+
+def upstream_hosts() -> list:
+    """One base URL per NHL host the client talks to."""
+    hosts = {}
+    for endpoint in Endpoint:
+        parts = urlsplit(endpoint.value)
+        hosts.setdefault(parts.netloc, f"{parts.scheme}://{parts.netloc}/")
+    return list(hosts.values())
+
+class Warmer:
+    """
+    Opens pooled upstream connections before traffic arrives, and keeps them open.
+
+    At start, connections concurrent requests are made to each upstream host,
+    so that many connections are resolved, handshaken and left in the pool.
+    The pool is then re-warmed every interval seconds, which keeps idle
+    connections from expiring between bursts. Each warm-up also calls prime,
+    if given, to load the data most calls depend on. Failures are reported but
+    do not stop the warmer becoming ready; upstream health is judged elsewhere.
+
+    Args:
+        client: The ResilientHttpClient whose pool to warm.
+        connections: Connections to open per host. 0 makes the warmer ready at once.
+        interval: Seconds between re-warms. 0 warms only once.
+        prime: Optional callable run after each warm-up to fill caches.
+    """
+
+    def __init__(self, client=None, connections: int = WARM_CONNECTIONS, interval: float = KEEP_WARM_INTERVAL,
+                 prime=None):
+        self._client = client or http_client
+        self.connections = connections
+        self.interval = interval
+        self.prime = prime
+        self.prime_error = None
+        self.hosts = {}
+        self.warmed_at = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        if connections <= 0:
+            self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self) -> None:
+        """Warm the pool on a background thread; ready turns True once the first warm-up is done."""
+        if self._thread is None and (self.connections > 0 or self.prime is not None):
+            self._thread = threading.Thread(target=self._run, name="upstream-warmup", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def warm(self) -> dict:
+        """Open connections to every upstream host concurrently; returns the per-host status."""
+        def warm_host(url):
+            started = time.perf_counter()
+            results = fetch_concurrently(self._warm_one, [url] * self.connections)
+            errors = [result for result in results if result is not None]
+            return {
+                "connections": len(results) - len(errors),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "error": errors[0] if errors else None,
+            }
+
+        urls = upstream_hosts() if self.connections > 0 else []
+        self.hosts = dict(zip(urls, fetch_concurrently(warm_host, urls)))
+        if self.prime is not None:
+            try:
+                self.prime()
+                self.prime_error = None
+            except Exception as e:
+                self.prime_error = str(e)
+        self.warmed_at = time.time()
+        return self.hosts
+
+    def _warm_one(self, url: str):
+        try:
+            self._client.warm(url)
+        except Exception as e:
+            return str(e) or type(e).__name__
+        return None
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "connections_per_host": self.connections,
+            "warmed_at": self.warmed_at,
+            "hosts": self.hosts,
+            "prime_error": self.prime_error,
+        }
+
+    def _run(self) -> None:
+        try:
+            self.warm()
+        finally:
+            self._ready.set()
+        while self.interval > 0 and not self._stop.wait(self.interval):
+            self.warm()
+
+# Reading the TTL policy's snapshot loads yesterday's and today's games into the game store
+warmer = Warmer(prime=policy.snapshot)
@@ -47,7 +47,44 @@ def mock_nhl_client():
                     with patch('src.standings.client', mock_client):
                         # Also patch the client in the stats module
                         with patch('src.stats.client', mock_client):
-                            yield mock_client
+                            # Also patch the client used by the pass-through tools
+                            with patch('src.passthrough.client', mock_client):
+                                # Also patch the client used by the game store
+                                with patch('src.game_store.client', mock_client):
+                                    # Also patch the client used for per-season stats tables
+                                    with patch('src.aggregates.client', mock_client):
+                                        # Also patch the client used by the prospect index
+                                        with patch('src.prospects.client', mock_client):
+                                            # Also patch the client used by the roster tracker
+                                            with patch('src.roster_tracker.client', mock_client):
+                                                yield mock_client
+
+@pytest.fixture(autouse=True)
+def clear_nhl_caches():
+    """
+    Start every test with empty caches, an empty game store, prospect index, roster tracker and resource store
+    and a fresh TTL policy, so cached results never leak from one test's mocks into another.
+    """
+    from src.cache import clear_caches
+    from src.game_store import store
+    from src.prospects import index
+    from src.resources import store as resource_store
+    from src.roster_tracker import tracker
+    from src.ttl_policy import policy
+
+    clear_caches()
+    store.clear()
+    index.reset()
+    tracker.reset()
+    resource_store.reset()
+    policy.reset()
+    yield
+    clear_caches()
+    store.clear()
+    index.reset()
+    tracker.reset()
+    resource_store.reset()
+    policy.reset()
 
 @pytest.fixture
 def mock_teams(mock_nhl_client):
@@ -0,0 +1,110 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import aggregates
+from src.aggregates import aggregate_seasons, season_range
+
+
+def _skater(player_id, season, games, goals, assists, shots, team="BOS", toi=1000.0):
+    return {"playerId": player_id, "seasonId": int(season), "skaterFullName": f"Player {player_id}",
+            "teamAbbrevs": team, "gamesPlayed": games, "goals": goals, "assists": assists,
+            "points": goals + assists, "shots": shots, "timeOnIcePerGame": toi, "pointsPerGame": 0.0}
+
+
+SKATERS = {
+    "20212022": [_skater(1, "20212022", 80, 30, 30, 200), _skater(2, "20212022", 82, 10, 20, 100)],
+    "20222023": [_skater(1, "20222023", 20, 10, 10, 50, team="TOR", toi=1500.0),
+                 _skater(2, "20222023", 82, 25, 30, 150)],
+    "20232024": [_skater(2, "20232024", 82, 20, 20, 120), _skater(3, "20232024", 10, 1, 1, 10)],
+}
+
+
+@pytest.fixture
+def skater_seasons(mock_stats):
+    mock_stats.skater_stats_summary.side_effect = \
+        lambda start_season, start, limit, **kwargs: SKATERS.get(start_season, [])[start:start + limit]
+    return mock_stats
+
+
+class TestSeasonAggregates:
+
+    def test_season_range(self):
+        assert season_range("20202021", "20222023") == ["20202021", "20212022", "20222023"]
+        assert season_range("20032004", "20052006") == ["20032004", "20052006"]
+        with pytest.raises(ValueError):
+            season_range("20232024", "20202021")
+
+    def test_sums_counts_and_recomputes_rates(self, skater_seasons):
+        rows = aggregate_seasons("skater", "20212022", "20232024")
+
+        assert [row["playerId"] for row in rows] == [2, 1, 3]
+        first = rows[1]
+        assert first["gamesPlayed"] == 100
+        assert first["points"] == 80
+        assert first["pointsPerGame"] == pytest.approx(0.8)
+        assert first["shootingPct"] == pytest.approx(40 / 250)
+        assert first["timeOnIcePerGame"] == pytest.approx((80 * 1000 + 20 * 1500) / 100)
+        # Descriptive columns from the latest season, teams from the whole range
+        assert first["teamAbbrevs"] == "BOS,TOR"
+        assert "seasonId" not in first
+        # Columns missing from every season stay missing
+        assert first["plusMinus"] is None
+
+    def test_paging_follows_upstream_order(self, skater_seasons):
+        assert [row["playerId"] for row in aggregate_seasons("skater", "20212022", "20232024", start=1, limit=1)] == [1]
+
+    def test_overlapping_ranges_reuse_cached_seasons(self, skater_seasons):
+        aggregate_seasons("skater", "20212022", "20222023")
+        assert skater_seasons.skater_stats_summary.call_count == 2
+
+        aggregate_seasons("skater", "20222023", "20232024")
+        assert skater_seasons.skater_stats_summary.call_count == 3
+
+        aggregate_seasons("skater", "20212022", "20232024")
+        assert skater_seasons.skater_stats_summary.call_count == 3
+
+    def test_large_seasons_are_read_page_by_page(self, mock_stats, monkeypatch):
+        monkeypatch.setattr(aggregates, "PAGE_SIZE", 2)
+        rows = [{"teamId": i, "teamFullName": f"Team {i}", "gamesPlayed": 82, "points": 90 + i, "wins": 40}
+                for i in range(5)]
+        mock_stats.team_summary.side_effect = lambda start, limit, **kwargs: rows[start:start + limit]
+
+        result = aggregate_seasons("team", "20232024", limit=10)
+
+        assert mock_stats.team_summary.call_count == 3
+        assert [row["teamId"] for row in result] == [4, 3, 2, 1, 0]
+        assert result[0]["pointPct"] == pytest.approx(94 / 164)
+
+    def test_stats_functions_aggregate_locally(self, skater_seasons, mock_stats):
+        from src import get_nhl_goalie_stats_summary, get_nhl_skater_stats_summary
+
+        mock_stats.goalie_stats_summary.return_value = [
+            {"playerId": 9, "goalieFullName": "Goalie", "gamesPlayed": 50, "wins": 30, "saves": 1300,
+             "shotsAgainst": 1400, "goalsAgainst": 100, "timeOnIce": 180000, "seasonId": 20232024}]
+
+        skaters = get_nhl_skater_stats_summary("20212022", "20232024", aggregate=True, limit=1)
+        goalies = get_nhl_goalie_stats_summary("20222023", "20232024", aggregate=True)
+
+        assert skaters == {"skater_stats": [aggregate_seasons("skater", "20212022", "20232024", limit=1)[0]]}
+        assert goalies["goalie_stats"][0]["wins"] == 60
+        assert goalies["goalie_stats"][0]["savePct"] == pytest.approx(2600 / 2800)
+        assert goalies["goalie_stats"][0]["goalsAgainstAverage"] == pytest.approx(200 * 3600 / 360000)
+        for call in skater_seasons.skater_stats_summary.call_args_list:
+            assert call.kwargs["aggregate"] is False
+
+    def test_upstream_errors_are_returned(self, mock_stats):
+        from src import get_nhl_team_summary_stats
+
+        mock_stats.team_summary.side_effect = Exception("Team summary API error")
+
+        result = get_nhl_team_summary_stats("20222023", "20232024", is_aggregate=True)
+
+        assert result["error"] == "Team summary API error"
+        assert result["error_code"] == "internal"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arguments import (canonical_arguments, canonical_date, canonical_month, canonical_season, canonical_team,
+                           canonical_year)
+from src.nhl_time import nhl_date
+
+
+class TestCanonicalValues:
+
+    def test_nhl_date_rolls_over_at_noon_eastern(self):
+        # 11:59 and 12:00 EST on 2024-01-16
+        assert nhl_date(datetime(2024, 1, 16, 16, 59, tzinfo=timezone.utc)).isoformat() == "2024-01-15"
+        assert nhl_date(datetime(2024, 1, 16, 17, 0, tzinfo=timezone.utc)).isoformat() == "2024-01-16"
+        # Noon is an hour earlier in UTC under daylight saving time
+        assert nhl_date(datetime(2024, 10, 16, 15, 59, tzinfo=timezone.utc)).isoformat() == "2024-10-15"
+        assert nhl_date(datetime(2024, 10, 16, 16, 0, tzinfo=timezone.utc)).isoformat() == "2024-10-16"
+
+    def test_now_is_the_nhl_date(self):
+        with patch('src.nhl_time.utc_now', return_value=datetime(2024, 1, 16, 14, 0, tzinfo=timezone.utc)):
+            assert canonical_date("now") == canonical_date(None) == canonical_date(" NOW ") == "2024-01-15"
+            assert canonical_month(None) == "2024-01"
+
+    def test_dates_months_teams_and_years(self):
+        assert canonical_date("2024-1-5") == "2024-01-05"
+        assert canonical_month("2024-1") == "2024-01"
+        assert canonical_team(" bos ") == "BOS"
+        assert canonical_team(None) is None
+        assert canonical_year(2024) == "2024"
+        with pytest.raises(ValueError, match="Invalid date format"):
+            canonical_date("15/01/2024")
+        with pytest.raises(ValueError):
+            canonical_year("24")
+
+    def test_seasons(self):
+        assert canonical_season(20232024) == canonical_season("2023-2024") == canonical_season("2023-24") == "20232024"
+        assert canonical_season("1999-00") == "19992000"
+        assert canonical_season(None) is None
+        for invalid in ("20232025", "2023", "99999999", "season"):
+            with pytest.raises(ValueError, match="Invalid Season Id"):
+                canonical_season(invalid)
+
+
+class TestCanonicalArguments:
+
+    def test_arguments_are_rewritten_before_the_call(self):
+        @canonical_arguments(team_abbr=canonical_team, season=canonical_season)
+        def tool(team_abbr: str, season: str = None) -> dict:
+            return {"team": team_abbr, "season": season}
+
+        assert tool("tor", season=20232024) == {"team": "TOR", "season": "20232024"}
+        assert tool(team_abbr="tor") == {"team": "TOR", "season": None}
+        assert tool("tor", "2023-25")["error_code"] == "invalid_argument"
+
+    def test_equivalent_calls_share_one_cache_entry(self, mock_schedule, mock_players):
+        mock_schedule.playoff_bracket.return_value = {"series": []}
+        mock_players.players_by_team.return_value = {"forwards": []}
+        from src import get_nhl_playoff_bracket, get_nhl_players_by_team
+
+        get_nhl_playoff_bracket("2024")
+        get_nhl_playoff_bracket(2024)
+        get_nhl_players_by_team("bos", "2023-24")
+
+        mock_schedule.playoff_bracket.assert_called_once_with("2024")
+        mock_players.players_by_team.assert_called_once_with("BOS", "20232024")
+
+    def test_invalid_season_is_rejected_without_an_upstream_call(self, mock_teams):
+        from src import get_nhl_team_roster
+
+        result = get_nhl_team_roster("BOS", "2023")
+
+        assert result["error_code"] == "invalid_argument"
+        mock_teams.team_roster.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache import TTLCache, cache_stats, cached, clear_caches
+
+
+class TestCache:
+
+    def test_ttl_cache_expires_entries(self):
+        cache = TTLCache()
+        
+        with patch('src.cache.time.monotonic', return_value=100.0):
+            cache.set("key", {"value": 1}, ttl=10)
+            assert cache.get("key") == (True, {"value": 1})
+        with patch('src.cache.time.monotonic', return_value=111.0):
+            assert cache.get("key") == (False, None)
+        assert len(cache) == 0
+    
+    def test_ttl_cache_none_ttl_keeps_entry_and_zero_skips_it(self):
+        cache = TTLCache()
+        
+        cache.set("forever", 1, ttl=None)
+        cache.set("never", 2, ttl=0)
+        
+        assert cache.get("forever") == (True, 1)
+        assert cache.get("never") == (False, None)
+    
+    def test_ttl_cache_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("a") == (True, 1)
+        assert cache.get("b") == (False, None)
+        assert cache.get("c") == (True, 3)
+    
+    def test_cached_shares_entries_between_call_forms(self):
+        fetch = Mock(return_value={"games": []})
+        
+        @cached("test_call_forms", ttl=60)
+        def get_games(team_abbr: str, season: str = "20232024") -> dict:
+            return fetch(team_abbr, season)
+        
+        get_games("BOS")
+        get_games("BOS", "20232024")
+        get_games(team_abbr="BOS", season="20232024")
+        get_games("TOR")
+        
+        assert fetch.call_count == 2
+        assert cache_stats()["test_call_forms"] == {"entries": 2, "hits": 2, "misses": 2}
+    
+    def test_cached_skips_errors(self):
+        fetch = Mock(side_effect=[{"error": "API Error"}, {"games": []}])
+        
+        @cached("test_errors", ttl=60)
+        def get_games(team_abbr: str) -> dict:
+            return fetch(team_abbr)
+        
+        assert get_games("BOS") == {"error": "API Error"}
+        assert get_games("BOS") == {"games": []}
+        assert get_games("BOS") == {"games": []}
+        assert fetch.call_count == 2
+    
+    def test_cached_ttl_callable_sees_arguments_and_result(self):
+        ttl = Mock(return_value=60)
+        
+        @cached("test_ttl_callable", ttl=ttl)
+        def get_games(team_abbr: str, season: str = "20232024") -> dict:
+            return {"games": [1]}
+        
+        get_games("BOS")
+        
+        ttl.assert_called_once_with({"team_abbr": "BOS", "season": "20232024"}, {"games": [1]})
+    
+    def test_clear_caches(self):
+        fetch = Mock(return_value={"games": []})
+        
+        @cached("test_clear", ttl=None)
+        def get_games() -> dict:
+            return fetch()
+        
+        get_games()
+        clear_caches()
+        get_games()
+        
+        assert fetch.call_count == 2
+    
+    def test_standings_are_cached(self, mock_standings):
+        mock_standings.league_standings.return_value = {"standings": []}
+        
+        from src import get_nhl_standings
+        get_nhl_standings(date="2024-01-15")
+        get_nhl_standings("2024-01-15")
+        
+        mock_standings.league_standings.assert_called_once_with("2024-01-15")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,177 @@
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nhlpy.http_client import Endpoint, ResourceNotFoundException, ServerErrorException
+from nhlpy.config import ClientConfig
+
+from src import deadline
+from src.client import BACKOFF_BASE, DEFAULT_TIMEOUT, MAX_RETRIES, ResilientHttpClient, endpoint_timeout
+from src.errors import error_result
+from src.sessions import _current_usage, fair_share_tool, reset_usage, session_usage
+
+
+@pytest.fixture
+def upstream():
+    """Route the resilient client's requests to a handler; records (url, timeout) per attempt."""
+    attempts = []
+    responses = []
+    real_client = httpx.Client
+
+    def handler(request):
+        attempts.append((str(request.url), request.extensions["timeout"]["read"]))
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def make_client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch('src.client.httpx.Client', make_client), patch('src.client.time.sleep') as sleep:
+        yield responses, attempts, sleep
+    reset_usage()
+
+
+def _http_client():
+    return ResilientHttpClient(ClientConfig())
+
+
+class TestResilientHttpClient:
+
+    def test_requests_share_one_pooled_client(self, upstream):
+        responses, attempts, _ = upstream
+        responses += [httpx.Response(200, json={}), httpx.Response(200, json={})]
+        http_client = _http_client()
+
+        with patch('src.client.httpx.Client', wraps=httpx.Client) as make_client:
+            http_client.get(Endpoint.API_WEB_V1, "schedule/2024-01-15")
+            http_client.get(Endpoint.API_STATS, "en/team")
+        http_client.close()
+
+        assert make_client.call_count == 1
+        assert len(attempts) == 2
+
+    def test_retries_5xx_then_succeeds(self, upstream):
+        responses, attempts, sleep = upstream
+        responses += [httpx.Response(503), httpx.Response(200, json={"ok": True})]
+
+        response = _http_client().get(Endpoint.API_WEB_V1, "schedule/2024-01-15")
+
+        assert response.json() == {"ok": True}
+        assert len(attempts) == 2
+        assert sleep.call_count == 1
+        assert 0 <= sleep.call_args.args[0] <= BACKOFF_BASE * 2
+
+    def test_gives_up_after_max_retries(self, upstream):
+        responses, attempts, _ = upstream
+        responses += [httpx.Response(500)] * (MAX_RETRIES + 1)
+
+        with pytest.raises(ServerErrorException):
+            _http_client().get(Endpoint.API_WEB_V1, "schedule/2024-01-15")
+        assert len(attempts) == MAX_RETRIES + 1
+
+    def test_not_found_is_not_retried(self, upstream):
+        responses, attempts, sleep = upstream
+        responses += [httpx.Response(404)]
+
+        with pytest.raises(ResourceNotFoundException):
+            _http_client().get(Endpoint.API_WEB_V1, "player/1/landing")
+        assert len(attempts) == 1
+        sleep.assert_not_called()
+
+    def test_throttling_honours_retry_after(self, upstream):
+        responses, _, sleep = upstream
+        responses += [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200, json={})]
+
+        _http_client().get(Endpoint.API_WEB_V1, "standings/now")
+
+        sleep.assert_called_once_with(2.0)
+
+    def test_timeouts_are_retried_and_typed(self, upstream):
+        responses, attempts, _ = upstream
+        responses += [httpx.ReadTimeout("slow")] * (MAX_RETRIES + 1)
+
+        with pytest.raises(httpx.TimeoutException) as raised:
+            _http_client().get(Endpoint.API_STATS, "en/skater/summary")
+        assert len(attempts) == MAX_RETRIES + 1
+        assert error_result(raised.value)["error_code"] == "timeout"
+        assert error_result(raised.value)["retryable"] is True
+
+    def test_per_endpoint_timeouts(self, upstream):
+        responses, attempts, _ = upstream
+        responses += [httpx.Response(200, json={}), httpx.Response(200, json={})]
+
+        _http_client().get(Endpoint.API_STATS, "en/skater/summary?limit=25")
+        _http_client().get(Endpoint.API_WEB_V1, "roster/BOS/20232024")
+
+        assert [timeout for _, timeout in attempts] == [20.0, DEFAULT_TIMEOUT]
+        assert endpoint_timeout("schedule/now") == 8.0
+
+    def test_deadline_caps_timeout_and_stops_retries(self, upstream):
+        responses, attempts, sleep = upstream
+        responses += [httpx.Response(503, headers={"Retry-After": "5"})]
+
+        with deadline.deadline(1.0):
+            with pytest.raises(ServerErrorException):
+                _http_client().get(Endpoint.API_WEB_V1, "schedule/now")
+
+        assert attempts[0][1] <= 1.0
+        sleep.assert_not_called()
+
+    def test_expired_deadline_fails_fast(self, upstream):
+        _, attempts, _ = upstream
+
+        with deadline.deadline(0):
+            with pytest.raises(TimeoutError) as raised:
+                _http_client().get(Endpoint.API_WEB_V1, "schedule/now")
+
+        assert attempts == []
+        assert error_result(raised.value)["error_code"] == "timeout"
+
+    def test_every_response_is_charged_to_the_session(self, upstream):
+        responses, _, _ = upstream
+        responses += [httpx.Response(502), httpx.Response(200, content=b'{"a": 1}')]
+        usage = session_usage("session-2")
+
+        token = _current_usage.set(usage)
+        try:
+            _http_client().get(Endpoint.API_WEB_V1, "schedule/now")
+        finally:
+            _current_usage.reset(token)
+
+        assert usage.upstream_calls == 2
+        assert usage.upstream_bytes == 8
+
+    def test_tool_calls_run_under_the_request_deadline(self):
+        wrapped = fair_share_tool(lambda: deadline.remaining())
+
+        remaining = asyncio.run(wrapped())
+
+        assert remaining is not None and 0 < remaining <= deadline.REQUEST_BUDGET
+
+
+class TestErrorModel:
+
+    def test_tool_errors_carry_typed_codes(self, mock_stats):
+        mock_stats.player_career_stats.side_effect = ResourceNotFoundException("Request to player/1/landing failed")
+
+        from src import get_nhl_player_career_stats
+        result = get_nhl_player_career_stats("1")
+
+        assert result == {"error": "Request to player/1/landing failed", "error_code": "not_found",
+                          "retryable": False}
+
+    def test_upstream_failure_codes_survive_composite_tools(self, mock_standings):
+        mock_standings.season_standing_manifest.side_effect = ServerErrorException("Upstream down", 503)
+
+        from src import get_nhl_league_season_schedule
+        result = get_nhl_league_season_schedule("20232024")
+
+        assert result["error_code"] == "upstream_5xx"
+        assert result["retryable"] is True
@@ -0,0 +1,107 @@
+import json
+import pytest
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache import cached, clear_caches, get_cache
+from src.compact import Record, compact, expand
+
+
+def _game(game_id):
+    return {"id": game_id, "gameDate": "2024-01-15", "neutralSite": False, "score": 1.0,
+            "homeTeam": {"abbrev": "BOS", "placeName": {"default": "Boston"}},
+            "awayTeam": {"abbrev": "TOR", "placeName": {"default": "Toronto"}},
+            "tvBroadcasts": [{"id": 28, "network": "NESN"}], "venue": None}
+
+
+class TestCompact:
+
+    def test_round_trip(self):
+        payload = {"games": [_game(1), _game(2)], "count": 2, "flags": [True, 1, 1.0, None, "x"], "empty": {}}
+
+        assert expand(compact(payload)) == payload
+        assert [type(value) for value in expand(compact(payload))["flags"]] == [bool, int, float, type(None), str]
+
+    def test_shapes_strings_and_small_records_are_shared(self):
+        first, second = (compact(json.loads(json.dumps(_game(i)))) for i in (1, 2))
+
+        assert first.keys is second.keys
+        assert first["homeTeam"].keys is second["homeTeam"].keys
+        assert first["homeTeam"]["placeName"] is second["homeTeam"]["placeName"]
+        assert first["tvBroadcasts"][0] is second["tvBroadcasts"][0]
+        assert first["gameDate"] is second["gameDate"]
+        # Equal but differently typed values never share a record
+        assert compact({"x": 1})["x"] is not compact({"x": True})["x"]
+        assert type(expand(compact({"x": True}))["x"]) is bool
+
+    def test_records_answer_read_only_lookups(self):
+        game = compact(_game(1))
+
+        assert isinstance(game, Record)
+        assert game["homeTeam"].get("abbrev") == "BOS"
+        assert game.get("gameOutcome", {}) == {}
+        assert "venue" in game
+        with pytest.raises(KeyError):
+            game["gameOutcome"]
+
+    def test_expanded_copies_are_independent(self):
+        stored = compact({"games": [_game(1)]})
+        first = expand(stored)
+        first["games"][0]["homeTeam"]["abbrev"] = "XXX"
+
+        assert expand(stored)["games"][0]["homeTeam"]["abbrev"] == "BOS"
+
+    def test_compact_payload_uses_less_memory(self):
+        def decoded():
+            return json.loads(json.dumps({"games": [_game(i) for i in range(200)]}))
+
+        def retained(build):
+            tracemalloc.start()
+            held = [build() for _ in range(20)]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del held
+            return size
+
+        assert retained(lambda: compact(decoded())) < retained(decoded) * 0.6
+
+
+class TestCompactCache:
+
+    def test_compact_namespace_returns_fresh_plain_results(self):
+        calls = []
+
+        @cached("compact_test", compact_values=True)
+        def games(day: str) -> dict:
+            calls.append(day)
+            return {"games": [_game(1)]}
+
+        first = games("2024-01-15")
+        second = games("2024-01-15")
+        second["games"].clear()
+
+        assert games("2024-01-15") == first == {"games": [_game(1)]}
+        assert isinstance(get_cache("compact_test").get((("day", "2024-01-15"),))[1], Record)
+        assert calls == ["2024-01-15"]
+        clear_caches()
+
+    def test_game_store_serves_plain_games(self, mock_schedule):
+        mock_schedule.weekly_schedule.return_value = {"gameWeek": [{"date": "2024-01-15", "games": [
+            {**_game(1), "startTimeUTC": "2024-01-16T00:00:00Z", "gameState": "OFF"}]}]}
+        from src.game_store import store
+        from datetime import date
+
+        games = store.games(date(2024, 1, 15), date(2024, 1, 15))
+        games[0]["homeTeam"]["abbrev"] = "XXX"
+        games = store.games(date(2024, 1, 15), date(2024, 1, 15))
+
+        assert isinstance(games[0], dict) and games[0]["homeTeam"] == {"abbrev": "BOS",
+                                                                       "placeName": {"default": "Boston"}}
+        assert isinstance(store._games[1], Record)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,155 @@
+import asyncio
+import gzip
+import json
+import zlib
+import pytest
+import sys
+import os
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import compression
+from src.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE = {"games": [{"id": i, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "TOR"}} for i in range(500)]}
+
+
+def _app(**options):
+    async def large(request):
+        return JSONResponse(LARGE)
+
+    async def small(request):
+        return JSONResponse({"status": "ok"})
+
+    async def events(request):
+        async def stream():
+            for i in range(3):
+                yield f"data: {json.dumps({'event': i})}\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    async def image(request):
+        return PlainTextResponse("x" * 5000, media_type="image/png")
+
+    routes = [Route("/large", large), Route("/small", small), Route("/events", events), Route("/image", image)]
+    return Starlette(routes=routes, middleware=[Middleware(CompressionMiddleware, **options)])
+
+
+def _asgi_messages(app, path, accept_encoding):
+    """Drive the app directly and return every message it sends."""
+    messages = []
+    scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "root_path": "", "scheme": "http", "server": ("testserver", 80), "client": ("testclient", 50000),
+             "http_version": "1.1", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # The client never disconnects
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = dict(messages[0]["headers"])
+    bodies = [message["body"] for message in messages[1:] if message.get("body")]
+    return headers, bodies
+
+
+class TestCompression:
+
+    def test_negotiate_encoding(self):
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("") is None
+        assert negotiate_encoding("gzip;q=0, deflate") is None
+        assert negotiate_encoding("gzip;level=1;q=0") is None
+        assert negotiate_encoding("gzip; q=0.5") == "gzip"
+        assert negotiate_encoding("*") in ("br", "gzip")
+    
+    def test_negotiate_encoding_prefers_brotli(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", object())
+        
+        assert negotiate_encoding("gzip, br") == "br"
+        assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    
+    def test_negotiate_encoding_without_brotli(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        
+        assert negotiate_encoding("br") is None
+        assert negotiate_encoding("br, gzip") == "gzip"
+    
+    def test_large_response_is_gzipped(self):
+        client = TestClient(_app())
+        
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "content-length" not in response.headers
+        assert response.json() == LARGE
+    
+    def test_large_response_is_streamed_in_chunks(self):
+        headers, bodies = _asgi_messages(_app(chunk_size=1024), "/large", "gzip")
+        
+        assert headers[b"content-encoding"] == b"gzip"
+        assert len(bodies) > 1
+        assert json.loads(gzip.decompress(b"".join(bodies))) == LARGE
+    
+    def test_uncompressed_response_is_sent_as_is(self):
+        headers, bodies = _asgi_messages(_app(chunk_size=1024), "/large", "identity")
+        
+        assert b"content-encoding" not in headers
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert int(headers[b"content-length"]) == len(bodies[0])
+        assert len(bodies) == 1
+    
+    def test_small_response_is_not_compressed(self):
+        client = TestClient(_app(minimum_size=1024))
+        
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["content-length"] == str(len(response.content))
+        assert response.json() == {"status": "ok"}
+    
+    def test_non_text_response_is_not_compressed(self):
+        client = TestClient(_app())
+        
+        response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+        
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+    
+    def test_existing_vary_header_is_extended(self):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", b"application/json"), (b"vary", b"Origin")]})
+            await send({"type": "http.response.body", "body": b"{}" * 1000})
+        
+        headers, _ = _asgi_messages(CompressionMiddleware(app), "/", "gzip")
+        
+        assert headers[b"vary"] == b"Origin, Accept-Encoding"
+    
+    def test_event_stream_is_flushed_per_event(self):
+        headers, bodies = _asgi_messages(_app(), "/events", "gzip")
+        
+        assert headers[b"content-encoding"] == b"gzip"
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        decoded = [decompressor.decompress(body) for body in bodies]
+        
+        # Every event is decodable as soon as its chunk arrives
+        assert decoded[:3] == [f'data: {{"event": {i}}}\n\n'.encode() for i in range(3)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
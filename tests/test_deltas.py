@@ -0,0 +1,109 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.deltas import delta_result, diff, version_token
+
+
+def _row(abbrev, points, wins):
+    return {"teamAbbrev": {"default": abbrev}, "points": points, "wins": wins}
+
+
+class TestDiff:
+
+    def test_keyed_rows_are_addressed_by_id(self):
+        old = {"standings": [_row("BOS", 100, 45), _row("TOR", 95, 42), _row("FLA", 94, 43)]}
+        new = {"standings": [_row("BOS", 100, 45), _row("FLA", 96, 44), _row("TOR", 95, 42)]}
+
+        assert diff(old, new) == [
+            {"op": "replace", "path": "/standings/FLA/points", "value": 96},
+            {"op": "replace", "path": "/standings/FLA/wins", "value": 44},
+            {"op": "order", "path": "/standings", "value": ["BOS", "FLA", "TOR"]},
+        ]
+
+    def test_added_removed_and_positional_changes(self):
+        old = {"games": [{"id": 1, "score": [0, 0]}, {"id": 2}], "date": "2024-01-15", "note": "x"}
+        new = {"games": [{"id": 1, "score": [1, 0]}, {"id": 3}], "date": "2024-01-15", "count": 2}
+
+        changes = diff(old, new)
+
+        assert {"op": "remove", "path": "/note"} in changes
+        assert {"op": "add", "path": "/count", "value": 2} in changes
+        assert {"op": "replace", "path": "/games/1/score/0", "value": 1} in changes
+        assert {"op": "remove", "path": "/games/2"} in changes
+        assert {"op": "add", "path": "/games/3", "value": {"id": 3}} in changes
+        assert {"op": "order", "path": "/games", "value": [1, 3]} in changes
+
+    def test_unkeyed_lists_of_different_length_are_replaced(self):
+        assert diff({"a": [1, 2]}, {"a": [1, 2, 3]}) == [{"op": "replace", "path": "/a", "value": [1, 2, 3]}]
+        assert diff({"a": [1, 2]}, {"a": [1, 2]}) == []
+
+
+class TestDeltaResult:
+
+    def test_first_call_returns_full_result_with_version(self):
+        result = delta_result({"standings": [_row("BOS", 100, 45)]})
+
+        assert result["standings"] == [_row("BOS", 100, 45)]
+        assert result["version"] == version_token({"standings": [_row("BOS", 100, 45)]})
+
+    def test_unchanged_and_changed_polls(self):
+        version = delta_result({"standings": [_row("BOS", 100, 45)]})["version"]
+
+        assert delta_result({"standings": [_row("BOS", 100, 45)]}, version) == {"version": version,
+                                                                                 "not_modified": True}
+        changed = delta_result({"standings": [_row("BOS", 102, 46)]}, version)
+        assert changed["since_version"] == version
+        assert changed["changes"] == [{"op": "replace", "path": "/standings/BOS/points", "value": 102},
+                                      {"op": "replace", "path": "/standings/BOS/wins", "value": 46}]
+
+    def test_unknown_version_and_errors(self):
+        result = delta_result({"standings": []}, "0123456789abcdef")
+
+        assert result["standings"] == [] and "changes" not in result
+        assert delta_result({"error": "boom"}, "0123456789abcdef") == {"error": "boom"}
+
+
+class TestDeltaTools:
+
+    def test_standings_poll(self, mock_standings):
+        mock_standings.league_standings.return_value = {"standings": [_row("BOS", 100, 45)]}
+        from src import get_nhl_standings
+        from src.game_store import store
+
+        version = get_nhl_standings()["version"]
+
+        assert get_nhl_standings(since_version=version)["not_modified"] is True
+        mock_standings.league_standings.assert_called_once_with(store.today().isoformat())
+
+    def test_playoff_carousel_poll(self, mock_schedule):
+        from src import get_nhl_playoff_carousel
+        mock_schedule.playoff_carousel.return_value = {"rounds": [{"roundNumber": 1, "series": [
+            {"seriesLetter": "A", "topSeed": {"wins": 1}}]}]}
+        version = get_nhl_playoff_carousel("20232024")["version"]
+        from src.cache import get_cache
+        get_cache("playoff_carousel").clear()
+        mock_schedule.playoff_carousel.return_value = {"rounds": [{"roundNumber": 1, "series": [
+            {"seriesLetter": "A", "topSeed": {"wins": 2}}]}]}
+
+        result = get_nhl_playoff_carousel("20232024", since_version=version)
+
+        assert result["changes"] == [
+            {"op": "replace", "path": "/playoff_data/rounds/1/series/A/topSeed/wins", "value": 2}]
+
+    def test_daily_schedule_poll(self, mock_schedule):
+        mock_schedule.weekly_schedule.return_value = {"gameWeek": [{"date": "2024-01-15", "games": [
+            {"id": 1, "gameDate": "2024-01-15", "gameState": "FUT", "startTimeUTC": "2024-01-16T00:00:00Z",
+             "awayTeam": {"abbrev": "TOR"}, "homeTeam": {"abbrev": "BOS"}}]}]}
+        from src import get_nhl_daily_schedule
+
+        version = get_nhl_daily_schedule("2024-01-15")["version"]
+
+        assert get_nhl_daily_schedule("2024-01-15", since_version=version) == {"version": version,
+                                                                               "not_modified": True}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
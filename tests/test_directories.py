@@ -0,0 +1,118 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.directories import get_nhl_player_game_logs, plan, player_directory, team_directory
+from src.schedule import get_nhl_league_season_schedule
+
+
+def _totals(season, game_type, league="NHL"):
+    return {"season": season, "gameTypeId": game_type, "leagueAbbrev": league, "gamesPlayed": 10}
+
+
+CAREER = {"seasonTotals": [
+    _totals(20142015, 2, "OHL"), _totals(20142015, 3, "OHL"),
+    _totals(20152016, 2), _totals(20162017, 2), _totals(20162017, 3),
+    _totals(20172018, 2), _totals(20182019, 2, "AHL"), _totals(20192020, 2), _totals(20192020, 3),
+]}
+
+
+@pytest.fixture
+def career(mock_stats):
+    mock_stats.player_career_stats.return_value = CAREER
+    mock_stats.player_game_log.side_effect = lambda player_id, season, game_type: [
+        {"gameId": int(season[:4]) * 10 + game_type, "gameDate": f"{season[:4]}-11-01"}]
+    return mock_stats
+
+
+class TestDirectories:
+
+    def test_player_directory_keeps_nhl_seasons(self, career):
+        assert player_directory("8478402") == {"20152016": {2}, "20162017": {2, 3}, "20172018": {2},
+                                               "20192020": {2, 3}}
+
+    def test_team_directory_is_cached(self, mock_stats):
+        mock_stats.gametypes_per_season_directory_by_team.return_value = [
+            {"season": 20232024, "gameTypes": [1, 2, 3]}, {"season": 20222023, "gameTypes": [1, 2]}]
+
+        assert team_directory("tor") == {"20232024": {1, 2, 3}, "20222023": {1, 2}}
+        assert team_directory("TOR")["20222023"] == {1, 2}
+        mock_stats.gametypes_per_season_directory_by_team.assert_called_once_with("TOR")
+
+    def test_plan_skips_absent_combinations(self):
+        directory = {"20222023": {2}, "20232024": {2, 3}}
+
+        assert plan(directory, ["20212022", "20222023", "20232024"], (2, 3)) == (
+            [("20222023", 2), ("20232024", 2), ("20232024", 3)], 3)
+
+    def test_plan_keeps_game_types_the_directory_cannot_describe(self):
+        directory = {"20232024": {2}}
+
+        assert plan(directory, ["20222023", "20232024"], (1, 2), described=(2, 3)) == (
+            [("20222023", 1), ("20232024", 1), ("20232024", 2)], 1)
+
+
+class TestGetNhlPlayerGameLogs:
+
+    def test_career_fetches_only_seasons_and_types_played(self, career):
+        result = get_nhl_player_game_logs("8478402")
+
+        assert [(log["season"], log["game_type"]) for log in result["game_logs"]] == [
+            ("20152016", 2), ("20162017", 2), ("20162017", 3), ("20172018", 2), ("20192020", 2), ("20192020", 3)]
+        # 5 seasons x 2 game types, less the 4 combinations the player did not play
+        assert result["fetched"] == 6 and result["skipped"] == 4
+        assert career.player_game_log.call_count == 6
+        assert result["total_games"] == 6
+
+    def test_season_range_and_game_types(self, career):
+        result = get_nhl_player_game_logs("8478402", start_season="2016-17", end_season="2018-19", game_types=[3])
+
+        assert [(log["season"], log["game_type"]) for log in result["game_logs"]] == [("20162017", 3)]
+        assert result["skipped"] == 2
+
+    def test_preseason_is_not_pruned(self, career):
+        result = get_nhl_player_game_logs("8478402", start_season="2016-17", end_season="2018-19", game_types=[1])
+
+        assert [log["season"] for log in result["game_logs"]] == ["20162017", "20172018", "20182019"]
+        assert result["skipped"] == 0
+
+    def test_failed_game_log_is_reported_not_fatal(self, career):
+        career.player_game_log.side_effect = lambda player_id, season, game_type: (
+            (_ for _ in ()).throw(Exception("Game log unavailable")) if season == "20172018" else [])
+
+        result = get_nhl_player_game_logs("8478402", game_types=[2])
+
+        assert result["missing"] == [{"season": "20172018", "game_type": 2, "error": "Game log unavailable"}]
+        assert len(result["game_logs"]) == 3
+
+    def test_unknown_player(self, mock_stats):
+        mock_stats.player_career_stats.side_effect = Exception("Player not found")
+
+        assert "error" in get_nhl_player_game_logs("1")
+
+
+class TestLeagueScheduleTeamFilter:
+
+    def test_team_filter_fetches_only_that_team(self, mock_schedule, mock_stats):
+        mock_stats.gametypes_per_season_directory_by_team.return_value = [{"season": 20232024, "gameTypes": [2]}]
+        mock_schedule.team_season_schedule.return_value = {"games": [
+            {"id": 1, "gameDate": "2024-01-01", "homeTeam": {"abbrev": "TOR"}, "awayTeam": {"abbrev": "BOS"}}]}
+
+        result = get_nhl_league_season_schedule("20232024", team_abbr="TOR")
+
+        assert [game["id"] for game in result["games"]] == [1]
+        mock_schedule.team_season_schedule.assert_called_once_with("TOR", "20232024")
+
+    def test_team_that_did_not_play_the_season_costs_no_schedule_request(self, mock_schedule, mock_stats):
+        mock_stats.gametypes_per_season_directory_by_team.return_value = [{"season": 20242025, "gameTypes": [2]}]
+
+        result = get_nhl_league_season_schedule("20232024", team_abbr="UTA")
+
+        assert result["games"] == [] and result["missing_teams"] == []
+        mock_schedule.team_season_schedule.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
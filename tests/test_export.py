@@ -0,0 +1,121 @@
+import json
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import export
+from src.export import export_seasons, flatten, get_nhl_season_export, parse_seasons
+
+
+def _game(game_id, date, away, home):
+    return {"id": game_id, "gameDate": date, "awayTeam": {"abbrev": away}, "homeTeam": {"abbrev": home}}
+
+
+@pytest.fixture
+def season_data(mock_schedule, mock_standings, mock_stats):
+    """Two-team seasons with paged skater stats."""
+    mock_standings.league_standings.return_value = {"standings": [{"teamAbbrev": {"default": "BOS"}},
+                                                                  {"teamAbbrev": {"default": "TOR"}}]}
+    mock_schedule.team_season_schedule.side_effect = lambda team, season: {"games": [
+        _game(int(season[:4]) * 10 + 1, f"{season[:4]}-10-10", "BOS", "TOR"),
+        _game(int(season[:4]) * 10 + 2 + (team == "TOR"), f"{season[:4]}-10-12", team, "MTL"),
+    ]}
+
+    def skaters(start_season, end_season, start, limit, **kwargs):
+        rows = [{"playerId": i, "seasonId": int(start_season)} for i in range(export.PAGE_SIZE + 5)]
+        return rows[start:start + limit]
+
+    mock_stats.skater_stats_summary.side_effect = skaters
+    mock_stats.goalie_stats_summary.return_value = [{"playerId": 1}]
+    with patch('src.standings.get_nhl_season_manifest', return_value={"seasons": [
+            {"id": 20222023, "standingsEnd": "2023-04-14"}, {"id": 20232024, "standingsEnd": "2024-04-18"}]}):
+        yield mock_stats
+
+
+def _read_ndjson(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestSeasonExport:
+
+    def test_parse_seasons(self):
+        assert parse_seasons("20212022, 20232024") == ["20212022", "20232024"]
+        assert parse_seasons("20202021-20222023") == ["20202021", "20212022", "20222023"]
+
+    def test_flatten_nests_into_dotted_columns(self):
+        assert flatten({"id": 1, "homeTeam": {"abbrev": "BOS", "name": {"default": "Bruins"}}, "tvs": [1]}) == \
+            {"id": 1, "homeTeam.abbrev": "BOS", "homeTeam.name.default": "Bruins", "tvs": "[1]"}
+
+    def test_ndjson_export_writes_every_table_per_season(self, season_data, tmp_path):
+        result = export_seasons(["20222023", "20232024"], str(tmp_path))
+
+        files = {file["table"]: file for file in result["files"]}
+        assert set(files) == {"schedules", "skaters", "goalies", "standings"}
+        schedules = _read_ndjson(files["schedules"]["path"])
+        # Games shared between team schedules appear once
+        assert len(schedules) == 2 * 3
+        assert [game["exportSeason"] for game in schedules] == ["20222023"] * 3 + ["20232024"] * 3
+        skaters = _read_ndjson(files["skaters"]["path"])
+        assert len(skaters) == files["skaters"]["rows"] == 2 * (export.PAGE_SIZE + 5)
+        assert files["standings"]["rows"] == 4
+        assert files["goalies"]["bytes"] == os.path.getsize(tmp_path / "goalies.ndjson")
+        # Two pages per season
+        assert season_data.skater_stats_summary.call_count == 4
+
+    def test_tool_writes_under_export_dir(self, season_data, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "EXPORT_DIR", str(tmp_path))
+
+        result = get_nhl_season_export("20222023-20232024", tables="goalies")
+
+        assert result["files"] == [{"table": "goalies", "path": str(tmp_path / "20222023-20232024" / "goalies.ndjson"),
+                                    "rows": 2, "bytes": os.path.getsize(tmp_path / "20222023-20232024" / "goalies.ndjson")}]
+
+    def test_invalid_arguments_return_errors(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "EXPORT_DIR", str(tmp_path))
+
+        assert get_nhl_season_export("2023", format="csv")["error_code"] == "invalid_argument"
+        assert get_nhl_season_export("20232024", tables="rosters")["error_code"] == "invalid_argument"
+        assert get_nhl_season_export("2023")["error_code"] == "invalid_argument"
+
+    def test_parquet_export(self, season_data, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        result = export_seasons(["20222023", "20232024"], str(tmp_path), "parquet", ["schedules"])
+
+        table = pq.read_table(result["files"][0]["path"])
+        assert table.num_rows == 6
+        assert "homeTeam.abbrev" in table.column_names
+        assert pq.ParquetFile(result["files"][0]["path"]).num_row_groups == 2
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_arrow_schema_unifies_batches(self, tmp_path, fmt):
+        pa = pytest.importorskip("pyarrow")
+        path = str(tmp_path / f"rows.{fmt}")
+
+        writer = export.ArrowWriter(path, fmt)
+        writer.write([{"id": 1, "pct": 1, "note": None}])
+        writer.write([{"id": 2, "pct": 0.5, "note": 3, "extra": {"abbrev": "BOS"}}])
+        writer.write([{"id": "3", "pct": None, "note": "late"}])
+        writer.close()
+
+        if fmt == "parquet":
+            table = pytest.importorskip("pyarrow.parquet").read_table(path)
+        else:
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+        assert table.schema.field("id").type == pa.string()
+        assert table.schema.field("pct").type == pa.float64()
+        assert table.to_pylist() == [
+            {"id": "1", "pct": 1.0, "note": None, "extra.abbrev": None},
+            {"id": "2", "pct": 0.5, "note": "3", "extra.abbrev": "BOS"},
+            {"id": "3", "pct": None, "note": "late", "extra.abbrev": None},
+        ]
+        assert os.listdir(tmp_path) == [f"rows.{fmt}"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,107 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import ttl_policy
+from src.game_store import GameStore
+
+# 2024-01-15 20:30 Eastern
+NOW = datetime(2024, 1, 16, 1, 30, tzinfo=timezone.utc)
+
+
+def _game(game_id, away, home, start, state="FUT"):
+    return {"id": game_id, "awayTeam": {"abbrev": away}, "homeTeam": {"abbrev": home},
+            "startTimeUTC": start, "gameState": state}
+
+
+def _mock_weeks(mock_schedule, games_by_day):
+    def weekly_schedule(start):
+        week = [(date.fromisoformat(start) + timedelta(days=offset)).isoformat() for offset in range(7)]
+        return {"gameWeek": [{"date": day, "games": games_by_day.get(day, [])} for day in week]}
+    mock_schedule.weekly_schedule.side_effect = weekly_schedule
+
+
+class TestGameStore:
+
+    def test_live_days_expire_and_past_days_are_kept(self, mock_schedule):
+        _mock_weeks(mock_schedule, {
+            "2024-01-10": [_game(1, "TOR", "BOS", "2024-01-11T00:00:00Z", "OFF")],
+            "2024-01-15": [_game(2, "NJD", "NYR", "2024-01-16T00:00:00Z", "LIVE")],
+        })
+        now = [NOW]
+        store = GameStore(clock=lambda: now[0])
+
+        # One week covers both days
+        store.games(date(2024, 1, 10), date(2024, 1, 10))
+        store.games(date(2024, 1, 15), date(2024, 1, 15))
+        assert mock_schedule.weekly_schedule.call_count == 1
+
+        now[0] = NOW + timedelta(seconds=ttl_policy.LIVE_TTL + 1)
+        store.games(date(2024, 1, 10), date(2024, 1, 10))
+        assert mock_schedule.weekly_schedule.call_count == 1
+        store.games(date(2024, 1, 15), date(2024, 1, 15))
+        mock_schedule.weekly_schedule.assert_called_with("2024-01-15")
+
+    def test_team_month_covers_only_that_team(self, mock_schedule):
+        mock_schedule.team_monthly_schedule.return_value = [
+            {**_game(1, "TOR", "BOS", "2024-01-16T00:00:00Z"), "gameDate": "2024-01-15"}
+        ]
+        _mock_weeks(mock_schedule, {"2024-01-15": [_game(1, "TOR", "BOS", "2024-01-16T00:00:00Z"),
+                                                   _game(2, "NJD", "NYR", "2024-01-16T00:00:00Z")]})
+        store = GameStore(clock=lambda: NOW)
+
+        assert [g["id"] for g in store.games(date(2024, 1, 1), date(2024, 1, 31), "tor")] == [1]
+        assert [g["id"] for g in store.games(date(2024, 1, 20), date(2024, 1, 26), "TOR")] == []
+        assert mock_schedule.team_monthly_schedule.call_count == 1
+
+        # Other teams' games on those days were never fetched
+        assert [g["id"] for g in store.games(date(2024, 1, 15), date(2024, 1, 15))] == [1, 2]
+        mock_schedule.weekly_schedule.assert_called_once_with("2024-01-15")
+        assert store.stats()["games"] == 2
+
+    def test_league_refetch_drops_games_no_longer_scheduled(self, mock_schedule):
+        games = {"2024-01-15": [_game(1, "TOR", "BOS", "2024-01-16T03:00:00Z"),
+                                _game(2, "NJD", "NYR", "2024-01-16T03:00:00Z")]}
+        _mock_weeks(mock_schedule, games)
+        now = [NOW]
+        store = GameStore(clock=lambda: now[0])
+        store.games(date(2024, 1, 15), date(2024, 1, 15))
+
+        games["2024-01-15"] = games["2024-01-15"][:1]
+        now[0] = NOW + timedelta(days=1)
+
+        assert [g["id"] for g in store.games(date(2024, 1, 15), date(2024, 1, 15))] == [1]
+
+    def test_least_recently_used_days_are_dropped_past_max_days(self, mock_schedule):
+        _mock_weeks(mock_schedule, {"2024-01-01": [_game(1, "TOR", "BOS", "2024-01-02T00:00:00Z", "OFF")],
+                                    "2024-01-08": [_game(2, "NJD", "NYR", "2024-01-09T00:00:00Z", "OFF")]})
+        store = GameStore(clock=lambda: NOW, max_days=10)
+
+        store.games(date(2024, 1, 1), date(2024, 1, 7))
+        store.games(date(2024, 1, 8), date(2024, 1, 14))
+
+        # The first week's oldest days went, with their games
+        assert store.stats()["days"] == 10
+        assert store.stats()["games"] == 1
+        assert [g["id"] for g in store.games(date(2024, 1, 1), date(2024, 1, 1))] == [1]
+        assert mock_schedule.weekly_schedule.call_count == 3
+
+    def test_envelope_follows_the_requested_start(self, mock_schedule):
+        mock_schedule.weekly_schedule.return_value = {
+            "previousStartDate": "2024-01-08", "nextStartDate": "2024-01-22", "oddsPartners": [],
+            "gameWeek": [{"date": (date(2024, 1, 15) + timedelta(days=offset)).isoformat(), "games": []}
+                         for offset in range(7)],
+        }
+        store = GameStore(clock=lambda: NOW)
+        store.games(date(2024, 1, 15), date(2024, 1, 21))
+
+        assert store.envelope(date(2024, 1, 17)) == {"previousStartDate": "2024-01-10",
+                                                     "nextStartDate": "2024-01-24", "oddsPartners": []}
+        assert store.envelope(date(2024, 1, 22)) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,115 @@
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nhlpy.config import ClientConfig
+from nhlpy.http_client import Endpoint
+
+from src import health
+from src.client import ResilientHttpClient
+from src.sessions import FairScheduler
+from src.upstream_health import UpstreamHealth, upstream_health
+
+
+@pytest.fixture
+def ready_replica():
+    """A warmed replica with its schedule loaded and no upstream history."""
+    upstream_health.reset()
+    with patch.object(health.warmer, "_ready") as warmed, \
+         patch.object(type(health.policy), "loaded", new=True), \
+         patch('src.health.scheduler', FairScheduler(capacity=1, per_session=1)) as scheduler:
+        warmed.is_set.return_value = True
+        yield scheduler
+    upstream_health.reset()
+
+
+class TestHealth:
+
+    def test_liveness(self):
+        assert health.liveness()["status"] == "alive"
+
+    def test_ready_replica(self, ready_replica):
+        result = health.readiness()
+
+        assert result["ready"] is True
+        assert set(result["checks"]) == {"warmup", "saturation"}
+        assert result["upstream"]["degraded"] is False
+
+    def test_cold_replica_is_not_ready(self):
+        with patch.object(health.warmer, "_ready") as warmed:
+            warmed.is_set.return_value = False
+            result = health.readiness()
+
+        assert result["ready"] is False
+        assert result["checks"]["warmup"]["ok"] is False
+
+    def test_unloaded_schedule_is_reported_only(self, ready_replica):
+        with patch.object(type(health.policy), "loaded", new=False):
+            result = health.readiness()
+
+        assert result["ready"] is True
+        assert result["cache"]["schedule_loaded"] is False
+
+    def test_saturated_replica_is_not_ready(self, ready_replica, monkeypatch):
+        monkeypatch.setattr(health, "READY_MAX_QUEUE", 1)
+
+        async def main():
+            gate = asyncio.Event()
+
+            async def call():
+                async with ready_replica.slot("busy"):
+                    await gate.wait()
+
+            tasks = [asyncio.create_task(call()) for _ in range(3)]
+            await asyncio.sleep(0)
+            result = health.readiness()
+            gate.set()
+            await asyncio.gather(*tasks)
+            return result
+
+        result = asyncio.run(main())
+
+        assert result["ready"] is False
+        assert result["checks"]["saturation"] == {"ok": False, "in_flight": 1, "capacity": 1, "queued": 2,
+                                                   "max_queued": 1}
+
+    def test_failing_upstream_family_is_reported_only(self, ready_replica):
+        statuses = [503] * 6 + [200] * 6
+        real_client = httpx.Client
+        transport = httpx.MockTransport(lambda request: httpx.Response(
+            statuses.pop(0) if "stats" in request.url.path else 200, json={}))
+        with patch('src.client.httpx.Client', lambda **kwargs: real_client(transport=transport, **kwargs)), \
+             patch('src.client.time.sleep'), patch('src.client.MAX_RETRIES', 0):
+            http_client = ResilientHttpClient(ClientConfig())
+            for _ in range(6):
+                http_client.get(Endpoint.API_WEB_V1, "standings/now")
+                with pytest.raises(Exception):
+                    http_client.get(Endpoint.API_STATS, "en/team")
+
+        result = health.readiness()
+
+        families = result["upstream"]["families"]
+        assert families["web"] == {"requests": 6, "errors": 0, "error_rate": 0.0, "degraded": False}
+        assert families["stats"]["error_rate"] == 1.0
+        assert families["stats"]["degraded"] is True
+        assert result["upstream"]["degraded"] is True
+        assert result["ready"] is True
+
+    def test_old_upstream_errors_age_out(self):
+        now = [0.0]
+        tracker = UpstreamHealth(window=60, clock=lambda: now[0])
+        for _ in range(5):
+            tracker.record("web", False)
+        now[0] = 61.0
+        tracker.record("web", True)
+
+        assert tracker.rates() == {"web": {"requests": 1, "errors": 0, "error_rate": 0.0}}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
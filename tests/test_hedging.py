@@ -0,0 +1,161 @@
+import threading
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nhlpy.config import ClientConfig
+from nhlpy.http_client import Endpoint
+
+from src.client import ResilientHttpClient, _HedgedRequests, client
+from src.hedging import MAX_WORKERS, MIN_SAMPLES, Hedger, endpoint_key
+
+
+def _warmed(hedger, key="schedule/*", seconds=0.01):
+    for _ in range(MIN_SAMPLES):
+        hedger.observe(key, seconds)
+    return hedger
+
+
+class TestHedger:
+
+    def test_endpoint_key_folds_ids_dates_and_seasons(self):
+        assert endpoint_key("player/8478402/game-log/20232024/2") == "player/*/game-log/*/*"
+        assert endpoint_key("schedule/2024-01-15") == "schedule/*"
+        assert endpoint_key("en/skater/summary?limit=25") == "en/skater/summary"
+
+    def test_no_hedge_until_enough_latencies_are_observed(self):
+        hedger = Hedger(enabled=True)
+        for _ in range(MIN_SAMPLES - 1):
+            hedger.observe("schedule/*", 0.2)
+
+        assert hedger.delay("schedule/*") is None
+        hedger.observe("schedule/*", 0.2)
+        assert hedger.delay("schedule/*") == pytest.approx(0.2)
+
+    def test_slow_first_attempt_is_hedged_and_the_hedge_wins(self):
+        hedger = _warmed(Hedger(enabled=True))
+        calls = []
+
+        def send():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                time.sleep(1)
+                return "slow"
+            return "fast"
+
+        started = time.monotonic()
+        assert hedger.call("schedule/*", send) == "fast"
+        assert time.monotonic() - started < 0.5
+        assert hedger.stats()["hedges"] == 1 and hedger.stats()["hedge_wins"] == 1
+
+    def test_fast_answers_and_disabled_hedger_send_once(self):
+        sends = []
+        for hedger in (_warmed(Hedger(enabled=True), seconds=0.2), _warmed(Hedger(enabled=False))):
+            assert hedger.call("schedule/*", lambda: sends.append(1) or "ok") == "ok"
+
+        assert len(sends) == 2
+
+    def test_a_failed_attempt_falls_back_to_the_other(self):
+        hedger = _warmed(Hedger(enabled=True))
+        lock, calls = threading.Lock(), []
+
+        def send():
+            with lock:
+                calls.append(1)
+                attempt = len(calls)
+            time.sleep(0.1)
+            if attempt == 2:
+                raise httpx.ConnectError("refused")
+            return "first"
+
+        assert hedger.call("schedule/*", send) == "first"
+        assert hedger.stats()["hedge_wins"] == 0
+
+    def test_hedges_are_capped(self):
+        hedger = Hedger(enabled=True, max_ratio=0.0)
+        hedger.delay = lambda key: 0.02
+
+        def slow():
+            time.sleep(0.06)
+            return "ok"
+
+        for _ in range(8):
+            hedger.call("schedule/*", slow)
+
+        stats = hedger.stats()
+        assert stats["hedges"] == 5 and stats["capped"] == 3
+        assert stats["hedge_rate"] == pytest.approx(5 / 8)
+
+    def test_quiet_periods_do_not_bank_hedges(self):
+        hedger = _warmed(Hedger(enabled=True, max_ratio=0.5))
+        for _ in range(100):
+            hedger.call("schedule/*", lambda: "ok")
+        hedger.delay = lambda key: 0.02
+
+        def slow():
+            time.sleep(0.06)
+            return "ok"
+
+        for _ in range(20):
+            hedger.call("schedule/*", slow)
+
+        # The burst, plus half a token for each of the slow requests, not for the earlier fast ones
+        assert hedger.stats()["hedges"] <= 5 + 10
+
+    def test_first_attempt_does_not_wait_for_busy_hedge_workers(self):
+        hedger = _warmed(Hedger(enabled=True))
+        release = threading.Event()
+        for _ in range(MAX_WORKERS):
+            hedger._pool().submit(release.wait, 5)
+
+        started = time.monotonic()
+        assert hedger.call("schedule/*", lambda: "ok") == "ok"
+        release.set()
+
+        assert time.monotonic() - started < 0.5
+
+    def test_no_hedge_that_the_deadline_leaves_no_time_for(self):
+        hedger = _warmed(Hedger(enabled=True), seconds=0.5)
+
+        assert hedger.call("schedule/*", lambda: "ok", budget=0.2) == "ok"
+        assert hedger.stats()["hedges"] == 0
+
+
+class TestHedgedClient:
+
+    def test_only_schedule_standings_and_stats_requests_are_hedged(self):
+        assert isinstance(client.schedule.client, _HedgedRequests)
+        assert isinstance(client.standings.client, _HedgedRequests)
+        assert isinstance(client.stats.client, _HedgedRequests)
+        assert isinstance(client.teams.client, ResilientHttpClient)
+
+    def test_slow_upstream_response_is_hedged(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if len(requests) == 1:
+                time.sleep(1)
+            return httpx.Response(200, json={"attempt": len(requests)})
+
+        real_client = httpx.Client
+        hedger = _warmed(Hedger(enabled=True), key="standings/now")
+        with patch('src.client.httpx.Client', lambda **kwargs: real_client(transport=httpx.MockTransport(handler),
+                                                                           **kwargs)), \
+                patch('src.client.hedger', hedger):
+            http_client = ResilientHttpClient(ClientConfig())
+            response = _HedgedRequests(http_client).get(Endpoint.API_WEB_V1, "standings/now")
+            unhedged = http_client.get(Endpoint.API_WEB_V1, "standings/now")
+
+        assert response.json() == {"attempt": 2}
+        assert unhedged.json() == {"attempt": 3}
+        assert hedger.stats()["hedge_wins"] == 1 and hedger.stats()["requests"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -33,6 +33,7 @@ class TestNHLAPI:
         ]
         
         from src import get_nhl_teams
+        from src.game_store import store
         result = get_nhl_teams()
         
         assert "teams" in result
@@ -41,7 +42,7 @@ class TestNHLAPI:
         assert result["teams"][0]["abbr"] == "BOS"
         assert result["teams"][1]["conference"]["abbr"] == "EAST"
         
-        mock_teams.teams.assert_called_once_with("now")
+        mock_teams.teams.assert_called_once_with(store.today().isoformat())
     
     def test_get_nhl_teams_with_date(self, mock_teams):
         mock_teams.teams.return_value = [
@@ -187,6 +188,7 @@ class TestNHLAPI:
         ]
         
         from src import get_nhl_team_ids
+        from src.game_store import store
         result = get_nhl_team_ids()
         
         assert "team_abbreviations" in result
@@ -194,7 +196,7 @@ class TestNHLAPI:
         assert result["team_abbreviations"]["Toronto Maple Leafs"] == "TOR"
         assert result["team_abbreviations"]["New Jersey Devils"] == "NJD"
         
-        mock_teams.teams.assert_called_once_with("now")
+        mock_teams.teams.assert_called_once_with(store.today().isoformat())
     
     def test_get_nhl_standings_success(self, mock_standings):
         mock_standings.league_standings.return_value = {
@@ -205,6 +207,7 @@ class TestNHLAPI:
         }
         
         from src import get_nhl_standings
+        from src.game_store import store
         result = get_nhl_standings()
         
         assert "standings" in result
@@ -213,7 +216,7 @@ class TestNHLAPI:
         assert result["standings"]["standings"][0]["team"] == "Boston Bruins"
         assert result["standings"]["standings"][1]["points"] == 95
         
-        mock_standings.league_standings.assert_called_once_with("now")
+        mock_standings.league_standings.assert_called_once_with(store.today().isoformat())
     
     def test_get_nhl_standings_with_date(self, mock_standings):
         mock_standings.league_standings.return_value = {
@@ -278,6 +281,91 @@ class TestNHLAPI:
             assert "error" in result
             assert "Invalid Season Id 99999999" in result["error"]
     
+    def _mock_playoffs(self, mock_schedule):
+        mock_schedule.playoff_bracket.return_value = {"series": [
+            {"seriesLetter": "A", "playoffRound": 1, "seriesTitle": "1st Round", "topSeedRank": 1,
+             "topSeedWins": 4, "bottomSeedRank": 4, "bottomSeedWins": 1, "winningTeamId": 6,
+             "topSeedTeam": {"id": 6, "abbrev": "BOS", "name": {"default": "Boston Bruins"}},
+             "bottomSeedTeam": {"id": 10, "abbrev": "TOR", "name": {"default": "Toronto Maple Leafs"}}},
+            {"seriesLetter": "B", "playoffRound": 1, "seriesTitle": "1st Round", "topSeedRank": 2,
+             "topSeedWins": 2, "bottomSeedRank": 3, "bottomSeedWins": 1,
+             "topSeedTeam": {"id": 1, "abbrev": "NJD", "name": {"default": "New Jersey Devils"}},
+             "bottomSeedTeam": {"id": 3, "abbrev": "NYR", "name": {"default": "New York Rangers"}}},
+            {"seriesLetter": "I", "playoffRound": 2, "seriesTitle": "2nd Round", "topSeedWins": 0,
+             "bottomSeedWins": 0, "topSeedTeam": {"id": 6, "abbrev": "BOS"}}
+        ]}
+        mock_schedule.playoff_carousel.return_value = {"currentRound": 1, "rounds": [
+            {"roundNumber": 1, "roundLabel": "1st-round"}, {"roundNumber": 2, "roundLabel": "2nd-round"}
+        ]}
+        series_schedules = {
+            "a": {"neededToWin": 4, "topSeedTeam": {"abbrev": "BOS", "seriesWins": 4},
+                  "bottomSeedTeam": {"abbrev": "TOR", "seriesWins": 1},
+                  "games": [{"id": 2023030111, "gameNumber": 1, "startTimeUTC": "2024-04-20T23:00:00Z",
+                             "gameState": "OFF", "awayTeam": {"abbrev": "TOR", "score": 1},
+                             "homeTeam": {"abbrev": "BOS", "score": 5}}]},
+            "b": {"neededToWin": 4, "topSeedTeam": {"abbrev": "NJD", "seriesWins": 2},
+                  "bottomSeedTeam": {"abbrev": "NYR", "seriesWins": 1}, "games": []}
+        }
+        mock_schedule.playoff_series_schedule.side_effect = lambda season, letter: series_schedules[letter]
+
+    def test_get_nhl_playoff_picture_success(self, mock_schedule):
+        self._mock_playoffs(mock_schedule)
+        
+        from src import get_nhl_playoff_picture
+        result = get_nhl_playoff_picture("20232024")
+        
+        assert result["current_round"] == 1
+        assert [r["round"] for r in result["rounds"]] == [1, 2]
+        assert result["rounds"][0]["label"] == "1st-round"
+        assert result["rounds"][0]["complete"] is False
+        series_a, series_b = result["rounds"][0]["series"]
+        assert series_a["status"] == "complete"
+        assert series_a["top_seed"] == {"id": 6, "abbrev": "BOS", "name": "Boston Bruins", "rank": 1, "wins": 4}
+        assert series_a["games"][0]["home"] == {"abbrev": "BOS", "score": 5}
+        assert series_b["status"] == "in_progress"
+        assert result["rounds"][1]["series"][0]["status"] == "pending"
+        assert result["champion"] is None
+        assert result["missing_series"] == []
+        
+        mock_schedule.playoff_bracket.assert_called_once_with("2024")
+        # Only series whose teams are known are fetched
+        assert sorted(call.args[1] for call in mock_schedule.playoff_series_schedule.call_args_list) == ["a", "b"]
+    
+    def test_get_nhl_playoff_picture_reuses_cached_series(self, mock_schedule):
+        self._mock_playoffs(mock_schedule)
+        
+        from src import get_nhl_playoff_picture
+        get_nhl_playoff_picture("20232024")
+        get_nhl_playoff_picture("20232024")
+        
+        assert mock_schedule.playoff_series_schedule.call_count == 2
+        assert mock_schedule.playoff_bracket.call_count == 1
+    
+    def test_get_nhl_playoff_picture_missing_series(self, mock_schedule):
+        self._mock_playoffs(mock_schedule)
+        schedules = mock_schedule.playoff_series_schedule.side_effect
+        
+        def flaky(season, letter):
+            if letter == "b":
+                raise Exception("Series API error")
+            return schedules(season, letter)
+        mock_schedule.playoff_series_schedule.side_effect = flaky
+        
+        from src import get_nhl_playoff_picture
+        result = get_nhl_playoff_picture("20232024")
+        
+        assert result["missing_series"] == ["B"]
+        assert result["rounds"][0]["series"][1]["games"] == []
+    
+    def test_get_nhl_playoff_picture_bracket_error(self, mock_schedule):
+        mock_schedule.playoff_bracket.side_effect = Exception("Bracket API error")
+        
+        from src import get_nhl_playoff_picture
+        result = get_nhl_playoff_picture("20232024")
+        
+        assert result["error"] == "Bracket API error"
+        assert result["error_code"] == "internal"
+    
     def test_get_nhl_standings_error(self, mock_standings):
         mock_standings.league_standings.side_effect = Exception("Standings API error")
         
@@ -336,18 +424,29 @@ class TestNHLAPI:
         assert "error" in result
         assert result["error"] == "Season manifest API error"
     
+    def _mock_weeks(self, mock_schedule, games_by_day):
+        """League weekly schedules built from {YYYY-MM-DD: games}, seven days from the requested date."""
+        from datetime import date, timedelta
+        
+        def weekly_schedule(start):
+            first = date.fromisoformat(start)
+            days = [(first + timedelta(days=offset)).isoformat() for offset in range(7)]
+            return {
+                "nextStartDate": (first + timedelta(days=7)).isoformat(),
+                "previousStartDate": (first - timedelta(days=7)).isoformat(),
+                "gameWeek": [{"date": day, "games": games_by_day.get(day, [])} for day in days],
+                "oddsPartners": ["partner1", "partner2"],
+                "regularSeasonEndDate": "2024-04-18",
+            }
+        mock_schedule.weekly_schedule.side_effect = weekly_schedule
+    
+    def _game(self, game_id, away, home, start="2024-01-16T00:00:00Z"):
+        return {"id": game_id, "awayTeam": {"abbrev": away}, "homeTeam": {"abbrev": home}, "startTimeUTC": start}
+    
     def test_get_nhl_daily_schedule_success(self, mock_schedule):
-        mock_schedule.daily_schedule.return_value = {
-            "nextStartDate": "2024-01-16",
-            "previousStartDate": "2024-01-14",
-            "date": "2024-01-15",
-            "oddsPartners": ["partner1", "partner2"],
-            "games": [
-                {"id": 1, "homeTeam": "BOS", "awayTeam": "TOR", "startTime": "19:00"},
-                {"id": 2, "homeTeam": "NJD", "awayTeam": "NYR", "startTime": "19:30"}
-            ],
-            "numberOfGames": 2
-        }
+        self._mock_weeks(mock_schedule, {"2024-01-15": [
+            self._game(1, "TOR", "BOS"), self._game(2, "NYR", "NJD", "2024-01-16T00:30:00Z")
+        ]})
         
         from src import get_nhl_daily_schedule
         result = get_nhl_daily_schedule("2024-01-15")
@@ -355,24 +454,24 @@ class TestNHLAPI:
         assert "schedule" in result
         assert result["schedule"]["date"] == "2024-01-15"
         assert result["schedule"]["numberOfGames"] == 2
-        assert len(result["schedule"]["games"]) == 2
+        assert [game["id"] for game in result["schedule"]["games"]] == [1, 2]
+        assert result["schedule"]["games"][0]["gameDate"] == "2024-01-15"
+        assert result["schedule"]["nextStartDate"] == "2024-01-22"
+        assert result["schedule"]["previousStartDate"] == "2024-01-08"
+        assert result["schedule"]["oddsPartners"] == ["partner1", "partner2"]
         
-        mock_schedule.daily_schedule.assert_called_once_with("2024-01-15")
+        mock_schedule.weekly_schedule.assert_called_once_with("2024-01-15")
     
     def test_get_nhl_daily_schedule_default_date(self, mock_schedule):
-        mock_schedule.daily_schedule.return_value = {
-            "date": "2024-01-15",
-            "games": [],
-            "numberOfGames": 0
-        }
+        self._mock_weeks(mock_schedule, {})
         
         from src import get_nhl_daily_schedule
+        from src.game_store import store
         result = get_nhl_daily_schedule()
         
-        assert "schedule" in result
-        assert "date" in result["schedule"]
+        assert result["schedule"]["date"] == store.today().isoformat()
         
-        mock_schedule.daily_schedule.assert_called_once()
+        mock_schedule.weekly_schedule.assert_called_once_with(store.today().isoformat())
     
     def test_get_nhl_daily_schedule_invalid_date_format(self):
         from src import get_nhl_daily_schedule
@@ -382,7 +481,7 @@ class TestNHLAPI:
         assert "Invalid date format" in result["error"]
     
     def test_get_nhl_daily_schedule_error(self, mock_schedule):
-        mock_schedule.daily_schedule.side_effect = Exception("Daily schedule API error")
+        mock_schedule.weekly_schedule.side_effect = Exception("Daily schedule API error")
         
         from src import get_nhl_daily_schedule
         result = get_nhl_daily_schedule("2024-01-15")
@@ -391,36 +490,40 @@ class TestNHLAPI:
         assert result["error"] == "Daily schedule API error"
     
     def test_get_nhl_weekly_schedule_success(self, mock_schedule):
-        mock_schedule.weekly_schedule.return_value = {
-            "gameWeek": [
-                {"date": "2024-01-15", "games": [{"id": 1, "homeTeam": "BOS"}]},
-                {"date": "2024-01-16", "games": [{"id": 2, "homeTeam": "TOR"}]}
-            ]
-        }
+        self._mock_weeks(mock_schedule, {
+            "2024-01-15": [self._game(1, "TOR", "BOS")],
+            "2024-01-16": [self._game(2, "BOS", "TOR", "2024-01-17T00:00:00Z")]
+        })
         
         from src import get_nhl_weekly_schedule
         result = get_nhl_weekly_schedule("2024-01-15")
         
         assert "schedule" in result
-        assert "gameWeek" in result["schedule"]
-        assert len(result["schedule"]["gameWeek"]) == 2
+        assert len(result["schedule"]["gameWeek"]) == 7
+        assert result["schedule"]["gameWeek"][1]["games"][0]["id"] == 2
+        assert result["schedule"]["numberOfGames"] == 2
+        assert result["schedule"]["nextStartDate"] == "2024-01-22"
+        assert result["schedule"]["oddsPartners"] == ["partner1", "partner2"]
+        assert result["schedule"]["regularSeasonEndDate"] == "2024-04-18"
+        assert result["schedule"]["gameWeek"][0]["dayAbbrev"] == "MON"
         
         mock_schedule.weekly_schedule.assert_called_once_with("2024-01-15")
     
     def test_get_nhl_weekly_schedule_default_date(self, mock_schedule):
-        mock_schedule.weekly_schedule.return_value = {"gameWeek": []}
+        self._mock_weeks(mock_schedule, {})
         
         from src import get_nhl_weekly_schedule
+        from src.game_store import store
         result = get_nhl_weekly_schedule()
         
-        assert "schedule" in result
+        assert result["schedule"]["gameWeek"][0]["date"] == store.today().isoformat()
         
-        mock_schedule.weekly_schedule.assert_called_once_with("now")
+        mock_schedule.weekly_schedule.assert_called_once_with(store.today().isoformat())
     
     def test_get_nhl_team_monthly_schedule_success(self, mock_schedule):
         mock_schedule.team_monthly_schedule.return_value = [
-            {"id": 1, "homeTeam": "BOS", "awayTeam": "TOR", "date": "2024-01-15"},
-            {"id": 2, "homeTeam": "BOS", "awayTeam": "NJD", "date": "2024-01-20"}
+            {"id": 1, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "TOR"}, "gameDate": "2024-01-15"},
+            {"id": 2, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "NJD"}, "gameDate": "2024-01-20"}
         ]
         
         from src import get_nhl_team_monthly_schedule
@@ -437,18 +540,20 @@ class TestNHLAPI:
         mock_schedule.team_monthly_schedule.return_value = []
         
         from src import get_nhl_team_monthly_schedule
+        from src.game_store import store
         result = get_nhl_team_monthly_schedule("BOS")
         
         assert "games" in result
         assert result["team"] == "BOS"
-        assert result["month"] is None
+        assert result["month"] == store.today().isoformat()[:7]
         
-        mock_schedule.team_monthly_schedule.assert_called_once_with("BOS", None)
+        mock_schedule.team_monthly_schedule.assert_called_once_with("BOS", store.today().isoformat()[:7])
     
     def test_get_nhl_team_weekly_schedule_success(self, mock_schedule):
-        mock_schedule.team_weekly_schedule.return_value = [
-            {"id": 1, "homeTeam": "BOS", "awayTeam": "TOR", "date": "2024-01-15"},
-            {"id": 2, "homeTeam": "BOS", "awayTeam": "NJD", "date": "2024-01-17"}
+        mock_schedule.team_monthly_schedule.return_value = [
+            {"id": 1, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "TOR"}, "gameDate": "2024-01-15"},
+            {"id": 2, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "NJD"}, "gameDate": "2024-01-17"},
+            {"id": 3, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "NJD"}, "gameDate": "2024-01-25"}
         ]
         
         from src import get_nhl_team_weekly_schedule
@@ -457,9 +562,50 @@ class TestNHLAPI:
         assert "games" in result
         assert result["team"] == "BOS"
         assert result["date"] == "2024-01-15"
-        assert len(result["games"]) == 2
+        assert [game["id"] for game in result["games"]] == [1, 2]
+        
+        mock_schedule.team_monthly_schedule.assert_called_once_with("BOS", "2024-01")
+    
+    def test_get_nhl_team_weekly_schedule_returns_the_week_containing_the_date(self, mock_schedule):
+        mock_schedule.team_monthly_schedule.return_value = [
+            {"id": 1, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "TOR"}, "gameDate": "2024-01-15"},
+            {"id": 2, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "NJD"}, "gameDate": "2024-01-21"},
+            {"id": 3, "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "NJD"}, "gameDate": "2024-01-22"}
+        ]
         
-        mock_schedule.team_weekly_schedule.assert_called_once_with("BOS", "2024-01-15")
+        from src import get_nhl_team_weekly_schedule
+        result = get_nhl_team_weekly_schedule("BOS", "2024-01-18")
+        
+        # Monday 2024-01-15 to Sunday 2024-01-21
+        assert [game["id"] for game in result["games"]] == [1, 2]
+        assert result["date"] == "2024-01-18"
+    
+    def test_overlapping_schedule_windows_share_fetched_games(self, mock_schedule):
+        self._mock_weeks(mock_schedule, {
+            "2024-01-15": [self._game(1, "TOR", "BOS")],
+            "2024-01-18": [self._game(2, "BOS", "NJD", "2024-01-19T00:00:00Z")]
+        })
+        
+        from src import get_nhl_daily_schedule, get_nhl_team_weekly_schedule, get_nhl_weekly_schedule
+        get_nhl_weekly_schedule("2024-01-15")
+        daily = get_nhl_daily_schedule("2024-01-18")
+        team_week = get_nhl_team_weekly_schedule("bos", "2024-01-15")
+        
+        assert [game["id"] for game in daily["schedule"]["games"]] == [2]
+        assert daily["schedule"]["nextStartDate"] == "2024-01-25"
+        assert [game["id"] for game in team_week["games"]] == [1, 2]
+        # Both later windows were answered from the week already fetched
+        mock_schedule.weekly_schedule.assert_called_once_with("2024-01-15")
+        mock_schedule.team_monthly_schedule.assert_not_called()
+    
+    def test_schedule_window_fetches_only_missing_days(self, mock_schedule):
+        self._mock_weeks(mock_schedule, {})
+        
+        from src import get_nhl_weekly_schedule
+        get_nhl_weekly_schedule("2024-01-15")
+        get_nhl_weekly_schedule("2024-01-18")
+        
+        assert [c.args[0] for c in mock_schedule.weekly_schedule.call_args_list] == ["2024-01-15", "2024-01-22"]
     
     def test_get_nhl_team_season_schedule_success(self, mock_schedule):
         mock_schedule.team_season_schedule.return_value = {
@@ -552,6 +698,100 @@ class TestNHLAPI:
         
         mock_schedule.playoff_bracket.assert_called_once_with("2024")
     
+    def _mock_league_season(self, mock_standings, mock_schedule):
+        mock_standings.season_standing_manifest.return_value = [
+            {"id": 20232024, "standingsEnd": "2024-04-18"}
+        ]
+        mock_standings.league_standings.return_value = {
+            "standings": [
+                {"teamAbbrev": {"default": "BOS"}},
+                {"teamAbbrev": {"default": "TOR"}},
+                {"teamAbbrev": {"default": "NJD"}}
+            ]
+        }
+        schedules = {
+            "BOS": {"games": [
+                {"id": 3, "gameDate": "2024-01-20", "startTimeUTC": "2024-01-21T00:00:00Z",
+                 "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "NJD"}},
+                {"id": 1, "gameDate": "2024-01-15", "startTimeUTC": "2024-01-16T00:00:00Z",
+                 "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "TOR"}}
+            ]},
+            "TOR": {"games": [
+                {"id": 1, "gameDate": "2024-01-15", "startTimeUTC": "2024-01-16T00:00:00Z",
+                 "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "TOR"}},
+                {"id": 2, "gameDate": "2024-01-17", "startTimeUTC": "2024-01-18T00:00:00Z",
+                 "homeTeam": {"abbrev": "TOR"}, "awayTeam": {"abbrev": "NJD"}}
+            ]},
+            "NJD": {"games": [
+                {"id": 2, "gameDate": "2024-01-17", "startTimeUTC": "2024-01-18T00:00:00Z",
+                 "homeTeam": {"abbrev": "TOR"}, "awayTeam": {"abbrev": "NJD"}},
+                {"id": 3, "gameDate": "2024-01-20", "startTimeUTC": "2024-01-21T00:00:00Z",
+                 "homeTeam": {"abbrev": "BOS"}, "awayTeam": {"abbrev": "NJD"}}
+            ]}
+        }
+        mock_schedule.team_season_schedule.side_effect = lambda team, season: schedules[team]
+
+    def test_get_nhl_league_season_schedule_success(self, mock_standings, mock_schedule):
+        self._mock_league_season(mock_standings, mock_schedule)
+        
+        from src import get_nhl_league_season_schedule
+        result = get_nhl_league_season_schedule("20232024")
+        
+        assert result["season"] == "20232024"
+        assert result["total_games"] == 3
+        assert [game["id"] for game in result["games"]] == [1, 2, 3]
+        assert result["missing_teams"] == []
+        
+        assert mock_schedule.team_season_schedule.call_count == 3
+        mock_standings.league_standings.assert_called_once_with("2024-04-18")
+    
+    def test_get_nhl_league_season_schedule_date_range(self, mock_standings, mock_schedule):
+        self._mock_league_season(mock_standings, mock_schedule)
+        
+        from src import get_nhl_league_season_schedule
+        result = get_nhl_league_season_schedule("20232024", start_date="2024-01-16", end_date="2024-01-20")
+        
+        assert [game["id"] for game in result["games"]] == [2, 3]
+    
+    def test_get_nhl_league_season_schedule_team_pair(self, mock_standings, mock_schedule):
+        self._mock_league_season(mock_standings, mock_schedule)
+        
+        from src import get_nhl_league_season_schedule
+        result = get_nhl_league_season_schedule("20232024", team_abbr="njd", opponent_abbr="BOS")
+        
+        assert [game["id"] for game in result["games"]] == [3]
+        
+        result = get_nhl_league_season_schedule("20232024", team_abbr="TOR")
+        assert [game["id"] for game in result["games"]] == [1, 2]
+        
+        result = get_nhl_league_season_schedule("20232024", opponent_abbr="NJD")
+        assert [game["id"] for game in result["games"]] == [2, 3]
+    
+    def test_get_nhl_league_season_schedule_missing_team(self, mock_standings, mock_schedule):
+        self._mock_league_season(mock_standings, mock_schedule)
+        schedules = mock_schedule.team_season_schedule.side_effect
+        
+        def flaky(team, season):
+            if team == "NJD":
+                raise Exception("Team schedule API error")
+            return schedules(team, season)
+        mock_schedule.team_season_schedule.side_effect = flaky
+        
+        from src import get_nhl_league_season_schedule
+        result = get_nhl_league_season_schedule("20232024")
+        
+        assert result["missing_teams"] == ["NJD"]
+        assert [game["id"] for game in result["games"]] == [1, 2, 3]
+    
+    def test_get_nhl_league_season_schedule_invalid_season(self, mock_standings):
+        mock_standings.season_standing_manifest.return_value = [{"id": 20232024, "standingsEnd": "2024-04-18"}]
+        
+        from src import get_nhl_league_season_schedule
+        result = get_nhl_league_season_schedule("99999999")
+        
+        assert "error" in result
+        assert "Invalid Season Id 99999999" in result["error"]
+    
     # Stats API Tests
     def test_get_nhl_gametypes_per_season_by_team_success(self, mock_stats):
         mock_stats.gametypes_per_season_directory_by_team.return_value = [
@@ -788,14 +1028,15 @@ class TestNHLAPI:
         
         assert "skater_stats" in result
         
+        # Aggregates are computed locally from whole-season pages
         mock_stats.skater_stats_summary.assert_called_once_with(
             start_season="20232024",
             end_season="20232024",
             franchise_id="10",
             game_type_id=3,
-            aggregate=True,
-            start=5,
-            limit=15
+            aggregate=False,
+            start=0,
+            limit=100
         )
     
     def test_get_nhl_skater_stats_summary_error(self, mock_stats):
@@ -892,10 +1133,10 @@ class TestNHLAPI:
         
         setup_nhl_tools(mock_mcp)
         
-        assert mock_mcp.tool.call_count == 23  # Updated count to include new Stats API tools
+        assert mock_mcp.tool.call_count == 33
         
         tool_calls = mock_mcp.tool.call_args_list
-        assert len(tool_calls) == 23
+        assert len(tool_calls) == 33
 
 
 if __name__ == "__main__":
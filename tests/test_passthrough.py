@@ -0,0 +1,127 @@
+import json
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import passthrough, setup_nhl_tools
+
+
+def _upstream(mock_nhl_client, body):
+    """Make every raw upstream GET return the given JSON body."""
+    response = Mock()
+    response.content = json.dumps(body).encode() if not isinstance(body, bytes) else body
+    mock_nhl_client._http_client.get.return_value = response
+    return mock_nhl_client._http_client.get
+
+
+class TestPassthrough:
+
+    def test_splice_matches_dict_envelope(self):
+        raw = passthrough.RawJSON(b'{"games": [{"id": 1}], "currentSeason": 20232024}')
+        
+        text = passthrough.splice("schedule", raw, team="BOS", season="20232024")
+        
+        assert json.loads(text) == {
+            "schedule": {"games": [{"id": 1}], "currentSeason": 20232024},
+            "team": "BOS",
+            "season": "20232024"
+        }
+        # The body is copied in byte for byte, never decoded
+        assert '{"games": [{"id": 1}], "currentSeason": 20232024}' in text
+        assert raw._decoded is None
+    
+    def test_raw_json_decodes_on_index(self):
+        raw = passthrough.RawJSON(b'{"data": [{"playerId": 1}], "total": 1}')
+        
+        assert raw["data"] == [{"playerId": 1}]
+        assert raw.get("missing", []) == []
+        assert passthrough.splice("skater_stats", raw["data"]) == '{"skater_stats":[{"playerId":1}]}'
+    
+    def test_team_season_schedule_raw(self, mock_nhl_client):
+        get = _upstream(mock_nhl_client, {"games": [{"id": 1, "homeTeam": {"abbrev": "BOS"}}]})
+        
+        result = json.loads(passthrough.get_nhl_team_season_schedule_raw("BOS", "20232024"))
+        
+        assert result["schedule"]["games"][0]["id"] == 1
+        assert result["team"] == "BOS"
+        assert result["season"] == "20232024"
+        assert get.call_args.kwargs["resource"] == "club-schedule-season/BOS/20232024"
+    
+    def test_player_career_stats_raw(self, mock_nhl_client):
+        get = _upstream(mock_nhl_client, {"playerId": 8478402, "seasonTotals": [{"season": 20232024}]})
+        
+        result = json.loads(passthrough.get_nhl_player_career_stats_raw("8478402"))
+        
+        assert result == {"player_stats": {"playerId": 8478402, "seasonTotals": [{"season": 20232024}]}}
+        assert get.call_args.kwargs["resource"] == "player/8478402/landing"
+    
+    def test_raw_arguments_are_canonicalized(self, mock_nhl_client):
+        get = _upstream(mock_nhl_client, {"games": []})
+        
+        result = json.loads(passthrough.get_nhl_team_season_schedule_raw("bos", "2023-24"))
+        
+        assert result["team"] == "BOS"
+        assert result["season"] == "20232024"
+        assert get.call_args.kwargs["resource"] == "club-schedule-season/BOS/20232024"
+        invalid = json.loads(passthrough.get_nhl_team_season_schedule_raw("BOS", "2023"))
+        assert invalid["error_code"] == "invalid_argument"
+    
+    def test_raw_calls_share_the_counterpart_cache(self, mock_nhl_client, mock_schedule):
+        from src import get_nhl_playoff_bracket
+        get = _upstream(mock_nhl_client, {"series": [{"seriesLetter": "A"}]})
+        mock_schedule.playoff_bracket.return_value = {"series": [{"seriesLetter": "B"}]}
+        
+        bracket = json.loads(passthrough.get_nhl_playoff_bracket_raw("2024"))["bracket"]
+        assert bracket["series"][0]["seriesLetter"] == "A"
+        assert json.loads(passthrough.get_nhl_playoff_bracket_raw(2024))["year"] == "2024"
+        assert get.call_count == 1
+        
+        # A result the decoded path already holds is served from its cache
+        get_nhl_playoff_bracket("2023")
+        result = json.loads(passthrough.get_nhl_playoff_bracket_raw("2023"))
+        assert result == {"bracket": {"series": [{"seriesLetter": "B"}]}, "year": "2023"}
+        assert get.call_count == 1
+    
+    def test_raw_non_json_body_is_an_error(self, mock_nhl_client):
+        _upstream(mock_nhl_client, b"  <html><body>Bad Gateway</body></html>\n")
+        
+        result = json.loads(passthrough.get_nhl_team_season_schedule_raw("BOS", "20232024"))
+        
+        assert "error" in result
+        assert "non-JSON body" in result["error"]
+    
+    def test_raw_error(self, mock_nhl_client):
+        mock_nhl_client._http_client.get.side_effect = Exception("API Error")
+        
+        result = json.loads(passthrough.get_nhl_playoff_bracket_raw("2024"))
+        
+        assert result["error"] == "API Error"
+        assert result["error_code"] == "internal"
+    
+    def test_passthrough_tool_keeps_signature(self):
+        def get_nhl_playoff_bracket_mcp(year: str) -> dict:
+            """Bracket tool."""
+            return {}
+        
+        wrapped = passthrough.passthrough_tool(get_nhl_playoff_bracket_mcp, lambda year: '{"year":"%s"}' % year)
+        
+        assert wrapped.__name__ == "get_nhl_playoff_bracket_mcp"
+        assert wrapped.__doc__ == "Bracket tool."
+        assert wrapped("2024").text == '{"year":"2024"}'
+    
+    def test_setup_nhl_tools_passthrough_mode(self):
+        mock_mcp = Mock()
+        
+        with patch('src.mcp_tools.PASSTHROUGH_ENABLED', True):
+            setup_nhl_tools(mock_mcp)
+        
+        raw_registrations = [c for c in mock_mcp.tool.call_args_list if c.kwargs.get("output_schema", "") is None]
+        assert mock_mcp.tool.call_count == 33
+        assert len(raw_registrations) == 9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,109 @@
+import json
+import time
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import profiling
+from src.parallel import fetch_concurrently
+
+
+@pytest.fixture
+def sampled(monkeypatch):
+    """Profile every tool call."""
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiling, "SAMPLE_INTERVAL_MS", 1)
+    profiling.clear_profiles()
+    yield
+    profiling.clear_profiles()
+
+
+def slow_tool(team_abbr: str) -> dict:
+    """Docstring."""
+    profile = profiling.current()
+    trace = profile.trace()
+    for event in ("connection.connect_tcp", "http11.receive_response_headers", "http11.receive_response_body"):
+        trace(f"{event}.started", {})
+        time.sleep(0.01)
+        trace(f"{event}.complete", {})
+    decoded = profile.timed("decode", lambda: time.sleep(0.01) or {"games": []})()
+    fetch_concurrently(lambda _: time.sleep(0.02), range(2))
+    return {"schedule": decoded, "team": team_abbr}
+
+
+class TestProfiling:
+
+    def test_disabled_profiling_leaves_tool_unwrapped(self):
+        assert profiling.profiled_tool(slow_tool) is slow_tool
+
+    def test_profiled_call_records_phases_and_stacks(self, sampled):
+        wrapped = profiling.profiled_tool(slow_tool)
+        token = profiling.queue_wait.set(0.5)
+        try:
+            assert wrapped("BOS") == {"schedule": {"games": []}, "team": "BOS"}
+        finally:
+            profiling.queue_wait.reset(token)
+
+        [summary] = profiling.recent_profiles()
+        phases = summary["phases_ms"]
+        assert summary["tool"] == "slow_tool"
+        assert summary["upstream_calls"] == 1
+        assert phases["queue"] == 500.0
+        for phase in ("connect", "ttfb", "download", "decode"):
+            assert phases[phase] >= 10.0
+        assert phases["wrap"] >= 20.0
+        assert phases["encode"] > 0
+        assert summary["total_ms"] >= 500.0 + 60.0
+
+        stacks = profiling.get_profile(summary["id"]).folded()
+        assert "slow_tool (test_profiling.py:" in stacks
+        # Worker threads of concurrent fetches are sampled too
+        assert any("<lambda> (test_profiling.py:" in line and "slow_tool" not in line
+                   for line in stacks.splitlines())
+        assert wrapped.__name__ == "slow_tool"
+
+    def test_profiles_are_written_to_directory(self, sampled, tmp_path, monkeypatch):
+        monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+        profiling.profiled_tool(slow_tool)("BOS")
+
+        [summary] = profiling.recent_profiles()
+        with open(tmp_path / f"{summary['id']}.json") as f:
+            assert json.load(f)["tool"] == "slow_tool"
+        assert (tmp_path / f"{summary['id']}.folded").read_text() == profiling.get_profile(summary["id"]).folded()
+
+    def test_request_header_opts_in(self, monkeypatch):
+        monkeypatch.setattr(profiling, "ON_REQUEST", True)
+        monkeypatch.setattr(profiling, "SAMPLE_RATE", 0.0)
+
+        with patch('fastmcp.server.dependencies.get_http_headers', return_value={"x-nhl-profile": "1"}):
+            assert profiling._should_profile() is True
+        with patch('fastmcp.server.dependencies.get_http_headers', return_value={}):
+            assert profiling._should_profile() is False
+
+    def test_upstream_responses_are_traced(self, sampled):
+        import httpx
+        from nhlpy.config import ClientConfig
+        from nhlpy.http_client import Endpoint
+        from src.client import ResilientHttpClient
+
+        def tool_fn() -> dict:
+            response = ResilientHttpClient(ClientConfig()).get(Endpoint.API_WEB_V1, "schedule/now")
+            return response.json()
+
+        real_client = httpx.Client
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"gameWeek": []}))
+        with patch('src.client.httpx.Client', lambda **kwargs: real_client(transport=transport, **kwargs)):
+            assert profiling.profiled_tool(tool_fn)() == {"gameWeek": []}
+
+        [summary] = profiling.recent_profiles()
+        assert summary["upstream_calls"] == 1
+        assert summary["phases_ms"]["decode"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
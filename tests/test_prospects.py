@@ -0,0 +1,118 @@
+import threading
+import time
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.deadline import deadline as request_deadline
+from src.prospects import RETRY_INTERVAL, ProspectIndex, get_nhl_prospects, index
+
+
+def _player(player_id, first, last, position, draft_year=None):
+    player = {"id": player_id, "firstName": {"default": first}, "lastName": {"default": last},
+              "positionCode": position}
+    if draft_year:
+        player["draftDetails"] = {"year": draft_year, "round": 1, "overallPick": player_id, "teamAbbrev": "XXX"}
+    return player
+
+
+POOLS = {
+    "CHI": {"forwards": [_player(1, "Frank", "Nazar", "C", 2022), _player(2, "Oliver", "Moore", "C", 2023)],
+            "defensemen": [_player(3, "Kevin", "Korchinski", "D", 2022)], "goalies": []},
+    "BOS": {"forwards": [_player(4, "Matthew", "Poitras", "C"), _player(5, "Fabian", "Lysell", "R")],
+            "defensemen": [], "goalies": [_player(6, "Brandon", "Bussi", "G")]},
+    "TOR": None,
+}
+
+
+@pytest.fixture
+def prospect_pools(mock_teams, mock_players, mock_stats):
+    mock_teams.teams.return_value = [{"abbr": team} for team in POOLS]
+
+    def prospects_by_team(team):
+        if POOLS[team] is None:
+            raise Exception("Prospects unavailable")
+        return POOLS[team]
+
+    mock_players.prospects_by_team.side_effect = prospects_by_team
+    # Prospects without draft details in their record are looked up once each
+    mock_stats.player_career_stats.side_effect = lambda player_id: {
+        "4": {"draftDetails": {"year": 2023, "round": 2, "overallPick": 37, "teamAbbrev": "BOS"}},
+        "5": {"draftDetails": {"year": 2021, "round": 1, "overallPick": 21, "teamAbbrev": "BOS"}},
+    }.get(player_id, {})
+    return mock_players
+
+
+class TestProspectIndex:
+
+    def test_league_wide_query_by_draft_year_and_position(self, prospect_pools):
+        result = get_nhl_prospects(draft_year=2023, position="center")
+
+        assert [p["name"] for p in result["prospects"]] == ["Matthew Poitras", "Oliver Moore"]
+        assert result["prospects"][0]["draft_overall_pick"] == 37
+        assert result["total"] == 2
+        assert result["missing_teams"] == ["TOR"]
+
+    def test_filters_combine(self, prospect_pools):
+        assert [p["id"] for p in get_nhl_prospects(team_abbr="chi")["prospects"]] == [1, 3, 2]
+        assert [p["id"] for p in get_nhl_prospects(position="F", team_abbr="BOS")["prospects"]] == [5, 4]
+        assert get_nhl_prospects(draft_year=2022, position="G")["prospects"] == []
+        assert get_nhl_prospects(limit=2)["total"] == 6
+
+    def test_index_is_built_once_with_teams_fetched_concurrently(self, prospect_pools, mock_stats):
+        get_nhl_prospects(draft_year=2023)
+        get_nhl_prospects(position="D")
+        get_nhl_prospects(team_abbr="BOS")
+
+        assert prospect_pools.prospects_by_team.call_count == 3
+        assert mock_stats.player_career_stats.call_count == 3
+
+    def test_stale_index_is_rebuilt_in_background(self, prospect_pools):
+        prospects = ProspectIndex(refresh=0, draft_details=False)
+        first = prospects.state()
+
+        prospects.state()
+        deadline = time.monotonic() + 5
+        while prospects.state() is first and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert prospects.state() is not first
+        assert prospects.query(draft_year=2022)[0]["name"] == "Frank Nazar"
+
+    def test_failed_draft_lookups_are_reported_and_retried_soon(self, prospect_pools, mock_stats):
+        mock_stats.player_career_stats.side_effect = Exception("Player unavailable")
+        prospects = ProspectIndex(refresh=6 * 60 * 60)
+
+        state = prospects.state()
+
+        assert sorted(state["missing_draft_details"]) == [4, 5, 6]
+        assert state["_expires_at"] - time.monotonic() <= RETRY_INTERVAL
+        assert get_nhl_prospects()["missing_draft_details"] == 3
+
+    def test_queries_wait_for_the_first_build_only_until_their_deadline(self, prospect_pools):
+        release = threading.Event()
+        prospect_pools.prospects_by_team.side_effect = lambda team: release.wait(5) and POOLS[team] or {}
+
+        with request_deadline(0.05):
+            result = get_nhl_prospects()
+        release.set()
+
+        assert result["error_code"] == "timeout"
+        assert get_nhl_prospects()["total"] == 6
+
+    def test_unknown_position_is_an_error(self, prospect_pools):
+        result = get_nhl_prospects(position="winger")
+
+        assert result["error_code"] == "invalid_argument"
+
+    def test_team_list_failure_is_an_error(self, mock_teams):
+        mock_teams.teams.side_effect = Exception("Teams unavailable")
+
+        assert get_nhl_prospects()["error"] == "Teams unavailable"
+        assert index._state is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
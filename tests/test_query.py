@@ -0,0 +1,142 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.query import get_nhl_query, parse_spec
+
+
+def _standing(abbr, name, conference, division, points):
+    return {"teamAbbrev": {"default": abbr}, "teamName": {"default": name}, "conferenceName": conference,
+            "divisionName": division, "points": points}
+
+
+def _player(player_id, first, last, position, number):
+    return {"id": player_id, "firstName": {"default": first}, "lastName": {"default": last},
+            "positionCode": position, "sweaterNumber": number}
+
+
+STANDINGS = {"standings": [_standing("BOS", "Boston Bruins", "Eastern", "Atlantic", 109),
+                           _standing("TOR", "Toronto Maple Leafs", "Eastern", "Atlantic", 102),
+                           _standing("EDM", "Edmonton Oilers", "Western", "Pacific", 104)]}
+ROSTERS = {
+    "BOS": {"forwards": [_player(1, "David", "Pastrnak", "R", 88)], "defensemen": [_player(2, "Charlie", "McAvoy", "D", 73)],
+            "goalies": []},
+    "TOR": {"forwards": [_player(3, "Auston", "Matthews", "C", 34)], "defensemen": [],
+            "goalies": [_player(4, "Joseph", "Woll", "G", 60)]},
+    "EDM": {"forwards": [_player(5, "Connor", "McDavid", "C", 97)], "defensemen": [], "goalies": []},
+}
+GOALS = {"1": 47, "2": 12, "3": 69, "4": 0, "5": 32}
+
+
+@pytest.fixture
+def league(mock_standings, mock_teams, mock_stats):
+    mock_standings.league_standings.return_value = STANDINGS
+    mock_standings.season_standing_manifest.return_value = [{"id": 20232024, "standingsEnd": "2024-04-18"}]
+    mock_teams.team_roster.side_effect = lambda team, season: ROSTERS[team]
+    mock_stats.player_career_stats.side_effect = lambda player_id: {
+        "playerId": int(player_id), "careerTotals": {"regularSeason": {"goals": GOALS[player_id]}},
+        "seasonTotals": [{"season": 20232024, "gameTypeId": 2, "leagueAbbrev": "NHL"}]
+        + ([{"season": 20232024, "gameTypeId": 3, "leagueAbbrev": "NHL"}] if player_id != "5" else [])}
+    mock_stats.player_game_log.side_effect = lambda player_id, season, game_type: [
+        {"gameId": 1, "opponentAbbrev": "FLA", "goals": 1}, {"gameId": 2, "opponentAbbrev": "TBL", "goals": 0}]
+    return mock_stats
+
+
+class TestParseSpec:
+
+    def test_canonical_filters(self, league):
+        spec = parse_spec({"entity": "players", "where": {"team": ["bos", "Tor"], "position": "F",
+                                                           "season": "2023-24"}})
+
+        assert spec["where"]["team"] == {"BOS", "TOR"}
+        assert spec["where"]["position"] == {"C", "L", "R"}
+        assert spec["where"]["season"] == "20232024"
+        assert spec["select"] == ["id", "name", "team", "position", "sweater_number"]
+
+    @pytest.mark.parametrize("spec, message", [
+        ({"entity": "coaches"}, "Unknown entity"),
+        ({"entity": "teams", "where": {"position": "C"}}, "Unknown filters"),
+        ({"entity": "players", "where": {"position": "winger"}}, "Unknown position"),
+        ({"entity": "players", "fields": ["name"]}, "Unknown query keys"),
+    ])
+    def test_invalid_specs(self, spec, message):
+        with pytest.raises(ValueError, match=message):
+            parse_spec(spec)
+
+
+class TestGetNhlQuery:
+
+    def test_teams_from_one_standings_fetch(self, league, mock_standings):
+        result = get_nhl_query({"entity": "teams", "where": {"division": "atlantic"},
+                                "select": ["abbr", "standings.points"], "order_by": "-standings.points"})
+
+        assert result["rows"] == [{"abbr": "BOS", "standings.points": 109}, {"abbr": "TOR", "standings.points": 102}]
+        assert result["plan"] == [{"step": "standings", "calls": 1, "reused": 0}]
+
+    def test_named_teams_skip_standings_and_careers_when_not_selected(self, league, mock_standings):
+        result = get_nhl_query({"entity": "players", "where": {"team": ["TOR", "BOS"], "season": "20232024"}})
+
+        assert [row["name"] for row in result["rows"]] == ["David Pastrnak", "Charlie McAvoy", "Auston Matthews",
+                                                           "Joseph Woll"]
+        assert [step["step"] for step in result["plan"]] == ["rosters"]
+        mock_standings.league_standings.assert_not_called()
+        league.player_career_stats.assert_not_called()
+
+    def test_multi_hop_question_in_one_call(self, league):
+        # Eastern forwards by career goals: standings -> rosters -> career stats
+        result = get_nhl_query({"entity": "players", "where": {"conference": "Eastern", "position": "F",
+                                                                "season": "20232024"},
+                                "select": ["name", "career.careerTotals.regularSeason.goals"],
+                                "order_by": "-career.careerTotals.regularSeason.goals", "limit": 1})
+
+        assert result["rows"] == [{"name": "Auston Matthews", "career.careerTotals.regularSeason.goals": 69}]
+        assert result["total"] == 2
+        assert [(step["step"], step["calls"]) for step in result["plan"]] == [
+            ("standings", 1), ("rosters", 2), ("career_stats", 2)]
+        assert result["fetches"] == 5
+
+    def test_game_logs_dedupe_players_and_skip_those_without_the_game_type(self, league, mock_teams):
+        rosters = dict(ROSTERS, EDM={"forwards": [_player(5, "Connor", "McDavid", "C", 97),
+                                                  _player(3, "Auston", "Matthews", "C", 34)],
+                                     "defensemen": [], "goalies": []})
+        mock_teams.team_roster.side_effect = lambda team, season: rosters[team]
+
+        result = get_nhl_query({"entity": "game_logs",
+                                "where": {"team": ["TOR", "EDM"], "position": "C", "season": "20232024",
+                                          "game_type": 3, "opponent": "FLA"},
+                                "select": ["name", "game.gameId", "career.playerId"]})
+
+        # Matthews is on both rosters but fetched once; McDavid has no playoff games that season
+        assert result["rows"] == [{"name": "Auston Matthews", "game.gameId": 1, "career.playerId": 3}]
+        assert league.player_game_log.call_count == 1
+        assert result["plan"][1] == {"step": "career_stats", "calls": 2, "reused": 1}
+
+    def test_player_ids_skip_rosters(self, league, mock_teams):
+        result = get_nhl_query({"entity": "players", "where": {"player_id": [5, "3"]}, "select": ["id", "team"]})
+
+        assert result["rows"] == [{"id": 5, "team": None}, {"id": 3, "team": None}]
+        mock_teams.team_roster.assert_not_called()
+
+    def test_failed_fetches_are_reported(self, league, mock_teams):
+        mock_teams.team_roster.side_effect = lambda team, season: (
+            (_ for _ in ()).throw(Exception("Roster unavailable")) if team == "BOS" else ROSTERS[team])
+
+        result = get_nhl_query({"entity": "players", "where": {"team": ["BOS", "TOR"]}})
+
+        assert result["total"] == 2
+        assert result["missing"][0]["step"] == "rosters" and result["missing"][0]["arguments"][0] == "BOS"
+
+    def test_oversized_query_is_rejected(self, league):
+        from src.query import run_query
+
+        with pytest.raises(ValueError, match="narrow the query"):
+            run_query(parse_spec({"entity": "players", "where": {"season": "20232024"}}), max_fetches=2)
+
+    def test_invalid_spec_is_an_argument_error(self):
+        assert get_nhl_query({"entity": "coaches"})["error_code"] == "invalid_argument"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
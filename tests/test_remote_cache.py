@@ -0,0 +1,139 @@
+import pytest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache import cached, clear_caches
+from src.cache_server import start_cache_server
+from src.remote_cache import (COMPRESS_MIN_SIZE, JSON_FORMAT, ZLIB_FORMAT, RESPConnection, SharedCache,
+                              decode_value, encode_value)
+
+
+@pytest.fixture
+def cache_server():
+    url, stop = start_cache_server()
+    yield url
+    stop()
+
+
+@pytest.fixture
+def shared(cache_server):
+    shared_cache = SharedCache(cache_server)
+    with patch('src.remote_cache.shared_cache', shared_cache):
+        yield shared_cache
+    shared_cache.close()
+
+
+class TestEncoding:
+
+    def test_small_and_large_payloads_round_trip(self):
+        small = {"teams": ["BOS"]}
+        large = {"rows": [{"playerId": i, "name": "Player"} for i in range(200)]}
+
+        assert encode_value(small)[:1] == JSON_FORMAT
+        assert encode_value(large)[:1] == ZLIB_FORMAT
+        assert len(encode_value(large)) < COMPRESS_MIN_SIZE * 2
+        assert decode_value(encode_value(small)) == small
+        assert decode_value(encode_value(large)) == large
+
+    def test_non_json_values_are_rejected(self):
+        with pytest.raises(TypeError):
+            encode_value({"table": object()})
+
+
+class TestCacheServer:
+
+    def test_pipelined_commands_and_expiry(self, cache_server):
+        host, port = cache_server[len("redis://"):].split("/")[0].split(":")
+        connection = RESPConnection(host, int(port), db=1)
+
+        replies = connection.pipeline([("SET", "a", b"1"), ("SET", "b", b"2", "PX", 50), ("MGET", "a", "b", "c"),
+                                       ("PTTL", "a"), ("DBSIZE",)])
+        time.sleep(0.06)
+
+        assert replies[:3] == ["OK", "OK", [b"1", b"2", None]]
+        assert replies[3:] == [-1, 2]
+        assert connection.pipeline([("GET", "b"), ("PTTL", "b"), ("DEL", "a"), ("EXISTS", "a")]) == [None, -2, 1, 0]
+        connection.close()
+
+
+class TestSharedCache:
+
+    def test_replicas_share_results_with_their_remaining_ttl(self, shared):
+        calls = []
+
+        @cached("shared_test", ttl=60)
+        def lookup(team: str) -> dict:
+            calls.append(team)
+            return {"team": team}
+
+        assert lookup("BOS") == {"team": "BOS"}
+        clear_caches()  # Another replica: empty local cache, same shared cache
+        assert lookup("BOS") == {"team": "BOS"}
+
+        assert calls == ["BOS"]
+        assert shared.stats()["hits"] == 1 and shared.stats()["writes"] == 1
+        hit, _, remaining = shared.get("shared_test", (("team", "BOS"),))
+        assert hit and 55 < remaining <= 60
+
+    def test_prefetch_loads_many_entries_in_one_round_trip(self, shared):
+        calls = []
+
+        @cached("prefetch_test", ttl=60)
+        def lookup(season: str) -> dict:
+            calls.append(season)
+            return {"season": season}
+
+        for season in ("20212022", "20222023"):
+            lookup(season)
+        clear_caches()
+
+        with patch.object(shared, "_pipeline", wraps=shared._pipeline) as pipeline:
+            assert lookup.prefetch([("20212022",), ("20222023",), ("20232024",)]) == 2
+            assert pipeline.call_count == 1
+        lookup("20212022")
+        lookup("20222023")
+
+        assert calls == ["20212022", "20222023"]
+
+    def test_local_only_values_and_namespaces_stay_local(self, shared):
+        @cached("local_values", ttl=60)
+        def table() -> dict:
+            return {"table": object()}
+
+        @cached("local_namespace", ttl=60, shared=False)
+        def plain() -> dict:
+            return {"rows": []}
+
+        table()
+        plain()
+
+        assert shared.stats()["writes"] == 0
+
+    def test_unreachable_server_behaves_as_a_miss(self):
+        shared_cache = SharedCache("redis://127.0.0.1:1/0", timeout=0.1)
+        calls = []
+
+        @cached("down_test", ttl=60)
+        def lookup() -> dict:
+            calls.append(1)
+            return {"ok": True}
+
+        with patch('src.remote_cache.shared_cache', shared_cache):
+            assert lookup() == {"ok": True}
+
+        assert calls == [1]
+        assert shared_cache.stats()["errors"] == 1
+        assert not shared_cache.enabled
+
+    def test_disabled_without_a_url(self):
+        assert SharedCache().stats() == {"enabled": False}
+        with pytest.raises(ValueError):
+            SharedCache("memcached://localhost:11211")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
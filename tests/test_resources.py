@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mcp.types
+from fastmcp import Client, FastMCP
+
+from src.resources import ResourceStore, setup_nhl_resources, store, version_of
+
+
+def _server():
+    server = FastMCP("test")
+    setup_nhl_resources(server)
+    return server
+
+
+async def _read(client, uri):
+    contents = await client.read_resource(uri)
+    return json.loads(contents[0].text)
+
+
+class TestResources:
+
+    def test_datasets_are_listed_with_stable_uris(self):
+        async def run():
+            async with Client(_server()) as client:
+                resources = await client.list_resources()
+                templates = await client.list_resource_templates()
+                return ({str(resource.uri) for resource in resources},
+                        {template.uriTemplate for template in templates})
+
+        uris, templates = asyncio.run(run())
+
+        assert uris == {"nhl://franchises", "nhl://seasons", "nhl://teams", "nhl://versions"}
+        assert templates == {"nhl://playoffs/{year}/bracket"}
+
+    def test_reads_are_versioned_and_shared_across_sessions(self, mock_teams):
+        mock_teams.franchises.return_value = [{"id": 1, "fullName": "Montréal Canadiens"}]
+
+        async def run():
+            server = _server()
+            async with Client(server) as first:
+                one = await _read(first, "nhl://franchises")
+            async with Client(server) as second:
+                two = await _read(second, "nhl://franchises")
+            return one, two
+
+        one, two = asyncio.run(run())
+
+        assert one["data"] == {"franchises": [{"id": 1, "fullName": "Montréal Canadiens"}]}
+        assert one["version"] == two["version"] == version_of(one["data"])
+        assert mock_teams.franchises.call_count == 1
+
+    def test_reads_run_off_the_event_loop(self, mock_teams):
+        def slow_franchises():
+            time.sleep(0.3)
+            return []
+        mock_teams.franchises.side_effect = slow_franchises
+
+        async def run():
+            async with Client(_server()) as client:
+                ticks = 0
+
+                async def tick():
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0.01)
+                        ticks += 1
+
+                ticker = asyncio.create_task(tick())
+                await _read(client, "nhl://franchises")
+                ticker.cancel()
+                return ticks
+
+        # The loop kept running while the resource was read upstream
+        assert asyncio.run(run()) >= 10
+
+    def test_bracket_template_and_version_index(self, mock_schedule, mock_standings, mock_teams):
+        mock_schedule.playoff_bracket.return_value = {"series": [{"seriesLetter": "A"}]}
+        mock_standings.season_standing_manifest.return_value = [{"id": 20232024}]
+        mock_teams.teams.return_value = [{"abbr": "BOS"}]
+        mock_teams.franchises.return_value = []
+
+        async def run():
+            async with Client(_server()) as client:
+                bracket = await _read(client, "nhl://playoffs/2024/bracket")
+                versions = await _read(client, "nhl://versions")
+                return bracket, versions
+
+        bracket, versions = asyncio.run(run())
+
+        assert bracket["data"]["bracket"] == {"series": [{"seriesLetter": "A"}]}
+        assert versions["versions"]["nhl://playoffs/2024/bracket"] == bracket["version"]
+        assert set(versions["versions"]) == {"nhl://franchises", "nhl://playoffs/2024/bracket",
+                                             "nhl://seasons", "nhl://teams"}
+
+    def test_subscribers_are_notified_only_when_the_version_changes(self, mock_teams):
+        mock_teams.franchises.return_value = [{"id": 1}]
+        updates = []
+
+        async def on_message(message):
+            if isinstance(message, mcp.types.ServerNotification) and \
+                    isinstance(message.root, mcp.types.ResourceUpdatedNotification):
+                updates.append(str(message.root.params.uri))
+
+        async def run():
+            async with Client(_server(), message_handler=on_message) as client:
+                assert client.initialize_result.capabilities.resources.subscribe
+                await _read(client, "nhl://franchises")
+                await client.session.subscribe_resource("nhl://franchises")
+                unchanged = await store.check()
+                mock_teams.franchises.return_value = [{"id": 1}, {"id": 2}]
+                changed = await store.check()
+                await asyncio.sleep(0.05)
+                return unchanged, changed, await _read(client, "nhl://franchises")
+
+        unchanged, changed, latest = asyncio.run(run())
+
+        assert unchanged == []
+        assert changed == ["nhl://franchises"]
+        assert updates == ["nhl://franchises"]
+        assert latest["data"]["franchises"] == [{"id": 1}, {"id": 2}]
+
+
+class TestResourceStore:
+
+    def test_refresh_interval_and_stale_fallback(self):
+        calls = []
+
+        def loader(uri):
+            calls.append(uri)
+            if len(calls) > 1:
+                raise Exception("Upstream unavailable")
+            return {"teams": ["BOS"]}
+
+        resources = ResourceStore(refresh=0, loader=loader)
+        first = resources.read("nhl://teams")
+        second = resources.read("nhl://teams")
+
+        assert second == first
+        assert len(calls) == 2
+
+    def test_unknown_uri_is_an_error(self):
+        with pytest.raises(ValueError):
+            ResourceStore().read("nhl://nothing")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
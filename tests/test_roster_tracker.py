@@ -0,0 +1,150 @@
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.roster_tracker import RosterTracker, diff_rosters, get_nhl_roster_changes, tracker
+
+
+def _player(player_id, first, last, position, number):
+    return {"id": player_id, "firstName": {"default": first}, "lastName": {"default": last},
+            "positionCode": position, "sweaterNumber": number}
+
+
+MATTHEWS = _player(1, "Auston", "Matthews", "C", 34)
+MARNER = _player(2, "Mitchell", "Marner", "R", 16)
+RIELLY = _player(3, "Morgan", "Rielly", "D", 44)
+PASTRNAK = _player(4, "David", "Pastrnak", "R", 88)
+SWAYMAN = _player(5, "Jeremy", "Swayman", "G", 1)
+
+
+@pytest.fixture
+def rosters(mock_teams):
+    """Mutable team -> roster response (None: the fetch fails) served by the mock client."""
+    current = {
+        "TOR": {"forwards": [MATTHEWS, MARNER], "defensemen": [RIELLY], "goalies": []},
+        "BOS": {"forwards": [PASTRNAK], "defensemen": [], "goalies": [SWAYMAN]},
+    }
+    mock_teams.teams.return_value = [{"abbr": team} for team in current]
+
+    def team_roster(team, season):
+        assert season == "current"
+        if current[team] is None:
+            raise Exception("Roster unavailable")
+        return current[team]
+
+    mock_teams.team_roster.side_effect = team_roster
+    return current
+
+
+class TestDiffRosters:
+
+    def test_added_removed_moved_and_updated(self):
+        old = {"TOR": {1: ("Auston Matthews", "C", 34), 2: ("Mitchell Marner", "R", 16)},
+               "BOS": {4: ("David Pastrnak", "R", 88)}}
+        new = {"TOR": {1: ("Auston Matthews", "C", 99), 3: ("Morgan Rielly", "D", 44)},
+               "BOS": {2: ("Mitchell Marner", "R", 93)}}
+
+        changes = diff_rosters(old, new)
+
+        assert [(c["type"], c["player_id"], c["team"]) for c in changes] == [
+            ("moved", 2, "BOS"), ("removed", 4, "BOS"), ("updated", 1, "TOR"), ("added", 3, "TOR")]
+        assert changes[0]["from_team"] == "TOR"
+        assert changes[2]["fields"] == {"sweater_number": [34, 99]}
+        assert diff_rosters(new, new) == []
+
+
+class TestRosterTracker:
+
+    def test_baseline_logs_nothing_and_later_refreshes_log_only_changes(self, rosters, mock_teams):
+        roster_tracker = RosterTracker(refresh=0)
+        first = roster_tracker.changes()
+
+        assert first["changes"] == [] and first["cursor"] == f"{roster_tracker.id}:0"
+        assert mock_teams.team_roster.call_count == 2
+
+        rosters["TOR"] = {"forwards": [MATTHEWS], "defensemen": [RIELLY], "goalies": []}
+        rosters["BOS"] = {"forwards": [PASTRNAK, MARNER], "defensemen": [], "goalies": [SWAYMAN]}
+        assert roster_tracker.refresh_now() == 1
+
+        result = roster_tracker.changes(since=first["cursor"])
+        assert [(c["seq"], c["type"], c["name"], c["from_team"], c["team"]) for c in result["changes"]] == [
+            (1, "moved", "Mitchell Marner", "TOR", "BOS")]
+        assert result["cursor"] == f"{roster_tracker.id}:1"
+        # Answered from the log: no roster is refetched
+        assert roster_tracker.changes(since=result["cursor"])["changes"] == []
+        assert mock_teams.team_roster.call_count == 4
+
+    def test_failed_team_fetch_keeps_its_previous_roster(self, rosters):
+        roster_tracker = RosterTracker(refresh=0)
+        roster_tracker.start()
+        rosters["TOR"] = None
+        rosters["BOS"] = {"forwards": [PASTRNAK], "defensemen": [], "goalies": []}
+
+        assert roster_tracker.refresh_now() == 1
+        result = roster_tracker.changes()
+        assert [(c["type"], c["player_id"]) for c in result["changes"]] == [("removed", 5)]
+        assert result["missing_teams"] == ["TOR"]
+
+    def test_team_missing_from_the_baseline_is_not_logged_as_added(self, rosters):
+        rosters["TOR"] = None
+        roster_tracker = RosterTracker(refresh=0)
+        roster_tracker.start()
+
+        rosters["TOR"] = {"forwards": [MATTHEWS], "defensemen": [], "goalies": []}
+        assert roster_tracker.refresh_now() == 0
+        rosters["TOR"] = {"forwards": [], "defensemen": [], "goalies": []}
+        assert roster_tracker.refresh_now() == 1
+        assert [(c["type"], c["player_id"]) for c in roster_tracker.changes()["changes"]] == [("removed", 1)]
+
+    def test_cursors_from_another_tracker_are_rejected(self, rosters):
+        roster_tracker, other = RosterTracker(refresh=0), RosterTracker(refresh=0)
+        cursor = other.changes()["cursor"]
+
+        with pytest.raises(ValueError, match="another server process"):
+            roster_tracker.changes(since=cursor)
+        with pytest.raises(ValueError):
+            roster_tracker.changes(since="5")
+
+    def test_team_filter_paging_and_truncation(self, rosters):
+        roster_tracker = RosterTracker(refresh=0, max_changes=2)
+        roster_tracker.start()
+        rosters["TOR"] = {"forwards": [], "defensemen": [], "goalies": []}
+        roster_tracker.refresh_now()
+
+        page = roster_tracker.changes(limit=1)
+        assert [c["seq"] for c in page["changes"]] == [2] and page["has_more"] and page["truncated"]
+        rest = roster_tracker.changes(since=page["cursor"])
+        assert [c["seq"] for c in rest["changes"]] == [3] and not rest["has_more"] and not rest["truncated"]
+        assert roster_tracker.changes(team_abbr="BOS")["changes"] == []
+
+    def test_since_accepts_iso_times(self, rosters):
+        roster_tracker = RosterTracker(refresh=0)
+        roster_tracker.start()
+        rosters["BOS"] = {"forwards": [], "defensemen": [], "goalies": [SWAYMAN]}
+        roster_tracker.refresh_now()
+
+        assert len(roster_tracker.changes(since="2000-01-01")["changes"]) == 1
+        assert roster_tracker.changes(since="2999-01-01T00:00:00+00:00")["changes"] == []
+        with pytest.raises(ValueError):
+            roster_tracker.changes(since="last week")
+
+
+class TestGetNhlRosterChanges:
+
+    def test_tool_answers_from_the_shared_tracker(self, rosters):
+        result = get_nhl_roster_changes(team_abbr="tor")
+
+        assert result["changes"] == [] and result["cursor"] == f"{tracker.id}:0"
+        assert result["tracking_since"] == result["last_refreshed_at"]
+        assert tracker._thread is not None
+
+    def test_invalid_since_is_an_argument_error(self, rosters):
+        result = get_nhl_roster_changes(since="yesterday-ish")
+
+        assert result["error_code"] == "invalid_argument"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
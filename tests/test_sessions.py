@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sessions import (FairScheduler, fair_share_tool, get_nhl_session_usage, record_upstream_call,
+                          reset_usage, session_key)
+
+
+@pytest.fixture(autouse=True)
+def fresh_usage():
+    reset_usage()
+    yield
+    reset_usage()
+
+
+def _run_in_order(scheduler, requests):
+    """Queue (session_id, weight) requests behind a held slot and return the order they start in."""
+    started = []
+
+    async def call(session_id, weight):
+        async with scheduler.slot(session_id, weight):
+            started.append(session_id)
+            await asyncio.sleep(0)
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("holder"):
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(call(session_id, weight)) for session_id, weight in requests]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(holder, *tasks)
+
+    asyncio.run(main())
+    return started
+
+
+class TestFairScheduler:
+
+    def test_light_session_is_not_starved_by_a_flooding_session(self):
+        scheduler = FairScheduler(capacity=1, per_session=1)
+
+        started = _run_in_order(scheduler, [("noisy", 1.0)] * 4 + [("quiet", 1.0)])
+
+        assert started.index("quiet") <= 1
+        assert started.count("noisy") == 4
+
+    def test_weights_give_a_larger_share(self):
+        scheduler = FairScheduler(capacity=1, per_session=1)
+
+        started = _run_in_order(scheduler, [("heavy", 2.0)] * 4 + [("light", 1.0)] * 4)
+
+        # The first six turns split 2:1 in favour of the double-weight session
+        assert started[:6].count("heavy") == 4
+
+    def test_per_session_limit_lets_other_sessions_run(self):
+        scheduler = FairScheduler(capacity=4, per_session=1)
+        peak = {}
+
+        async def call(session_id):
+            async with scheduler.slot(session_id):
+                peak[session_id] = max(peak.get(session_id, 0), scheduler._session_in_flight[session_id])
+                peak["total"] = max(peak.get("total", 0), scheduler.in_flight)
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(call("a") for _ in range(3)), call("b"))
+
+        asyncio.run(main())
+
+        assert peak["a"] == 1
+        assert peak["total"] == 2
+        assert scheduler.in_flight == 0
+
+    def test_cancelled_waiter_gives_up_its_place(self):
+        scheduler = FairScheduler(capacity=1, per_session=1)
+
+        async def main():
+            gate = asyncio.Event()
+
+            async def hold():
+                async with scheduler.slot("a"):
+                    await gate.wait()
+
+            async def wait():
+                async with scheduler.slot("b"):
+                    pass
+
+            holder = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(wait())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            gate.set()
+            await holder
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(main())
+
+        assert scheduler.in_flight == 0
+        assert scheduler.queued == 0
+
+
+class TestSessionUsage:
+
+    def test_fair_share_tool_charges_calls_and_upstream_traffic(self):
+        def tool_fn(team_abbr: str) -> dict:
+            record_upstream_call(1200)
+            record_upstream_call(300)
+            return {"team": team_abbr}
+
+        wrapped = fair_share_tool(tool_fn)
+        with patch('src.sessions._request_identity', return_value=("session-1", "client-a")):
+            assert asyncio.run(wrapped("TOR")) == {"team": "TOR"}
+            asyncio.run(wrapped(team_abbr="MTL"))
+
+        usage = get_nhl_session_usage()["sessions"][0]
+        assert usage["session"] == session_key("session-1")
+        assert "session-1" not in str(usage)
+        assert usage["current"] is False
+        assert usage["client_id"] == "client-a"
+        assert usage["calls"] == 2
+        assert usage["upstream_calls"] == 4
+        assert usage["upstream_bytes"] == 3000
+        assert usage["errors"] == 0
+        assert usage["in_flight"] == 0
+
+    def test_fair_share_tool_keeps_signature_and_counts_errors(self):
+        def tool_fn(player_id: str) -> dict:
+            """Docstring."""
+            return {"error": "not found"}
+
+        wrapped = fair_share_tool(tool_fn)
+        asyncio.run(wrapped("1"))
+
+        assert wrapped.__name__ == "tool_fn"
+        assert wrapped.__doc__ == "Docstring."
+        usage = get_nhl_session_usage(session_id="local")["sessions"][0]
+        assert usage["errors"] == 1
+        assert usage["current"] is True
+        assert get_nhl_session_usage(session_id=usage["session"])["sessions"] == [usage]
+
+    def test_upstream_calls_outside_a_tool_are_not_charged(self):
+        record_upstream_call(100)
+
+        assert get_nhl_session_usage()["sessions"] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.team_matrix import get_nhl_team_form
+
+
+def _game(game_id, day, away, away_score, home, home_score, last_period="REG", state="OFF", game_type=2):
+    return {"id": game_id, "gameDate": day, "gameType": game_type, "gameState": state,
+            "awayTeam": {"abbrev": away, "score": away_score}, "homeTeam": {"abbrev": home, "score": home_score},
+            "gameOutcome": {"lastPeriodType": last_period}}
+
+
+GAMES = [
+    _game(1, "2023-10-10", "BOS", 3, "TOR", 2),
+    _game(2, "2023-10-12", "BOS", 1, "MTL", 4),
+    _game(3, "2023-10-14", "TOR", 3, "BOS", 2, last_period="OT"),
+    _game(4, "2023-10-16", "MTL", 0, "BOS", 5),
+    _game(5, "2023-10-18", "BOS", 2, "TOR", 1, last_period="SO"),
+    _game(6, "2023-10-20", "BOS", 4, "MTL", 3),
+    _game(7, "2023-10-22", "TOR", 0, "BOS", 0, state="FUT"),
+    _game(8, "2023-09-30", "BOS", 1, "TOR", 6, game_type=1),
+]
+
+
+@pytest.fixture
+def league_schedule():
+    with patch('src.team_matrix.get_nhl_league_season_schedule',
+               return_value={"games": GAMES, "season": "20232024", "missing_teams": []}) as schedule:
+        yield schedule
+
+
+class TestTeamForm:
+
+    def test_season_record_and_splits(self, league_schedule):
+        result = get_nhl_team_form("bos", "20232024")
+
+        assert result["record"] == {"games": 6, "wins": 4, "losses": 1, "ot_losses": 1, "ties": 0, "points": 9,
+                                    "goals_for": 17, "goals_against": 13, "goal_diff": 4}
+        assert result["home"]["games"] == 2
+        assert result["away"]["wins"] == 3
+        assert result["streak"] == {"type": "W", "length": 3}
+        assert [game["game_id"] for game in result["games"]] == [1, 2, 3, 4, 5, 6]
+
+    def test_last_n_and_head_to_head(self, league_schedule):
+        result = get_nhl_team_form("BOS", "20232024", last_n=3)
+
+        assert [game["game_id"] for game in result["games"]] == [4, 5, 6]
+        assert set(result["head_to_head"]) == {"MTL", "TOR"}
+        assert result["head_to_head"]["MTL"]["wins"] == 2
+
+    def test_against_one_opponent(self, league_schedule):
+        result = get_nhl_team_form("TOR", "20232024", opponent_abbr="BOS")
+
+        assert result["record"]["wins"] == 1
+        assert result["record"]["ot_losses"] == 1
+        assert result["games"][1] == {"game_id": 3, "date": "2023-10-14", "opponent": "BOS", "home": False,
+                                      "goals_for": 3, "goals_against": 2, "result": "W"}
+        assert result["streak"] == {"type": "OTL", "length": 1}
+
+    def test_other_game_types(self, league_schedule):
+        result = get_nhl_team_form("BOS", "20232024", game_type=1)
+
+        assert result["record"]["losses"] == 1
+        assert result["streak"] == {"type": "L", "length": 1}
+
+    def test_playoff_overtime_losses_and_ties(self, league_schedule):
+        league_schedule.return_value = {"games": [
+            _game(1, "2004-04-10", "BOS", 1, "MTL", 2, last_period="OT", game_type=3),
+            _game(2, "2004-01-10", "BOS", 3, "MTL", 3, last_period="OT"),
+        ], "season": "20032004", "missing_teams": []}
+
+        result = get_nhl_team_form("BOS", "20032004", game_type=3)
+        assert result["games"][0]["result"] == "L"
+        assert result["record"]["ot_losses"] == 0 and result["record"]["points"] == 0
+
+        result = get_nhl_team_form("MTL", "20032004")
+        assert result["games"][0]["result"] == "T"
+        assert result["record"]["ties"] == 1 and result["record"]["points"] == 1
+
+    def test_matrix_is_built_once_per_season(self, league_schedule):
+        get_nhl_team_form("BOS", "20232024")
+        get_nhl_team_form("TOR", "20232024", last_n=5)
+        get_nhl_team_form("MTL", "20232024", opponent_abbr="BOS")
+
+        assert league_schedule.call_count == 1
+
+    def test_errors(self, league_schedule):
+        assert get_nhl_team_form("SEA", "20232024")["error_code"] == "invalid_argument"
+
+        league_schedule.return_value = {"error": "Standings unavailable", "error_code": "upstream_5xx",
+                                        "retryable": True}
+        result = get_nhl_team_form("BOS", "20222023")
+        assert result["error"] == "Standings unavailable"
+        assert result["error_code"] == "upstream_5xx"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
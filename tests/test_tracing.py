@@ -0,0 +1,145 @@
+import json
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from nhlpy.config import ClientConfig
+from nhlpy.http_client import Endpoint
+
+from src import tracing
+from src.client import ResilientHttpClient
+from src.parallel import fetch_concurrently
+
+
+@pytest.fixture
+def traced(monkeypatch, tmp_path):
+    """Trace every tool call into a file; yields a function returning the exported spans."""
+    trace_file = tmp_path / "spans.jsonl"
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "TRACE_RATE", 1.0)
+    monkeypatch.setattr(tracing, "TRACE_FILE", str(trace_file))
+    monkeypatch.setattr(tracing, "OTLP_ENDPOINT", None)
+
+    def spans():
+        tracing.exporter.flush()
+        return [span
+                for line in trace_file.read_text().splitlines()
+                for resource in json.loads(line)["resourceSpans"]
+                for scope in resource["scopeSpans"]
+                for span in scope["spans"]]
+
+    yield spans
+
+
+@pytest.fixture
+def upstream():
+    """Serve upstream requests from a handler: path -> (status, body)."""
+    routes = {}
+    real_client = httpx.Client
+    transport = httpx.MockTransport(lambda request: _respond(*routes[request.url.path]))
+    with patch('src.client.httpx.Client', lambda **kwargs: real_client(transport=transport, **kwargs)), \
+         patch('src.client.time.sleep'):
+        yield routes
+
+
+def _respond(status, body):
+    return httpx.Response(status, json=body)
+
+
+def _attributes(span):
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+class TestTracing:
+
+    def test_tracing_off_leaves_tool_unwrapped(self):
+        def tool_fn():
+            return {}
+
+        assert tracing.traced_tool(tool_fn) is tool_fn
+
+    def test_sampled_call_exports_tool_and_upstream_spans(self, traced, upstream):
+        upstream["/v1/schedule/2024-01-10"] = (200, {"gameWeek": [1, 2]})
+        upstream["/v1/standings/now"] = (200, {"standings": []})
+        http_client = ResilientHttpClient(ClientConfig())
+
+        def get_nhl_schedule_mcp(date: str) -> dict:
+            """Docstring."""
+            resources = [f"schedule/{date}", "standings/now"]
+            return {"bodies": fetch_concurrently(
+                lambda resource: http_client.get(Endpoint.API_WEB_V1, resource).json(), resources)}
+
+        wrapped = tracing.traced_tool(get_nhl_schedule_mcp)
+        wrapped(date="2024-01-10")
+
+        spans = traced()
+        [tool_span] = [span for span in spans if "parentSpanId" not in span]
+        calls = [span for span in spans if "parentSpanId" in span]
+        assert wrapped.__name__ == "get_nhl_schedule_mcp"
+        assert tool_span["kind"] == tracing.KIND_SERVER
+        assert tool_span["status"] == {"code": tracing.STATUS_OK}
+        assert _attributes(tool_span)["mcp.tool.args_hash"] == tracing.args_hash((), {"date": "2024-01-10"})
+        assert len(calls) == 2
+        for call in calls:
+            assert call["traceId"] == tool_span["traceId"]
+            assert call["parentSpanId"] == tool_span["spanId"]
+            assert call["kind"] == tracing.KIND_CLIENT
+            assert int(call["endTimeUnixNano"]) >= int(call["startTimeUnixNano"])
+        by_url = {_attributes(call)["url.full"]: _attributes(call) for call in calls}
+        schedule = by_url["https://api-web.nhle.com/v1/schedule/2024-01-10"]
+        assert schedule["http.response.status_code"] == "200"
+        assert schedule["http.response.body.size"] == str(len(b'{"gameWeek":[1,2]}'))
+
+    def test_failed_calls_mark_spans_as_errors(self, traced, upstream):
+        upstream["/v1/player/1/landing"] = (404, {})
+        http_client = ResilientHttpClient(ClientConfig())
+
+        def tool_fn() -> dict:
+            try:
+                http_client.get(Endpoint.API_WEB_V1, "player/1/landing")
+            except Exception:
+                return {"error": "Player not found", "error_code": "not_found"}
+
+        tracing.traced_tool(tool_fn)()
+
+        call, tool_span = traced()
+        assert call["status"]["code"] == tracing.STATUS_ERROR
+        assert _attributes(call)["error.type"] == "not_found"
+        assert tool_span["status"] == {"code": tracing.STATUS_ERROR, "message": "Player not found"}
+        assert _attributes(tool_span)["error.type"] == "not_found"
+
+    def test_upstream_calls_outside_a_sampled_call_are_not_traced(self, traced, upstream):
+        upstream["/v1/standings/now"] = (200, {})
+
+        ResilientHttpClient(ClientConfig()).get(Endpoint.API_WEB_V1, "standings/now")
+
+        assert tracing.current() is None
+        assert tracing.exporter.stats()["queued"] == 0
+
+    def test_full_queue_drops_spans_instead_of_blocking(self):
+        exporter = tracing.SpanExporter(maxsize=1)
+        exporter._thread = object()  # No exporter thread draining the queue
+
+        span = tracing.Span("tool", tracing.KIND_SERVER)
+        exporter.submit(span)
+        exporter.submit(span)
+
+        assert exporter.stats()["dropped"] == 1
+
+    def test_failed_export_is_logged_and_counted(self, caplog):
+        exporter = tracing.SpanExporter()
+        with patch.object(exporter, "_export", side_effect=OSError("collector down")), \
+             caplog.at_level("WARNING", logger="src.tracing"):
+            exporter.submit(tracing.Span("tool", tracing.KIND_SERVER))
+            exporter.flush()
+
+        assert exporter.stats()["failed"] == 1
+        assert "Span export failed: collector down" in caplog.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
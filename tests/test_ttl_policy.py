@@ -0,0 +1,162 @@
+import pytest
+import threading
+from datetime import date, datetime, timedelta, timezone
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import ttl_policy
+from src.ttl_policy import TTLPolicy
+
+# 2024-01-15 20:30 Eastern
+NOW = datetime(2024, 1, 16, 1, 30, tzinfo=timezone.utc)
+
+
+def _game(game_id, away, home, start, state="FUT"):
+    return {"id": game_id, "awayTeam": {"abbrev": away}, "homeTeam": {"abbrev": home},
+            "startTimeUTC": start, "gameState": state}
+
+
+def _mock_weeks(mock_schedule, days):
+    """League weekly schedules built from {YYYY-MM-DD: {"games": [...]}}, seven days from the requested date."""
+    def weekly_schedule(start):
+        week = [(date.fromisoformat(start) + timedelta(days=offset)).isoformat() for offset in range(7)]
+        return {"gameWeek": [{"date": day, **days.get(day, {"games": []})} for day in week]}
+    mock_schedule.weekly_schedule.side_effect = weekly_schedule
+
+
+@pytest.fixture
+def game_night(mock_schedule):
+    days = {
+        "2024-01-14": {"games": [_game(1, "NYR", "NJD", "2024-01-15T00:00:00Z", "OFF")]},
+        "2024-01-15": {"games": [
+            _game(2, "TOR", "BOS", "2024-01-16T00:00:00Z", "LIVE"),
+            _game(3, "CHI", "EDM", "2024-01-16T02:00:00Z"),
+            _game(4, "MTL", "OTT", "2024-01-15T22:00:00Z", "FINAL"),
+        ]},
+    }
+    _mock_weeks(mock_schedule, days)
+    mock_schedule.calendar_schedule.return_value = {
+        "teams": [{"abbrev": abbr} for abbr in ("BOS", "TOR", "CHI", "EDM", "MTL", "OTT", "NYR", "NJD", "BUF")]
+    }
+    return mock_schedule
+
+
+class TestTTLPolicy:
+
+    def test_team_states(self, game_night):
+        snapshot = TTLPolicy(clock=lambda: NOW).snapshot()
+        
+        assert snapshot["league_state"] == "live"
+        assert snapshot["teams"]["BOS"] == "live"
+        assert snapshot["teams"]["TOR"] == "live"
+        # Starts at 02:00 UTC, so it is inside its pregame window at 01:30
+        assert snapshot["teams"]["EDM"] == "live"
+        assert snapshot["teams"]["OTT"] == "recently_final"
+        assert snapshot["teams"]["NYR"] == "idle"
+        assert snapshot["teams"]["BUF"] == "idle"
+        # Yesterday's weekly schedule also covers today
+        game_night.weekly_schedule.assert_called_once_with("2024-01-14")
+    
+    def test_ttls_follow_team_state(self, game_night):
+        policy = TTLPolicy(clock=lambda: NOW)
+        
+        assert policy.ttl(team_abbrs=["bos"]) == ttl_policy.LIVE_TTL
+        assert policy.ttl(team_abbrs=["OTT"]) == ttl_policy.RECENTLY_FINAL_TTL
+        assert policy.ttl(team_abbrs=["BUF"]) == ttl_policy.IDLE_TTL
+        assert policy.ttl(team_abbrs=["BUF", "OTT"]) == ttl_policy.RECENTLY_FINAL_TTL
+        assert policy.ttl() == ttl_policy.LIVE_TTL
+        assert policy.ttl(team_abbrs=["BOS"], season="20222023") == ttl_policy.FROZEN_TTL
+    
+    def test_ttl_stops_before_upcoming_game(self, mock_schedule):
+        _mock_weeks(mock_schedule, {"2024-01-15": {"games": [_game(5, "TOR", "BOS", "2024-01-16T00:00:00Z")]}})
+        mock_schedule.calendar_schedule.return_value = {"teams": [{"abbrev": "BOS"}, {"abbrev": "BUF"}]}
+        # 2024-01-15 17:00 Eastern, seven hours before puck drop
+        policy = TTLPolicy(clock=lambda: datetime(2024, 1, 15, 22, 0, tzinfo=timezone.utc))
+        
+        assert policy.snapshot()["teams"]["BOS"] == "upcoming"
+        assert policy.ttl(team_abbrs=["BOS"]) == ttl_policy.GAME_DAY_TTL
+        # Idle teams are still only cached until the pregame window opens at 23:30
+        assert policy.ttl(team_abbrs=["BUF"]) == 90 * 60
+    
+    def test_snapshot_is_reused_until_refresh(self, game_night):
+        now = [NOW]
+        policy = TTLPolicy(clock=lambda: now[0])
+        
+        policy.snapshot()
+        policy.snapshot()
+        assert game_night.calendar_schedule.call_count == 1
+        
+        now[0] = NOW.replace(minute=32)
+        policy.snapshot()
+        assert game_night.calendar_schedule.call_count == 2
+    
+    def test_refresh_reads_the_schedule_outside_the_lock(self, game_night):
+        now = [NOW]
+        policy = TTLPolicy(clock=lambda: now[0])
+        stale = policy.snapshot()
+        now[0] = NOW.replace(minute=32)
+
+        reading, release = threading.Event(), threading.Event()
+        calendar = game_night.calendar_schedule.return_value
+
+        def slow_calendar(date):
+            reading.set()
+            release.wait(5)
+            return calendar
+
+        game_night.calendar_schedule.side_effect = slow_calendar
+        refresh = threading.Thread(target=policy.snapshot)
+        refresh.start()
+        assert reading.wait(5)
+
+        # Served the stale snapshot at once, not after the refresh
+        assert policy.snapshot() is stale
+        assert policy.ttl(team_abbrs=["BOS"]) == ttl_policy.LIVE_TTL
+        release.set()
+        refresh.join(5)
+        assert policy.snapshot() is not stale
+        assert game_night.calendar_schedule.call_count == 2
+
+    def test_schedule_error_falls_back(self, mock_schedule):
+        mock_schedule.weekly_schedule.side_effect = Exception("Daily schedule API error")
+        policy = TTLPolicy(clock=lambda: NOW)
+        
+        assert policy.ttl(team_abbrs=["BOS"]) == ttl_policy.FALLBACK_TTL
+        assert policy.snapshot()["error"] == "Daily schedule API error"
+    
+    def test_game_log_ttl_uses_players_team(self, game_night, monkeypatch):
+        monkeypatch.setattr(ttl_policy, "policy", TTLPolicy(clock=lambda: NOW))
+        
+        live = ttl_policy.game_log_ttl({"season_id": "20232024"}, {"game_log": [{"teamAbbrev": "BOS"}]})
+        idle = ttl_policy.game_log_ttl({"season_id": "20232024"}, {"game_log": [{"teamAbbrev": "BUF"}]})
+        
+        assert live == ttl_policy.LIVE_TTL
+        assert idle == ttl_policy.IDLE_TTL
+    
+    def test_playoff_series_ttl_keeps_decided_series_forever(self, game_night, monkeypatch):
+        monkeypatch.setattr(ttl_policy, "policy", TTLPolicy(clock=lambda: NOW))
+        
+        decided = {"series_schedule": {"neededToWin": 4, "topSeedTeam": {"abbrev": "BOS", "seriesWins": 4},
+                                       "bottomSeedTeam": {"abbrev": "TOR", "seriesWins": 2}}}
+        ongoing = {"series_schedule": {"neededToWin": 4, "topSeedTeam": {"abbrev": "BOS", "seriesWins": 3},
+                                       "bottomSeedTeam": {"abbrev": "TOR", "seriesWins": 2}}}
+        
+        assert ttl_policy.playoff_series_ttl({"season": "20232024"}, decided) is None
+        assert ttl_policy.playoff_series_ttl({"season": "20232024"}, ongoing) == ttl_policy.LIVE_TTL
+    
+    def test_get_nhl_cache_ttl_policy(self, game_night, monkeypatch):
+        monkeypatch.setattr(ttl_policy, "policy", TTLPolicy(clock=lambda: NOW))
+        
+        from src import get_nhl_cache_ttl_policy
+        result = get_nhl_cache_ttl_policy("bos")
+        
+        assert result["league_state"] == "live"
+        assert result["teams"] == {"BOS": {"state": "live", "ttl": ttl_policy.LIVE_TTL}}
+        assert [window["game_id"] for window in result["windows"]] == [1, 4, 2, 3]
+        assert result["schedule_error"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,88 @@
+import threading
+import time
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.warmup import Warmer, upstream_hosts
+
+
+class FakePool:
+    """Records warm-up requests and how many ran at once."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def warm(self, url):
+        with self._lock:
+            self.calls.append(url)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight -= 1
+        if url in self.fail:
+            raise ConnectionError("Name or service not known")
+
+
+class TestWarmer:
+
+    def test_upstream_hosts_are_deduplicated(self):
+        assert upstream_hosts() == ["https://api-web.nhle.com/", "https://api.nhle.com/"]
+
+    def test_opens_connections_per_host_concurrently(self):
+        pool = FakePool()
+        warmer = Warmer(pool, connections=3, interval=0)
+
+        hosts = warmer.warm()
+
+        assert sorted(pool.calls) == sorted(upstream_hosts() * 3)
+        assert pool.peak >= 3
+        assert all(host["connections"] == 3 and host["error"] is None for host in hosts.values())
+
+    def test_ready_only_after_warm_up(self):
+        pool = FakePool(fail=["https://api.nhle.com/"])
+        warmer = Warmer(pool, connections=2, interval=0)
+
+        assert warmer.ready is False
+        warmer.start()
+        assert warmer.wait(5)
+
+        status = warmer.status()
+        assert status["ready"] is True
+        # Failed hosts are reported without holding readiness back
+        assert status["hosts"]["https://api.nhle.com/"] == {
+            "connections": 0, "elapsed_ms": pytest.approx(status["hosts"]["https://api.nhle.com/"]["elapsed_ms"]),
+            "error": "Name or service not known"}
+        assert status["hosts"]["https://api-web.nhle.com/"]["connections"] == 2
+
+    def test_keeps_pool_warm(self):
+        pool = FakePool()
+        warmer = Warmer(pool, connections=1, interval=0.01)
+
+        warmer.start()
+        deadline = time.monotonic() + 5
+        while len(pool.calls) < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        warmer.stop()
+
+        assert len(pool.calls) >= 6
+
+    def test_disabled_warm_up_is_ready_at_once(self):
+        pool = FakePool()
+        warmer = Warmer(pool, connections=0)
+
+        warmer.start()
+
+        assert warmer.ready is True
+        assert pool.calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])